@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Batch LLM Generation API
+- generate_many() queues requests by priority and runs them on a bounded worker pool
+- Results are yielded as they complete, each with latency, cache hit and retry details
+- Generation functions annotate the running request through current_call_stats()
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ollama_client import get_client
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class GenerationRequest:
+    """One prompt to run; lower `priority` values are scheduled first."""
+
+    def __init__(self, prompt: str, model: str, key: Any = None, priority: int = 0,
+                 options: Optional[Dict] = None, timeout: Optional[float] = None):
+        self.prompt = prompt
+        self.model = model
+        self.key = key
+        self.priority = priority
+        self.options = options
+        self.timeout = timeout
+
+
+class CallStats:
+    """Per-request details filled in by the generation function."""
+
+    def __init__(self):
+        self.cache_hit = False
+        self.coalesced = False
+        self.retries = 0
+
+
+class GenerationResult:
+    """Outcome of one batched request."""
+
+    def __init__(self, request: GenerationRequest, text: Optional[str], error: Optional[BaseException],
+                 latency: float, stats: CallStats):
+        self.request = request
+        self.key = request.key
+        self.text = text
+        self.error = error
+        self.latency = latency
+        self.cache_hit = stats.cache_hit
+        self.coalesced = stats.coalesced
+        self.retries = stats.retries
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+_local = threading.local()
+
+
+def current_call_stats() -> CallStats:
+    """Stats object for the request running on this thread (a throwaway outside batches)."""
+    stats = getattr(_local, "stats", None)
+    return stats if stats is not None else CallStats()
+
+
+def _default_generate(request: GenerationRequest) -> str:
+    return get_client().generate_text(request.prompt, request.model,
+                                      timeout=request.timeout, options=request.options)
+
+
+def generate_many(requests: Iterable[GenerationRequest], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                  priority: Optional[Callable[[GenerationRequest], Any]] = None,
+                  generate_fn: Optional[Callable[[GenerationRequest], str]] = None,
+                  on_dispatch: Optional[Callable[[GenerationRequest], None]] = None) -> Iterator[GenerationResult]:
+    """
+    Run `requests` through a pool of `max_concurrency` workers.
+    `priority` maps a request to its sort key (default: request.priority); ties keep
+    submission order. `generate_fn` defaults to a plain Ollama generation.
+    `on_dispatch` is called, in dispatch order, as each request leaves the queue.
+    Results are yielded in completion order; failures carry `error` instead of raising.
+    """
+    generate_fn = generate_fn or _default_generate
+    priority = priority or (lambda request: request.priority)
+
+    pending: List = []
+    counter = itertools.count()
+    for request in requests:
+        heapq.heappush(pending, (priority(request), next(counter), request))
+    total = len(pending)
+    if not total:
+        return
+
+    pending_lock = threading.Lock()
+    results: "queue.Queue[GenerationResult]" = queue.Queue()
+
+    def worker() -> None:
+        while True:
+            with pending_lock:
+                if not pending:
+                    return
+                _, _, request = heapq.heappop(pending)
+                if on_dispatch:
+                    on_dispatch(request)
+
+            _local.stats = stats = CallStats()
+            start = time.time()
+            try:
+                text, error = generate_fn(request), None
+            except Exception as e:
+                text, error = None, e
+            finally:
+                _local.stats = None
+            results.put(GenerationResult(request, text, error, time.time() - start, stats))
+
+    workers = [
+        threading.Thread(target=worker, name=f"batch-{i}", daemon=True)
+        for i in range(max(1, min(max_concurrency, total)))
+    ]
+    for thread in workers:
+        thread.start()
+
+    for _ in range(total):
+        yield results.get()
+
+    for thread in workers:
+        thread.join()
+
+
+def generate_many_ordered(requests: List[GenerationRequest], **kwargs) -> Iterator[GenerationResult]:
+    """Like generate_many, but yield results in request order as soon as each is ready."""
+    buffered: Dict[int, GenerationResult] = {}
+    indexed = []
+    for index, request in enumerate(requests):
+        request.batch_index = index
+        indexed.append(request)
+
+    next_index = 0
+    for result in generate_many(indexed, **kwargs):
+        buffered[result.request.batch_index] = result
+        while next_index in buffered:
+            yield buffered.pop(next_index)
+            next_index += 1
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Cache Key Builder for LLM requests
+- request_key(): one hash shared by in-flight request coalescing; keys for
+  option-less requests match the historical md5(prompt_model) format
+- response_key(): canonical key for stored responses. Whitespace-insensitive,
+  option-aware, and tied to the model digest and the content of the files the
+  answer depends on (persona .md, global-persona.yaml), so editing a persona
+  or re-pulling a model invalidates earlier answers
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Bump when the canonical form changes so old keys stop matching
+RESPONSE_KEY_VERSION = 2
+
+
+def request_key(prompt: str, model: str, options: Optional[Dict] = None) -> str:
+    """Hash a (prompt, model, options) request into a stable cache key."""
+    raw = f"{prompt}_{model}"
+    if options:
+        raw += "_" + json.dumps(options, sort_keys=True, separators=(",", ":"))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Canonical prompt text: unified line endings, no trailing or repeated
+    horizontal whitespace, at most one blank line in a row, trimmed ends.
+    """
+    text = prompt.replace("\r\n", "\n").replace("\r", "\n")
+    lines = [re.sub(r"[ \t\f\v]+", " ", line).strip() for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def canonical_model(model: str) -> str:
+    """Ollama treats an untagged name as `:latest`."""
+    return model if ":" in model else f"{model}:latest"
+
+
+# path -> ((mtime_ns, size), sha256); files are re-hashed only when they change
+_fingerprints: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def file_fingerprint(path: Union[str, Path]) -> str:
+    """Content hash of `path` ("missing" if it cannot be read)."""
+    path = str(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _fingerprints_lock:
+        cached = _fingerprints.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return "missing"
+    with _fingerprints_lock:
+        _fingerprints[path] = (signature, digest)
+    return digest
+
+
+def response_key(prompt: str, model: str, options: Optional[Dict] = None, model_digest: str = "",
+                 dependencies: Iterable[Union[str, Path]] = ()) -> str:
+    """Canonical response-cache key; see the module docstring for what it covers."""
+    material = {
+        "version": RESPONSE_KEY_VERSION,
+        "prompt": normalize_prompt(prompt),
+        "model": canonical_model(model),
+        "digest": model_digest,
+        "options": options or {},
+        "files": sorted(file_fingerprint(path) for path in dependencies),
+    }
+    raw = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Circuit Breakers and Retry Budget for LLM calls
+- One breaker per model (and one for the Ollama daemon): closed -> open -> half-open
+- Calls to a tripped model fail fast instead of sleeping through the backoff schedule
+- A shared retry budget caps total retries so one bad model cannot stall a meeting
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+# Configuration
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT_SECONDS = 30.0
+RETRY_BUDGET_INITIAL = 10.0
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_MAX = 20.0
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Breaker key used for daemon-level (connection) failures
+DAEMON_BREAKER = "ollama-daemon"
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe."""
+
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_timeout: float = RESET_TIMEOUT_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return False while open; after the reset timeout let one probe through."""
+        with self._lock:
+            if self.state == OPEN and time.time() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a half-open probe that was granted but not used; the next call may probe."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.time()
+                self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == OPEN and time.time() - self.opened_at < self.reset_timeout
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+            }
+
+
+def allow_requests(*breakers: CircuitBreaker) -> bool:
+    """
+    True when every breaker admits the call, checked in order. If one refuses,
+    probes already granted by the earlier ones are released, so a breaker that
+    is still open never strands another breaker's half-open probe.
+    """
+    granted = []
+    for breaker in breakers:
+        if not breaker.allow_request():
+            for earlier in granted:
+                earlier.release()
+            return False
+        granted.append(breaker)
+    return True
+
+
+class CircuitBreakerRegistry:
+    """Lazily created breakers keyed by model name."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(name)
+            return self._breakers[name]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+class RetryBudget:
+    """
+    Token bucket for retries: every first attempt deposits `ratio` tokens and
+    every retry spends one, so retries stay a bounded fraction of traffic.
+    """
+
+    def __init__(self, initial: float = RETRY_BUDGET_INITIAL, ratio: float = RETRY_BUDGET_RATIO,
+                 max_tokens: float = RETRY_BUDGET_MAX):
+        self.tokens = initial
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.spent = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.spent += 1
+                return True
+            self.denied += 1
+            return False
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {'tokens': round(self.tokens, 2), 'spent': self.spent, 'denied': self.denied}
+
+
+# Process-wide shared instances
+_registry: Optional[CircuitBreakerRegistry] = None
+_retry_budget: Optional[RetryBudget] = None
+_shared_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Return the shared breaker registry, creating it on first use."""
+    global _registry
+    with _shared_lock:
+        if _registry is None:
+            _registry = CircuitBreakerRegistry()
+        return _registry
+
+
+def get_retry_budget() -> RetryBudget:
+    """Return the shared retry budget, creating it on first use."""
+    global _retry_budget
+    with _shared_lock:
+        if _retry_budget is None:
+            _retry_budget = RetryBudget()
+        return _retry_budget
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Hedged LLM Requests for tail-latency control
+- If a call runs past its model's p95 latency, a duplicate goes to a secondary
+  Ollama host (OLLAMA_HEDGE_HOST) or a secondary model (OLLAMA_HEDGE_MODEL)
+- The first successful answer wins; a streamed call commits to whichever leg
+  produces the first token
+- The loser's connection is shut down as soon as the winner is chosen, which
+  makes Ollama abandon that generation
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from ollama_client import LLMBackend, OllamaClient, OllamaError, StreamCancel, get_client
+
+# Configuration
+OLLAMA_HEDGE_HOST = os.environ.get("OLLAMA_HEDGE_HOST", "")
+OLLAMA_HEDGE_MODEL = os.environ.get("OLLAMA_HEDGE_MODEL", "")
+
+PRIMARY = "primary"
+HEDGE = "hedge"
+
+# Events a leg reports to hedged_generate
+TOKEN = "token"
+DONE = "done"
+FAILED = "failed"
+
+
+class HedgeResult:
+    """Outcome of one possibly-hedged generation."""
+
+    def __init__(self, text: str, winner: str, hedged: bool, latency: float, hedge_model: str = ""):
+        self.text = text
+        self.winner = winner
+        self.hedged = hedged
+        self.latency = latency
+        self.hedge_model = hedge_model
+
+
+_hedge_client: Optional[OllamaClient] = None
+_hedge_client_lock = threading.Lock()
+
+
+def get_hedge_target(model: str) -> Optional[Tuple[LLMBackend, str]]:
+    """Return (client, model) for the hedge leg, or None when no distinct target is configured."""
+    global _hedge_client
+    if OLLAMA_HEDGE_HOST:
+        with _hedge_client_lock:
+            if _hedge_client is None:
+                _hedge_client = OllamaClient(OLLAMA_HEDGE_HOST)
+        return _hedge_client, OLLAMA_HEDGE_MODEL or model
+    if OLLAMA_HEDGE_MODEL and OLLAMA_HEDGE_MODEL != model:
+        return get_client(), OLLAMA_HEDGE_MODEL
+    return None
+
+
+def _run_leg(name: str, client: LLMBackend, prompt: str, model: str, timeout: float,
+             cancel: StreamCancel, events: "queue.Queue") -> None:
+    try:
+        for chunk in client.generate_stream(prompt, model, timeout=timeout, cancel=cancel):
+            token = chunk.get("response", "")
+            if token:
+                events.put((name, TOKEN, token))
+        events.put((name, DONE, None))
+    except Exception as e:
+        if not cancel.cancelled:
+            events.put((name, FAILED, e))
+
+
+def hedged_generate(prompt: str, model: str, timeout: float, hedge_after: float,
+                    hedge_target: Tuple[LLMBackend, str],
+                    on_token: Optional[Callable[[str], None]] = None) -> HedgeResult:
+    """
+    Run the primary request and, if it has not answered after `hedge_after`
+    seconds, race a duplicate against it. Raises the primary's error if both fail.
+    With `on_token` the race ends at the first token: that leg's stream is
+    forwarded to `on_token` and the other leg is cancelled.
+    """
+    start = time.time()
+    events: "queue.Queue" = queue.Queue()
+    cancels = {PRIMARY: StreamCancel(), HEDGE: StreamCancel()}
+    pieces = {PRIMARY: [], HEDGE: []}
+    hedge_client, hedge_model = hedge_target
+    winner = None
+    errors = {}
+
+    def launch(name: str, client: LLMBackend, leg_model: str) -> None:
+        threading.Thread(target=_run_leg, name=f"{name}-leg", daemon=True,
+                         args=(name, client, prompt, leg_model, timeout, cancels[name], events)).start()
+
+    def choose(name: str) -> None:
+        nonlocal winner
+        winner = name
+        loser = HEDGE if name == PRIMARY else PRIMARY
+        cancels[loser].cancel()
+
+    launch(PRIMARY, get_client(), model)
+    hedged = False
+    while True:
+        try:
+            # Until a leg is chosen, wake up when it is time to send the hedge
+            wait = None if hedged or winner else max(0.0, start + hedge_after - time.time())
+            name, kind, value = events.get(timeout=wait)
+        except queue.Empty:
+            logging.info(f"Hedging {model} after {hedge_after:.1f}s with {hedge_model} on {hedge_client.host}")
+            launch(HEDGE, hedge_client, hedge_model)
+            hedged = True
+            continue
+
+        if winner is not None and name != winner:
+            continue
+        if kind == TOKEN:
+            pieces[name].append(value)
+            if on_token:
+                if winner is None:
+                    choose(name)
+                on_token(value)
+            continue
+
+        if kind == DONE:
+            text = "".join(pieces[name]).strip()
+            if text:
+                if winner is None:
+                    choose(name)
+                return HedgeResult(text, name, hedged, time.time() - start, hedge_model if hedged else "")
+            value = OllamaError(f"{name} leg returned an empty response")
+        if name == winner or not hedged:
+            # A committed stream has no fallback, and an unhedged primary reports as usual
+            raise value
+        errors[name] = value
+        if len(errors) == 2:
+            raise errors[PRIMARY]
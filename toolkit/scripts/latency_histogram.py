@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Streaming Latency Histogram
+- Log-linear buckets in the spirit of HDR histograms: every recorded value
+  lands in a bucket no wider than PRECISION of its own size, so percentiles
+  are accurate to ~1% whatever the scale
+- O(1) record, memory bounded by the value range (a few hundred buckets
+  between a millisecond and an hour), never by the number of samples
+- Histograms merge by adding bucket counts, and serialize to a small dict
+  whose buckets are one string of delta-encoded indexes
+"""
+
+import math
+from typing import Dict, List, Optional
+
+# Relative bucket width; p50/p90/p99 are reported to within this fraction
+PRECISION = 0.02
+# Values at or below this share bucket 0 (durations from a cache hit, zero rates)
+LOWEST_VALUE = 0.001
+
+_LOG_BASE = math.log1p(PRECISION)
+
+
+class Histogram:
+    """Count, sum, min, max and log-linear bucket counts of a stream of non-negative values."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.buckets: Dict[int, int] = {}
+
+    @staticmethod
+    def _index(value: float) -> int:
+        if value <= LOWEST_VALUE:
+            return 0
+        return 1 + int(math.log(value / LOWEST_VALUE) / _LOG_BASE)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """Representative (geometric midpoint) value of a bucket."""
+        if index == 0:
+            return LOWEST_VALUE
+        return LOWEST_VALUE * math.exp((index - 0.5) * _LOG_BASE)
+
+    def record(self, value: float) -> None:
+        value = max(0.0, float(value))
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Value below which `pct` percent of recorded values fall (0.0 when empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add `other`'s samples to this histogram; returns self."""
+        if not other.count:
+            return self
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        return self
+
+    def summary(self) -> Dict:
+        """Count, mean, p50/p90/p99 and max, rounded for reports and logs."""
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 3),
+            'p50': round(self.percentile(50), 3),
+            'p90': round(self.percentile(90), 3),
+            'p99': round(self.percentile(99), 3),
+            'max': round(self.max or 0.0, 3),
+        }
+
+    def to_dict(self) -> Dict:
+        """
+        Compact form: `buckets` is "delta:count" pairs over the occupied buckets
+        in index order, each delta counted from the previous bucket's index.
+        """
+        encoded: List[str] = []
+        previous = 0
+        for index in sorted(self.buckets):
+            encoded.append(f"{index - previous}:{self.buckets[index]}")
+            previous = index
+        return {
+            'count': self.count,
+            'sum': round(self.total, 6),
+            'min': self.min,
+            'max': self.max,
+            'precision': PRECISION,
+            'buckets': " ".join(encoded),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Histogram":
+        if data.get('precision', PRECISION) != PRECISION:
+            raise ValueError(f"histogram precision {data['precision']} does not match {PRECISION}")
+        histogram = cls()
+        histogram.count = data['count']
+        histogram.total = data['sum']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        index = 0
+        for pair in data['buckets'].split():
+            delta, count = pair.split(":")
+            index += int(delta)
+            histogram.buckets[index] = int(count)
+        return histogram
@@ -5,7 +5,6 @@ Python-based content generation with structured output
 """
 
 import json
-import subprocess
 import sys
 import argparse
 from pathlib import Path
@@ -13,13 +12,30 @@ from typing import Dict, List, Optional, Any
 import re
 from datetime import datetime
 
+from batch import DEFAULT_MAX_CONCURRENCY, GenerationRequest, generate_many_ordered
+from cache_keys import request_key
+from metrics_exporter import get_metrics, start_metrics
+from model_inventory import get_inventory
+from ollama_client import OllamaError, OllamaTimeoutError, get_client
+from single_flight import get_single_flight
+
+GLOBAL_PERSONA_CONFIG = Path(__file__).parent.parent / "config" / "global-persona.yaml"
+GLOBAL_PERSONA_FALLBACK = (
+    "You are Violet Noire, the AI voice behind a murder mystery book review brand. "
+    "Your tone is intelligent, witty, and slightly mysterious. You're passionate about "
+    "murder mysteries, psychological thrillers, and classic whodunits. Always maintain "
+    "brand consistency and literary sophistication."
+)
+GENERATION_TIMEOUT = 120
+GENERATION_OPTIONS = {"temperature": 0.7, "num_predict": 2048}
+
 
 class ContentGenerationError(Exception):
     """Custom exception for content generation errors."""
 
 
 class OrchestratorError(ContentGenerationError):
-    """Exception for orchestrator script errors."""
+    """Exception for Ollama backend errors."""
 
 
 class GenerationTimeoutError(ContentGenerationError):
@@ -32,7 +48,8 @@ class LLMContentGenerator:
     def __init__(self, model: str = "llama3.2"):
         self.model = model
         self.script_dir = Path(__file__).parent
-        self.orchestrator = self.script_dir / "llm-orchestrator.sh"
+        self.client = get_client()
+        self.global_persona = self._load_global_persona()
 
         # Enhanced Mrs. Violet Noire persona (supplements global context from orchestrator)
         self.persona = """Building on your core Violet Noire brand identity, for this structured content generation:
@@ -44,43 +61,55 @@ mystery literature, and focused on the darker aspects of human nature in fiction
 
 Focus on creating content that serves both literary excellence and brand growth objectives."""
 
+    @staticmethod
+    def _load_global_persona() -> str:
+        """Load the global Violet Noire system prompt (same source as llm-orchestrator.sh)."""
+        try:
+            import yaml
+            with open(GLOBAL_PERSONA_CONFIG, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+            for persona in config.get('personas', []):
+                if persona.get('system_prompt'):
+                    return persona['system_prompt'].strip()
+        except (ImportError, OSError, AttributeError, ValueError):
+            pass
+        return GLOBAL_PERSONA_FALLBACK
+
     def check_dependencies(self) -> bool:
         """Check if required dependencies are available."""
-        try:
-            # Check if Ollama is running
-            result = subprocess.run(['ollama', 'list'],
-                                  capture_output=True, text=True, timeout=10, check=False)
-            if result.returncode != 0:
-                print("❌ Ollama is not running. Please start Ollama first.")
-                return False
-
-            # Check if orchestrator exists
-            if not self.orchestrator.exists():
-                print(f"❌ Orchestrator script not found: {self.orchestrator}")
-                return False
-
-            return True
-
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            print("❌ Ollama not found. Please install and start Ollama.")
+        inventory = get_inventory()
+        if not inventory.is_available():
+            print(f"❌ Ollama is not reachable at {self.client.host}. Please install and start Ollama.")
             return False
+        if not inventory.is_installed(self.model):
+            print(f"⚠️  Model {self.model} is not installed. Pull it with: ollama pull {self.model}")
+
+        return True
 
     def _generate_content(self, prompt: str) -> str:
-        """Generate content using the orchestrator script."""
+        """Generate content through the shared Ollama client with global persona context."""
+        enhanced_prompt = f"{self.global_persona}\n\n{prompt}"
         try:
-            result = subprocess.run([str(self.orchestrator), 'generate', prompt],
-                                  capture_output=True, text=True, timeout=120, check=False)
-
-            if result.returncode != 0:
-                raise OrchestratorError(f"Orchestrator error: {result.stderr}")
-
-            return result.stdout.strip()
+            # Identical requests already in flight (e.g. repeated meta descriptions) share one generation
+            content, _ = get_single_flight().do(
+                request_key(enhanced_prompt, self.model, GENERATION_OPTIONS),
+                lambda: self._generate_tracked(enhanced_prompt),
+                max_wait=GENERATION_TIMEOUT
+            )
+            return content
 
-        except subprocess.TimeoutExpired as exc:
+        except OllamaTimeoutError as exc:
             raise GenerationTimeoutError("Content generation timed out") from exc
+        except OllamaError as exc:
+            raise OrchestratorError(f"Ollama error: {exc}") from exc
         except Exception as e:
             raise ContentGenerationError(f"Failed to generate content: {str(e)}") from e
 
+    def _generate_tracked(self, prompt: str) -> str:
+        with get_metrics().track_request(self.model):
+            return self.client.generate_text(prompt, self.model, timeout=GENERATION_TIMEOUT,
+                                             options=GENERATION_OPTIONS)
+
     def generate_book_review(self, title: str, author: str, genre: str = "mystery",
                              rating: Optional[int] = None) -> Dict[str, Any]:
         """Generate a structured book review."""
@@ -245,13 +274,24 @@ Maintain your sophisticated, gothic voice throughout."""
 
         return book if len(book) >= 2 else None
 
-    def generate_meta_description(
-            self,
-            page_type: str,
-            specific_content: str = "") -> str:
-        """Generate SEO meta descriptions."""
-
-        prompt = f"""{self.persona}
+    def _generate_many(self, prompts: Dict[str, str],
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, str]:
+        """
+        Generate several keyed prompts through the batch API.
+        Returns {key: content} in input order; the first failure is re-raised.
+        """
+        requests = [GenerationRequest(prompt, self.model, key=key) for key, prompt in prompts.items()]
+        results = {}
+        for result in generate_many_ordered(
+                requests, max_concurrency=max_concurrency,
+                generate_fn=lambda request: self._generate_content(request.prompt)):
+            if not result.ok:
+                raise result.error
+            results[result.key] = result.text
+        return results
+
+    def _meta_description_prompt(self, page_type: str, specific_content: str = "") -> str:
+        return f"""{self.persona}
 
 Create an SEO-optimized meta description for a {page_type} page on your mystery book review website.
 
@@ -266,7 +306,26 @@ Requirements:
 
 Generate ONLY the meta description text, no additional formatting."""
 
-        return self._generate_content(prompt).strip()
+    def generate_meta_description(
+            self,
+            page_type: str,
+            specific_content: str = "") -> str:
+        """Generate SEO meta descriptions."""
+
+        return self._generate_content(self._meta_description_prompt(page_type, specific_content)).strip()
+
+    def generate_meta_descriptions(self, page_types: List[str], specific_content: str = "",
+                                   max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> Dict[str, str]:
+        """Generate meta descriptions for several page types concurrently."""
+
+        prompts = {
+            page_type: self._meta_description_prompt(page_type, specific_content)
+            for page_type in page_types
+        }
+        return {
+            page_type: content.strip()
+            for page_type, content in self._generate_many(prompts, max_concurrency).items()
+        }
 
     def generate_author_bio(self, word_count: int = 150) -> str:
         """Generate Mrs. Violet Noire's author bio."""
@@ -427,6 +486,8 @@ def main():
     parser.add_argument('--output', help='Output filename (without extension)')
     parser.add_argument('--save-json', action='store_true', help='Save as JSON')
     parser.add_argument('--save-md', action='store_true', help='Save as Markdown')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Parallel generations for multi-item commands')
 
     # Review arguments
     parser.add_argument('--title', help='Book title for review')
@@ -446,7 +507,7 @@ def main():
     parser.add_argument('--season', default='autumn', help='Season for reading list')
 
     # Meta description arguments
-    parser.add_argument('--page-type', help='Type of page for meta description')
+    parser.add_argument('--page-type', nargs='+', help='Type(s) of page for meta description')
     parser.add_argument('--specific-content', help='Specific content focus')
 
     # Bio arguments
@@ -461,6 +522,8 @@ def main():
     parser.add_argument('--books', nargs='*', help='Featured books for newsletter')
 
     args = parser.parse_args()
+    # Exported only when METRICS_PORT or METRICS_TEXTFILE is set (see metrics_exporter.py)
+    start_metrics("content_generator")
 
     # Initialize generator
     generator = LLMContentGenerator(args.model)
@@ -499,12 +562,13 @@ def main():
                 print("❌ Page type is required for meta description generation")
                 sys.exit(1)
 
-            meta_desc = generator.generate_meta_description(
-                args.page_type, args.specific_content or ""
+            meta_descs = generator.generate_meta_descriptions(
+                args.page_type, args.specific_content or "", args.concurrency
             )
-            print("📄 Generated Meta Description:")
-            print(f"   {meta_desc}")
-            print(f"   ({len(meta_desc)} characters)")
+            for page_type, meta_desc in meta_descs.items():
+                print(f"📄 Generated Meta Description ({page_type}):")
+                print(f"   {meta_desc}")
+                print(f"   ({len(meta_desc)} characters)")
             return
 
         elif args.command == 'bio':
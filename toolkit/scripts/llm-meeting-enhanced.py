@@ -10,38 +10,81 @@ Based on technical team recommendations:
 """
 
 import argparse
-import json
+import hashlib
 import logging
 import os
 import random
-import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 import threading
-import hashlib
 from datetime import datetime, timedelta
 
+from batch import GenerationRequest, current_call_stats, generate_many_ordered
+from cache_keys import file_fingerprint, request_key, response_key
+from circuit_breaker import DAEMON_BREAKER, allow_requests, get_circuit_breakers, get_retry_budget
+from hedging import PRIMARY, HedgeResult, get_hedge_target, hedged_generate
+from latency_histogram import Histogram
+from metrics_exporter import get_metrics, start_metrics
+from performance_log import get_event_log
+from model_inventory import get_inventory
+from model_scheduler import ModelAffinityScheduler
+from ollama_client import LLMBackend, OllamaError, OllamaTimeoutError, get_client
+from persona_sessions import PersonaSession, estimate_tokens
+from residency_planner import ResidencyPlan, ResidencyPlanner
+from response_cache import DEFAULT_CALL_TYPE, ResponseCache
+from semantic_cache import SemanticCache
+from single_flight import get_single_flight
+from timeout_policy import get_timeout_policy
+from warm_pool import MEETING_KEEP_ALIVE, ModelWarmPool
+
 # Configuration
 PERSONA_DIR = Path(__file__).parent.parent / "prompts"
+# Shared persona settings; cached answers are invalidated when it changes
+GLOBAL_PERSONA_CONFIG = Path(__file__).parent.parent / "config" / "global-persona.yaml"
 
 # Constants
-OLLAMA_BIN = "ollama"
 OLLAMA_MODEL = "llama3.2:latest"
 EXIT_COMMAND = "Exit"
 NO_COMMENT = "No comment"
-DEFAULT_TIMEOUT = 30
 MAX_RETRIES = 3
-CACHE_TTL_HOURS = 24
+# Default response cache TTL; CALL_TYPE_TTL_HOURS overrides it per call type.
+# Keys cover persona files and model digests (see cache_keys.response_key), so edits never serve stale answers
+CACHE_TTL_HOURS = float(os.environ.get("CACHE_TTL_HOURS", "24"))
 FINAL_PERSONA = "Mrs. Violet Noire"  # Define constant for repeated literal
 
-# File paths
-MODEL_CACHE_FILE = Path(__file__).parent / "model_cache.json"
-PERFORMANCE_LOG_FILE = Path(__file__).parent / "performance_metrics.log"
-
 # Cache configuration
 CACHE_DURATION = timedelta(hours=CACHE_TTL_HOURS)
+# Votes go stale quickly; reviews and recommendations are worth keeping longer
+CALL_TYPE_TTL_HOURS = {
+    "vote": 0.25,
+    "question": CACHE_TTL_HOURS,
+    "summary": CACHE_TTL_HOURS,
+    "preparation": CACHE_TTL_HOURS,
+    "discussion": CACHE_TTL_HOURS,
+    "recommendations": 4 * CACHE_TTL_HOURS,
+    "final_review": 4 * CACHE_TTL_HOURS,
+}
+# Response cache bounds (least recently used entries go first); 0 disables a bound
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "5000"))
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_MB", "64")) * 1024 * 1024
+# Prompts that failed every attempt are remembered this long and not retried;
+# 0 disables negative caching
+NEGATIVE_CACHE_TTL_MINUTES = float(os.environ.get("NEGATIVE_CACHE_TTL_MINUTES", "10"))
+# A remembered timeout on the fallback model is retried once with the prompt cut
+# to half, down to this length; shorter prompts fail fast
+NEGATIVE_CACHE_MIN_SHRINK_CHARS = 2000
+FAILED_RESPONSE = "Response failed after multiple retries."
+# Near-duplicate prompt matching (see semantic_cache.py): minimum similarity per
+# call type. Votes, final reviews and recommendations must see their exact inputs.
+SEMANTIC_CACHE_ENABLED = os.environ.get("SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+SEMANTIC_CACHE_THRESHOLDS = {
+    "preparation": 0.95,
+    "question": 0.95,
+    "summary": 0.96,
+    "discussion": 0.97,
+}
 LLAMA_MODEL = "llama3.1"
 CODELLAMA_MODEL = "codellama"
 
@@ -70,17 +113,25 @@ PERSONA_MODEL_MAP = {
 }
 
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.1")
-OLLAMA_BIN = os.environ.get("OLLAMA_BIN", "ollama")
 
 # Enhanced Configuration
-DEFAULT_TIMEOUT = 10
-MAX_RETRIES = 3
-CACHE_DURATION = timedelta(hours=1)
-PERFORMANCE_LOG_FILE = Path(__file__).parent / "performance_metrics.log"
-MODEL_CACHE_FILE = Path(__file__).parent / "model_cache.json"
+# SQLite response cache (the old model_cache.json md5-keyed entries are not carried over)
+MODEL_CACHE_DB = Path(__file__).parent / "model_cache.db"
+
+# Model used to draft the actionable recommendations
+RECOMMENDATIONS_MODEL = "llama3.2:latest"
+
+# Duplicate slow calls past the model's p95 latency (see hedging.py)
+HEDGING_ENABLED = os.environ.get("LLM_HEDGING", "").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = 95
+
+# Persona requests issued in parallel within a meeting phase
+DEFAULT_CONCURRENCY = int(os.environ.get("MEETING_CONCURRENCY", "4"))
 
 # Constants for consistent messaging
 NO_COMMENT = "No comment"
+# Sent to on_token when a stream fails after emitting tokens; the partial text is discarded
+STREAM_RESTART_MARKER = "\n[response interrupted - partial output discarded]\n"
 EXIT_COMMAND = "Exit"
 
 # Performance Monitoring Class
@@ -95,71 +146,253 @@ class PerformanceMonitor:
             'persona_performance': {},
             'model_performance': {},
             'cache_hits': 0,
-            'cache_misses': 0
-        }
-        self.response_times = []
-
-    def log_request(self, persona: str, model: str, duration: float, success: bool, retries: int = 0):
-        self.metrics['total_requests'] += 1
-        if success:
-            self.metrics['successful_requests'] += 1
-        else:
-            self.metrics['failed_requests'] += 1
-
-        self.metrics['retry_count'] += retries
-        self.response_times.append(duration)
-        self.metrics['average_response_time'] = sum(self.response_times) / len(self.response_times)
-
-        # Track per-persona performance
-        if persona not in self.metrics['persona_performance']:
-            self.metrics['persona_performance'][persona] = {
-                'requests': 0, 'avg_time': 0.0, 'success_rate': 0.0, 'times': []
-            }
-
-        persona_stats = self.metrics['persona_performance'][persona]
-        persona_stats['requests'] += 1
-        persona_stats['times'].append(duration)
-        persona_stats['avg_time'] = sum(persona_stats['times']) / len(persona_stats['times'])
-        persona_stats['success_rate'] = (persona_stats.get('successes', 0) + (1 if success else 0)) / persona_stats['requests']
-        if success:
-            persona_stats['successes'] = persona_stats.get('successes', 0) + 1
-
-        # Track per-model performance
-        if model not in self.metrics['model_performance']:
-            self.metrics['model_performance'][model] = {
-                'requests': 0, 'avg_time': 0.0, 'success_rate': 0.0, 'times': []
+            'cache_misses': 0,
+            'cache_store': {},
+            'coalesced_requests': 0,
+            'timeout_policy': {},
+            'breaker_rejections': {},
+            'retry_budget_denials': 0,
+            'negative_cache': {
+                'suppressed_calls': 0,
+                'suppressed_attempts': 0,
+                'actions': {'reroute': 0, 'shrink': 0, 'fail_fast': 0},
+                'failure_classes': {}
+            },
+            'model_loads': {},
+            'residency': {},
+            'hedging': {
+                'eligible_requests': 0,
+                'hedged_requests': 0,
+                'hedge_wins': 0,
+                'estimated_latency_saved': 0.0
+            },
+            'streaming': {
+                'streamed_requests': 0,
+                'avg_time_to_first_token': 0.0,
+                'avg_tokens_per_second': 0.0,
+                'model_streaming': {}
+            },
+            'model_scheduling': {
+                'switches': 0,
+                'unscheduled_switches': 0,
+                'lookahead_preloads': 0,
+                'rotation_unloads': 0
+            },
+            'sessions': {
+                'turns': 0,
+                'incremental_turns': 0,
+                'chars_sent': 0,
+                'chars_full': 0,
+                'tokens_saved': 0,
+                'rounds': {}
             }
+        }
+        # Streaming histograms (see latency_histogram.py): constant memory per series
+        self.response_latency = Histogram()
+        self.latency: Dict[str, Dict[str, Histogram]] = {'persona': {}, 'model': {}, 'phase': {}, 'source': {}}
+        self.first_token_latency = Histogram()
+        self.token_rates = Histogram()
+        self.model_streaming: Dict[str, Tuple[Histogram, Histogram]] = {}
+        # Shared by concurrent persona workers
+        self._lock = threading.Lock()
+
+    def log_request(self, source: str, model: str, duration: float, success: bool, retries: int = 0,
+                    phase: Optional[str] = None, speaker: str = ""):
+        """
+        `source` is where the answer came from (llm, cached, coalesced); `speaker`
+        the meeting persona, if any. Latency is tracked per persona, model, phase and source.
+        """
+        get_metrics().record_request(model, duration, success, retries, persona=speaker, source=source)
+        get_event_log().write("llm_call", model=model, persona=speaker, source=source, phase=phase,
+                              duration=round(duration, 3), success=success, retries=retries)
+        with self._lock:
+            self.metrics['total_requests'] += 1
+            if success:
+                self.metrics['successful_requests'] += 1
+            else:
+                self.metrics['failed_requests'] += 1
+
+            self.metrics['retry_count'] += retries
+            self.response_latency.record(duration)
+            self.metrics['average_response_time'] = self.response_latency.mean
+            if phase:
+                self.latency['phase'].setdefault(phase, Histogram()).record(duration)
+            self.latency['source'].setdefault(source, Histogram()).record(duration)
+
+            # Track per-persona performance (calls made for no persona, e.g. recommendations, are skipped)
+            if speaker:
+                if speaker not in self.metrics['persona_performance']:
+                    self.metrics['persona_performance'][speaker] = {
+                        'requests': 0, 'avg_time': 0.0, 'success_rate': 0.0
+                    }
+
+                persona_stats = self.metrics['persona_performance'][speaker]
+                persona_stats['requests'] += 1
+                persona_latency = self.latency['persona'].setdefault(speaker, Histogram())
+                persona_latency.record(duration)
+                persona_stats['avg_time'] = persona_latency.mean
+                persona_stats['success_rate'] = (persona_stats.get('successes', 0) + (1 if success else 0)) / persona_stats['requests']
+                if success:
+                    persona_stats['successes'] = persona_stats.get('successes', 0) + 1
+
+            # Track per-model performance
+            if model not in self.metrics['model_performance']:
+                self.metrics['model_performance'][model] = {
+                    'requests': 0, 'avg_time': 0.0, 'success_rate': 0.0
+                }
 
-        model_stats = self.metrics['model_performance'][model]
-        model_stats['requests'] += 1
-        model_stats['times'].append(duration)
-        model_stats['avg_time'] = sum(model_stats['times']) / len(model_stats['times'])
-        model_stats['success_rate'] = (model_stats.get('successes', 0) + (1 if success else 0)) / model_stats['requests']
-        if success:
-            model_stats['successes'] = model_stats.get('successes', 0) + 1
+            model_stats = self.metrics['model_performance'][model]
+            model_stats['requests'] += 1
+            model_latency = self.latency['model'].setdefault(model, Histogram())
+            model_latency.record(duration)
+            model_stats['avg_time'] = model_latency.mean
+            model_stats['success_rate'] = (model_stats.get('successes', 0) + (1 if success else 0)) / model_stats['requests']
+            if success:
+                model_stats['successes'] = model_stats.get('successes', 0) + 1
+
+    def log_stream(self, model: str, time_to_first_token: float, tokens: int, generation_time: float):
+        """Record streaming latency separately from total request latency."""
+        with self._lock:
+            tokens_per_second = tokens / generation_time if generation_time > 0 else 0.0
+            streaming = self.metrics['streaming']
+            streaming['streamed_requests'] += 1
+            self.first_token_latency.record(time_to_first_token)
+            self.token_rates.record(tokens_per_second)
+            streaming['avg_time_to_first_token'] = self.first_token_latency.mean
+            streaming['avg_tokens_per_second'] = self.token_rates.mean
+
+            if model not in streaming['model_streaming']:
+                streaming['model_streaming'][model] = {
+                    'requests': 0, 'avg_ttft': 0.0, 'avg_tokens_per_second': 0.0
+                }
+                self.model_streaming[model] = (Histogram(), Histogram())
+
+            model_stats = streaming['model_streaming'][model]
+            model_ttft, model_rates = self.model_streaming[model]
+            model_stats['requests'] += 1
+            model_ttft.record(time_to_first_token)
+            model_rates.record(tokens_per_second)
+            model_stats['avg_ttft'] = model_ttft.mean
+            model_stats['avg_tokens_per_second'] = model_rates.mean
+
+    def log_session_turn(self, turn: Dict):
+        """Record prompt size sent by a persona session versus the full rebuilt prompt."""
+        with self._lock:
+            sessions = self.metrics['sessions']
+            round_stats = sessions['rounds'].setdefault(turn['label'], {
+                'turns': 0, 'chars_sent': 0, 'chars_full': 0, 'tokens_saved': 0
+            })
+            for stats in (sessions, round_stats):
+                stats['turns'] += 1
+                stats['chars_sent'] += turn['chars_sent']
+                stats['chars_full'] += turn['chars_full']
+                stats['tokens_saved'] += turn['tokens_saved']
+            if turn['chars_sent'] < turn['chars_full']:
+                sessions['incremental_turns'] += 1
+
+    def log_residency(self, summary: Dict):
+        with self._lock:
+            self.metrics['residency'] = summary
+
+    def log_model_scheduling(self, snapshot: Dict):
+        """Store the meeting scheduler's cumulative model-switch counters."""
+        with self._lock:
+            self.metrics['model_scheduling'].update(snapshot)
 
     def log_cache_hit(self):
-        self.metrics['cache_hits'] += 1
+        get_metrics().record_cache(True)
+        with self._lock:
+            self.metrics['cache_hits'] += 1
 
     def log_cache_miss(self):
-        self.metrics['cache_misses'] += 1
+        get_metrics().record_cache(False)
+        with self._lock:
+            self.metrics['cache_misses'] += 1
+
+    def log_cache_store(self, stats: Dict):
+        """Store the response cache's resident size and eviction counters."""
+        with self._lock:
+            self.metrics['cache_store'] = stats
+
+    def log_timeout(self, model: str, timeout: float, outcome: str):
+        """Record the timeout chosen for one attempt and how the attempt ended."""
+        with self._lock:
+            stats = self.metrics['timeout_policy'].setdefault(model, {
+                'attempts': 0, 'avg_timeout': 0.0, 'last_timeout': 0.0,
+                'outcomes': {'success': 0, 'timeout': 0, 'error': 0}
+            })
+            stats['attempts'] += 1
+            stats['avg_timeout'] += (timeout - stats['avg_timeout']) / stats['attempts']
+            stats['last_timeout'] = timeout
+            stats['outcomes'][outcome] = stats['outcomes'].get(outcome, 0) + 1
+
+    def log_hedge(self, model: str, hedged: bool, winner: str, latency_saved: float):
+        """
+        Record a hedge-eligible call. Savings are estimated from the primary model's
+        latency tail, since the cancelled primary never reports its own finish time.
+        """
+        with self._lock:
+            hedging = self.metrics['hedging']
+            hedging['eligible_requests'] += 1
+            if hedged:
+                hedging['hedged_requests'] += 1
+            if winner == "hedge":
+                hedging['hedge_wins'] += 1
+                hedging['estimated_latency_saved'] += latency_saved
+                logging.info(f"Hedge won for {model}, ~{latency_saved:.2f}s saved")
+
+    def log_model_load(self, model: str, load_time: float, success: bool):
+        with self._lock:
+            self.metrics['model_loads'][model] = {'load_time': load_time, 'success': success}
+
+    def log_breaker_rejection(self, model: str):
+        with self._lock:
+            rejections = self.metrics['breaker_rejections']
+            rejections[model] = rejections.get(model, 0) + 1
+
+    def log_budget_denial(self):
+        with self._lock:
+            self.metrics['retry_budget_denials'] += 1
+
+    def log_suppressed_retries(self, model: str, failure_class: str, attempts: int, action: str):
+        """Record a call skipped because its prompt recently failed `attempts` times on `model`."""
+        with self._lock:
+            negative = self.metrics['negative_cache']
+            negative['suppressed_calls'] += 1
+            negative['suppressed_attempts'] += attempts
+            negative['actions'][action] += 1
+            key = f"{model}/{failure_class}"
+            negative['failure_classes'][key] = negative['failure_classes'].get(key, 0) + 1
+
+    def log_coalesced(self):
+        with self._lock:
+            self.metrics['coalesced_requests'] += 1
 
     def start_monitoring(self):
         """Start performance monitoring session."""
         logging.info("Performance monitoring started")
 
+    def latency_histograms(self) -> Dict:
+        """Serialized histograms for every latency series; merge runs with Histogram.from_dict().merge()."""
+        histograms = {'overall': self.response_latency.to_dict()}
+        for dimension, series in self.latency.items():
+            histograms[dimension] = {name: histogram.to_dict() for name, histogram in series.items()}
+        histograms['first_token'] = self.first_token_latency.to_dict()
+        histograms['tokens_per_second'] = self.token_rates.to_dict()
+        return histograms
+
     def save_metrics(self):
-        """Save performance metrics to file."""
-        try:
-            with open(PERFORMANCE_LOG_FILE, 'a') as f:
-                f.write(f"\n=== Performance Session {datetime.now().isoformat()} ===\n")
-                f.write(json.dumps(self.metrics, indent=2))
-                f.write("\n" + "="*50 + "\n")
-            logging.info(f"Performance metrics saved to {PERFORMANCE_LOG_FILE}")
-        except Exception as e:
-            logging.error(f"Failed to save performance metrics: {e}")
+        """Log the session's metrics and latency histograms as one `session` event."""
+        with self._lock:
+            event_log = get_event_log()
+            event_log.write("session", metrics=self.metrics, latency_histograms=self.latency_histograms())
+            logging.info(f"Performance metrics saved to {event_log.path}")
 
     def get_report(self) -> str:
+        with self._lock:
+            return self._build_report()
+
+    def _build_report(self) -> str:
         cache_total = self.metrics['cache_hits'] + self.metrics['cache_misses']
         cache_hit_rate = (self.metrics['cache_hits'] / cache_total * 100) if cache_total > 0 else 0
 
@@ -170,6 +403,10 @@ Success Rate: {(self.metrics['successful_requests'] / max(self.metrics['total_re
 Average Response Time: {self.metrics['average_response_time']:.2f}s
 Total Retries: {self.metrics['retry_count']}
 Cache Hit Rate: {cache_hit_rate:.1f}%
+Coalesced Requests: {self.metrics['coalesced_requests']}
+Circuit Breaker Fast-Fails: {sum(self.metrics['breaker_rejections'].values())}
+Retries Denied by Budget: {self.metrics['retry_budget_denials']}
+Retries Suppressed by Negative Cache: {self.metrics['negative_cache']['suppressed_attempts']}
 
 === Top Performing Personas ==="""
 
@@ -183,50 +420,193 @@ Cache Hit Rate: {cache_hit_rate:.1f}%
         for persona, stats in personas[:5]:
             report += f"\n{persona}: {stats['success_rate']*100:.1f}% success, {stats['avg_time']:.2f}s avg"
 
+        if self.response_latency.count:
+            report += "\n\n=== Latency Percentiles (count, mean / p50 / p90 / p99 / max) ==="
+            rows = [("all requests", self.response_latency)]
+            for dimension in ('phase', 'model', 'persona', 'source'):
+                rows += [(f"{dimension} {name}", histogram) for name, histogram in sorted(self.latency[dimension].items())]
+            for label, histogram in rows:
+                stats = histogram.summary()
+                report += (f"\n{label}: {stats['count']}, {stats['mean']:.2f}s / {stats['p50']:.2f}s / "
+                           f"{stats['p90']:.2f}s / {stats['p99']:.2f}s / {stats['max']:.2f}s")
+
+        store = self.metrics['cache_store']
+        if store:
+            report += f"""
+
+=== Response Cache ===
+Resident Entries: {store['entries']}{f" / {store['max_entries']}" if store['max_entries'] else ""}
+Resident Size: {store['bytes'] / 1024:.1f} KiB{f" / {store['max_bytes'] / 1024:.0f} KiB" if store['max_bytes'] else ""}
+Stored Size: {store['stored_bytes'] / 1024:.1f} KiB compressed{f" ({store['bytes'] / store['stored_bytes']:.1f}x)" if store['stored_bytes'] else ""}
+LRU Evictions: {store['evictions']}
+TTL Expirations: {store['expirations']}
+Negative Entries: {store['failures']}"""
+            semantic = store.get('semantic')
+            if semantic:
+                report += (f"\nSemantic Hits: {semantic['hits']}/{semantic['lookups']} lookups "
+                           f"({semantic['vectors']} prompts indexed{'' if semantic['enabled'] else ', disabled'})")
+
+        negative = self.metrics['negative_cache']
+        if negative['suppressed_calls']:
+            actions = negative['actions']
+            report += f"""
+
+=== Negative Cache ===
+Known-Failing Calls: {negative['suppressed_calls']} ({negative['suppressed_attempts']} attempts not retried)
+Rerouted to Fallback: {actions['reroute']}, Retried Shrunk: {actions['shrink']}, Failed Fast: {actions['fail_fast']}"""
+            for key, count in sorted(negative['failure_classes'].items()):
+                report += f"\n{key}: {count}"
+
+        if self.metrics['timeout_policy']:
+            report += "\n\n=== Adaptive Timeouts ==="
+            for model, stats in self.metrics['timeout_policy'].items():
+                outcomes = stats['outcomes']
+                report += (f"\n{model}: {stats['attempts']} attempts, {stats['avg_timeout']:.1f}s avg timeout "
+                           f"(last {stats['last_timeout']:.1f}s) - {outcomes['success']} ok, "
+                           f"{outcomes['timeout']} timed out, {outcomes['error']} errors")
+
+        residency = self.metrics['residency']
+        if residency.get('budget_gb') is not None:
+            report += f"""
+
+=== Model Residency ===
+Memory Budget: {residency['budget_gb']:.1f} GiB
+Co-resident: {', '.join(residency['co_resident']) or 'none'}
+Loaded In Turn: {', '.join(residency['rotating']) or 'none'}"""
+            for model, replacement in residency['downgrades'].items():
+                report += f"\nDowngraded: {model} -> {replacement}"
+
+        if self.metrics['model_loads']:
+            report += "\n\n=== Model Warm Pool ==="
+            for model, load in self.metrics['model_loads'].items():
+                status = f"{load['load_time']:.2f}s" if load['success'] else "failed"
+                report += f"\n{model}: {status}"
+
+        hedging = self.metrics['hedging']
+        if hedging['eligible_requests']:
+            hedge_rate = hedging['hedged_requests'] / hedging['eligible_requests'] * 100
+            report += f"""
+
+=== Hedged Requests ===
+Hedge Rate: {hedge_rate:.1f}% ({hedging['hedged_requests']}/{hedging['eligible_requests']} eligible calls, extra load)
+Hedge Wins: {hedging['hedge_wins']}
+Estimated Latency Saved: {hedging['estimated_latency_saved']:.2f}s"""
+
+        streaming = self.metrics['streaming']
+        if streaming['streamed_requests']:
+            report += f"""
+
+=== Streaming Latency ===
+Streamed Requests: {streaming['streamed_requests']}
+Average Time to First Token: {streaming['avg_time_to_first_token']:.2f}s
+Average Generation Speed: {streaming['avg_tokens_per_second']:.1f} tokens/s"""
+            for model, stats in streaming['model_streaming'].items():
+                ttft_p90 = self.model_streaming[model][0].percentile(90)
+                report += (f"\n{model}: {stats['avg_ttft']:.2f}s TTFT (p90 {ttft_p90:.2f}s), "
+                           f"{stats['avg_tokens_per_second']:.1f} tokens/s")
+
+        scheduling = self.metrics['model_scheduling']
+        if scheduling['switches'] or scheduling['unscheduled_switches']:
+            report += f"""
+
+=== Model Scheduling ===
+Model Switches: {scheduling['switches']} (persona order would have caused {scheduling['unscheduled_switches']})
+Lookahead Preloads: {scheduling['lookahead_preloads']}
+Rotation Unloads: {scheduling['rotation_unloads']}"""
+
+        sessions = self.metrics['sessions']
+        if sessions['turns']:
+            report += f"""
+
+=== Persona Sessions ===
+Incremental Turns: {sessions['incremental_turns']}/{sessions['turns']}
+Prompt Tokens Sent: ~{estimate_tokens(sessions['chars_sent'])} (vs ~{estimate_tokens(sessions['chars_full'])} resending full context)
+Prompt Tokens Saved: ~{sessions['tokens_saved']}"""
+            for label, stats in sessions['rounds'].items():
+                report += (f"\n{label}: ~{estimate_tokens(stats['chars_sent'])}/{estimate_tokens(stats['chars_full'])} "
+                           f"tokens sent, ~{stats['tokens_saved']} saved")
+
         return report
 
 # Model Cache System
 class ModelCache:
-    def __init__(self):
-        self.cache_file = MODEL_CACHE_FILE
-        self.cache = self._load_cache()
+    """
+    Prompt/model view over the indexed response store (see response_cache.py).
+    Meetings, batch jobs and other tools may run against the same database at once.
+    """
 
-    def _load_cache(self) -> dict:
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                return {}
-        return {}
-
-    def _save_cache(self):
-        with open(self.cache_file, 'w') as f:
-            json.dump(self.cache, f, indent=2)
-
-    def _get_cache_key(self, prompt: str, model: str) -> str:
-        return hashlib.md5(f"{prompt}_{model}".encode()).hexdigest()
-
-    def get(self, prompt: str, model: str) -> Optional[str]:
-        key = self._get_cache_key(prompt, model)
-        if key in self.cache:
-            entry = self.cache[key]
-            timestamp = datetime.fromisoformat(entry['timestamp'])
-            if datetime.now() - timestamp < CACHE_DURATION:
-                return entry['response']
-            else:
-                # Cache expired
-                del self.cache[key]
-                self._save_cache()
-        return None
-
-    def set(self, prompt: str, model: str, response: str):
-        key = self._get_cache_key(prompt, model)
-        self.cache[key] = {
-            'response': response,
-            'timestamp': datetime.now().isoformat()
-        }
-        self._save_cache()
+    def __init__(self, semantic: bool = SEMANTIC_CACHE_ENABLED):
+        # Thread-safe, so concurrent persona workers can share it
+        self.store = ResponseCache(
+            MODEL_CACHE_DB, CACHE_DURATION.total_seconds(),
+            ttls={call_type: hours * 3600 for call_type, hours in CALL_TYPE_TTL_HOURS.items()},
+            max_entries=CACHE_MAX_ENTRIES or None, max_bytes=CACHE_MAX_BYTES or None
+        )
+        self.cache_file = self.store.path
+        self.semantic: Optional[SemanticCache] = None
+        if semantic:
+            self.enable_semantic_cache()
+
+    def enable_semantic_cache(self):
+        if self.semantic is None:
+            self.semantic = SemanticCache(self.store.path, SEMANTIC_CACHE_THRESHOLDS)
+
+    @staticmethod
+    def _dependencies(persona_file: Optional[Path]) -> List[Path]:
+        return [GLOBAL_PERSONA_CONFIG] + ([persona_file] if persona_file else [])
+
+    def _get_cache_key(self, prompt: str, model: str, persona_file: Optional[Path] = None) -> str:
+        return response_key(prompt, model, model_digest=get_inventory().snapshot().digest(model),
+                            dependencies=self._dependencies(persona_file))
+
+    def _persona_identity(self, model: str, persona_file: Optional[Path]) -> str:
+        """
+        Semantic partition for a request: the persona plus the model digest and
+        persona files its exact key covers, so a re-pull or a persona edit starts
+        an empty partition instead of matching entries written before it.
+        """
+        material = [get_inventory().snapshot().digest(model)]
+        material += [file_fingerprint(path) for path in self._dependencies(persona_file)]
+        return f"{persona_name(persona_file)}:{hashlib.sha256('|'.join(material).encode()).hexdigest()[:16]}"
+
+    def get(self, prompt: str, model: str, call_type: str = DEFAULT_CALL_TYPE,
+            persona_file: Optional[Path] = None) -> Optional[str]:
+        """Exact match first, then (for enabled call types) the most similar earlier prompt."""
+        key = self._get_cache_key(prompt, model, persona_file)
+        response = self.store.get(key)
+        if response is None and self.semantic is not None:
+            match = self.semantic.lookup(prompt, model, call_type, key, self._persona_identity(model, persona_file))
+            if match:
+                response = self.store.get(match[0])
+                if response is not None:
+                    self.semantic.record_hit()
+                    logging.info(f"Semantic cache hit for {model} {call_type} (similarity {match[1]:.3f})")
+        return response
+
+    def set(self, prompt: str, model: str, response: str, call_type: str = DEFAULT_CALL_TYPE,
+            persona_file: Optional[Path] = None):
+        key = self._get_cache_key(prompt, model, persona_file)
+        self.store.set(key, response, call_type)
+        if self.semantic is not None:
+            self.semantic.add(prompt, model, call_type, key, self._persona_identity(model, persona_file))
+
+    def get_failure(self, prompt: str, model: str, persona_file: Optional[Path] = None) -> Optional[Dict]:
+        """The recent failure recorded for this exact request, if any."""
+        if not NEGATIVE_CACHE_TTL_MINUTES:
+            return None
+        return self.store.get_failure(self._get_cache_key(prompt, model, persona_file))
+
+    def set_failure(self, prompt: str, model: str, failure_class: str, attempts: int,
+                    persona_file: Optional[Path] = None):
+        if NEGATIVE_CACHE_TTL_MINUTES:
+            self.store.set_failure(self._get_cache_key(prompt, model, persona_file), model, failure_class,
+                                   attempts, NEGATIVE_CACHE_TTL_MINUTES * 60)
+
+    def stats(self) -> Dict:
+        stats = self.store.stats()
+        if self.semantic is not None:
+            stats['semantic'] = self.semantic.stats()
+        return stats
 
     def cache_model(self, model: str):
         """Mark model as cached/loaded."""
@@ -234,96 +614,371 @@ class ModelCache:
 
 # Global instances
 performance_monitor = PerformanceMonitor()
-model_cache = ModelCache()
+_model_cache: Optional[ModelCache] = None
+_model_cache_lock = threading.Lock()
+
+def get_model_cache() -> ModelCache:
+    """
+    Return the shared response cache, opening it on first use. Opening may
+    migrate the store and log about it, so it must not happen at import time,
+    before main() has configured logging.
+    """
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            _model_cache = ModelCache()
+        return _model_cache
 
 # Enhanced LLM Generation with Retry Logic
-def ollama_generate_with_retry(prompt: str, model: str = OLLAMA_MODEL, timeout: int = DEFAULT_TIMEOUT, max_retries: int = MAX_RETRIES) -> str:
+class _TokenTap:
+    """Forwards tokens to `on_token`, timing the first one and counting the rest."""
+
+    def __init__(self, on_token: Callable[[str], None]):
+        self.on_token = on_token
+        self.request_start = time.time()
+        self.first_token_time: Optional[float] = None
+        self.pieces: List[str] = []
+
+    def __call__(self, token: str) -> None:
+        if self.first_token_time is None:
+            self.first_token_time = time.time()
+        self.pieces.append(token)
+        self.on_token(token)
+
+    def restart(self) -> None:
+        """Tell the listener a retry or fallback streams its answer from the start."""
+        if self.pieces:
+            self.on_token(STREAM_RESTART_MARKER)
+
+    def log(self, model: str, final_chunk: Dict) -> None:
+        if self.first_token_time is None:
+            return
+        # Prefer Ollama's own eval counters over our chunk count when present
+        tokens = final_chunk.get("eval_count", len(self.pieces))
+        eval_duration = final_chunk.get("eval_duration")
+        generation_time = eval_duration / 1e9 if eval_duration else time.time() - self.first_token_time
+        performance_monitor.log_stream(model, self.first_token_time - self.request_start, tokens, generation_time)
+
+def _stream_generation(prompt: str, model: str, timeout: int, on_token: Callable[[str], None],
+                       context: Optional[List[int]] = None) -> Tuple[str, Dict]:
+    """
+    Stream one generation, forwarding tokens to `on_token` and logging TTFT and tokens/sec.
+    Returns the text and the final chunk (which carries the conversation `context`).
+    If the stream fails after some tokens, `on_token` gets STREAM_RESTART_MARKER
+    before the error propagates.
+    """
+    tap = _TokenTap(on_token)
+    final_chunk = {}
+
+    try:
+        for chunk in get_client().generate_stream(prompt, model, timeout=timeout, context=context):
+            token = chunk.get("response", "")
+            if token:
+                tap(token)
+            if chunk.get("done"):
+                final_chunk = chunk
+    except Exception:
+        tap.restart()
+        raise
+
+    tap.log(model, final_chunk)
+    return "".join(tap.pieces).strip(), final_chunk
+
+def _hedged_generation(prompt: str, model: str, timeout: float, hedge_after: float,
+                       hedge_target: Tuple[LLMBackend, str],
+                       on_token: Optional[Callable[[str], None]] = None) -> HedgeResult:
+    """
+    hedged_generate with the streaming contract of _stream_generation: the winning
+    leg's tokens go to `on_token`, with STREAM_RESTART_MARKER if it fails midway.
+    """
+    if not on_token:
+        return hedged_generate(prompt, model, timeout, hedge_after, hedge_target)
+    tap = _TokenTap(on_token)
+    try:
+        result = hedged_generate(prompt, model, timeout, hedge_after, hedge_target, on_token=tap)
+    except Exception:
+        tap.restart()
+        raise
+    tap.log(result.hedge_model if result.winner != PRIMARY else model, {})
+    return result
+
+def persona_name(persona_file: Optional[Path]) -> str:
+    return persona_file.stem if persona_file else ""
+
+def shrink_prompt(prompt: str) -> str:
+    """
+    Halve a prompt by cutting from the middle: the opening (role, persona) and the
+    end (current context and instructions) are what a model needs most.
+    """
+    keep = len(prompt) // 4
+    return f"{prompt[:keep]}\n\n[... earlier material omitted ...]\n\n{prompt[-keep:]}"
+
+def ollama_generate_with_retry(prompt: str, model: str = OLLAMA_MODEL, timeout: Optional[float] = None, max_retries: int = MAX_RETRIES,
+                               on_token: Optional[Callable[[str], None]] = None,
+                               session: Optional[PersonaSession] = None,
+                               call_type: str = DEFAULT_CALL_TYPE, persona_file: Optional[Path] = None) -> str:
     """
     Enhanced ollama generation with retry logic, caching, and performance monitoring.
+    Without an explicit `timeout`, each attempt uses the adaptive per-model policy.
+    When `on_token` is given, tokens are streamed to it as they arrive; the full
+    text is still cached and returned once generation finishes.
+    With a `session` (turn already prepared), `prompt` is the full stateless prompt;
+    only the session's new material is sent while its context is usable.
+    `call_type` selects the cache TTL (see CALL_TYPE_TTL_HOURS); `persona_file` ties
+    the cached answer to that persona's current definition.
+    A request that recently failed every attempt is not retried: it goes to the
+    fallback model, or (on the fallback, after timeouts) is retried once shrunk.
     """
     start_time = time.time()
 
     # Check cache first
-    cached_response = model_cache.get(prompt, model)
+    cached_response = get_model_cache().get(prompt, model, call_type, persona_file)
     if cached_response:
         performance_monitor.log_cache_hit()
-        performance_monitor.log_request("cached", model, time.time() - start_time, True, 0)
+        current_call_stats().cache_hit = True
+        if session:
+            # The model never saw this turn, so its context is now stale
+            session.reset()
+        performance_monitor.log_request("cached", model, time.time() - start_time, True, 0, call_type,
+                                        persona_name(persona_file))
+        if on_token:
+            on_token(cached_response)
         return cached_response
 
     performance_monitor.log_cache_miss()
 
-    for attempt in range(max_retries + 1):
-        try:
-            result = subprocess.run([
-                OLLAMA_BIN, "run", model, prompt
-            ], capture_output=True, text=True, timeout=timeout)
-
-            if result.returncode == 0 and result.stdout.strip():
-                response = result.stdout.strip()
-                duration = time.time() - start_time
-
-                # Cache successful response
-                model_cache.set(prompt, model, response)
-
-                # Log performance
-                performance_monitor.log_request("llm", model, duration, True, attempt)
-
-                if attempt > 0:
-                    logging.info(f"Successful retry {attempt} for model {model}")
-
-                return response
-            else:
-                logging.warning(f"LLM returned error: {result.stderr}")
+    failure = get_model_cache().get_failure(prompt, model, persona_file)
+    if failure:
+        if model != OLLAMA_MODEL:
+            action = "reroute"
+        elif failure['failure_class'] == "timeout" and len(prompt) >= NEGATIVE_CACHE_MIN_SHRINK_CHARS:
+            action = "shrink"
+        else:
+            action = "fail_fast"
+        performance_monitor.log_suppressed_retries(model, failure['failure_class'], failure['attempts'], action)
+        logging.warning(f"{model} failed this request {failure['attempts']} times recently "
+                        f"({failure['failure_class']}); {action.replace('_', ' ')}")
+        if session:
+            # Neither a fallback model nor a shortened prompt continues the session's context
+            session.reset()
+        if action == "reroute":
+            return ollama_generate_with_retry(prompt, OLLAMA_MODEL, timeout, max_retries, on_token, None, call_type,
+                                              persona_file)
+        if action == "shrink":
+            return ollama_generate_with_retry(shrink_prompt(prompt), model, timeout, max_retries, on_token, None,
+                                              call_type, persona_file)
+        return FAILED_RESPONSE
+
+    # Fail fast or reroute when the model's breaker is open
+    breakers = get_circuit_breakers()
+    if breakers.get(model).is_open():
+        performance_monitor.log_breaker_rejection(model)
+        if model != OLLAMA_MODEL:
+            logging.warning(f"Circuit open for {model}; rerouting to fallback model {OLLAMA_MODEL}")
+            return ollama_generate_with_retry(prompt, OLLAMA_MODEL, timeout, max_retries, on_token, session, call_type,
+                                              persona_file)
+        logging.warning(f"Circuit open for {model}; failing fast")
+        return FAILED_RESPONSE
+
+    if session:
+        # Session turns depend on hidden context, so they are never shared
+        response, shared = _generate_uncached(prompt, model, timeout, max_retries, start_time, on_token, session,
+                                              call_type, persona_file), False
+    else:
+        # Identical prompts already in flight (here or in another process) share one generation
+        response, shared = get_single_flight().do(
+            request_key(prompt, model),
+            lambda: _generate_uncached(prompt, model, timeout, max_retries, start_time, on_token,
+                                       call_type=call_type, persona_file=persona_file),
+            # Wait for another caller's generation no longer than for one attempt of our own
+            max_wait=timeout if timeout is not None else get_timeout_policy().timeout_for(model, prompt)
+        )
+    if shared:
+        performance_monitor.log_coalesced()
+        current_call_stats().coalesced = True
+        if response is not None:
+            performance_monitor.log_request("coalesced", model, time.time() - start_time, True, 0, call_type,
+                                            persona_name(persona_file))
+            if on_token:
+                on_token(response)
+
+    if response is None:
+        if model != OLLAMA_MODEL and breakers.get(model).is_open():
+            logging.warning(f"{model} tripped its circuit breaker; rerouting to fallback model {OLLAMA_MODEL}")
+            return ollama_generate_with_retry(prompt, OLLAMA_MODEL, timeout, max_retries, on_token, session, call_type,
+                                              persona_file)
+        if session:
+            session.reset()
+        return FAILED_RESPONSE
+    return response
+
+def _generate_uncached(prompt: str, model: str, timeout: Optional[float], max_retries: int, start_time: float,
+                       on_token: Optional[Callable[[str], None]] = None,
+                       session: Optional[PersonaSession] = None,
+                       call_type: str = DEFAULT_CALL_TYPE, persona_file: Optional[Path] = None) -> Optional[str]:
+    """
+    Retry loop against Ollama; returns None once every attempt has failed.
+    Stops early when the model or daemon breaker opens or the retry budget runs out.
+    Failures the request itself caused (timeouts, errors, empty answers) are
+    remembered in the negative cache; an unreachable daemon is not.
+    """
+    client = get_client()
+    timeout_policy = get_timeout_policy()
+    was_cold = timeout_policy.is_cold(model)
+    model_breaker = get_circuit_breakers().get(model)
+    daemon_breaker = get_circuit_breakers().get(DAEMON_BREAKER)
+    retry_budget = get_retry_budget()
+    retry_budget.record_request()
+    attempts = 0
+    outcomes: List[str] = []
+    prompt_sent, context = session.request_for(model) if session else (prompt, None)
+
+    # In flight from the first attempt until the last one ends, backoff included
+    with get_metrics().in_flight(model):
+        for attempt in range(max_retries + 1):
+            if attempt > 0 and not retry_budget.try_spend():
+                logging.warning(f"Retry budget exhausted; giving up on model {model}")
+                performance_monitor.log_budget_denial()
+                break
+            # Model first: its breaker is the one most likely to refuse
+            if not allow_requests(model_breaker, daemon_breaker):
+                logging.warning(f"Circuit open for {model}; skipping remaining attempts")
+                performance_monitor.log_breaker_rejection(model)
+                break
+
+            attempts = attempt + 1
+            current_call_stats().retries = attempt
+            attempt_timeout = timeout if timeout is not None else timeout_policy.timeout_for(model, prompt_sent, attempt, cold=was_cold)
+            attempt_start = time.time()
+            outcome = "error"
+            try:
+                # The hedge leg cannot share a session's context
+                hedge_target = get_hedge_target(model) if HEDGING_ENABLED and attempt == 0 and not session else None
+                hedge_after = timeout_policy.latency_percentile(model, prompt_sent, HEDGE_PERCENTILE) if hedge_target else None
+                final_chunk = {}
+                # Model that produced the answer: the hedge's when its leg wins
+                served_model = model
+                primary_answered = True
+                if hedge_after is not None:
+                    result = _hedged_generation(prompt_sent, model, attempt_timeout, hedge_after, hedge_target, on_token)
+                    primary_estimate = timeout_policy.expected_latency_beyond(model, prompt_sent, result.latency) or result.latency
+                    performance_monitor.log_hedge(model, result.hedged, result.winner, primary_estimate - result.latency)
+                    response = result.text
+                    if result.winner != PRIMARY:
+                        primary_answered = False
+                        served_model = result.hedge_model
+                        # Time the winning leg from when it was sent
+                        attempt_start += hedge_after
+                elif on_token:
+                    response, final_chunk = _stream_generation(prompt_sent, model, attempt_timeout, on_token, context)
+                else:
+                    final_chunk = client.generate(prompt_sent, model, timeout=attempt_timeout, context=context)
+                    response = final_chunk.get("response", "").strip()
+
+                if primary_answered:
+                    # The daemon answered, whatever the model produced
+                    daemon_breaker.record_success()
+                else:
+                    # Only the hedge leg answered; the primary's health is still unknown
+                    daemon_breaker.release()
+                    model_breaker.release()
+
+                if response:
+                    outcome = "success"
+                    if primary_answered:
+                        model_breaker.record_success()
+                    # The hedge model's warm/cold state was never checked, so treat its sample as warm
+                    timeout_policy.record(served_model, prompt_sent, time.time() - attempt_start, outcome,
+                                          was_cold and primary_answered)
+                    performance_monitor.log_timeout(model, attempt_timeout, outcome)
+                    duration = time.time() - start_time
+
+                    if session:
+                        performance_monitor.log_session_turn(session.commit(model, prompt_sent, final_chunk.get("context")))
+
+                    # Cache successful response under the model that wrote it
+                    get_model_cache().set(prompt, served_model, response, call_type, persona_file)
+
+                    # Log performance
+                    performance_monitor.log_request("llm", served_model, duration, True, attempt, call_type,
+                                                    persona_name(persona_file))
+
+                    if attempt > 0:
+                        logging.info(f"Successful retry {attempt} for model {model}")
+
+                    return response
+                else:
+                    outcomes.append("empty")
+                    model_breaker.record_failure()
+                    logging.warning(f"LLM returned an empty response for model {model}")
+
+            except OllamaTimeoutError:
+                outcome = "timeout"
+                outcomes.append(outcome)
+                daemon_breaker.record_success()
+                model_breaker.record_failure()
+                timeout_policy.record(model, prompt_sent, attempt_timeout, outcome, was_cold)
+                logging.warning(f"Timeout after {attempt_timeout:.1f}s on attempt {attempt + 1} for model {model}")
+
+            except OllamaError as e:
+                if e.status_code is None:
+                    # Connection-level failure: the daemon itself is unreachable
+                    outcomes.append("unreachable")
+                    daemon_breaker.record_failure()
+                else:
+                    outcomes.append("error")
+                    daemon_breaker.record_success()
+                model_breaker.record_failure()
+                logging.warning(f"LLM returned error: {e}")
 
-        except subprocess.TimeoutExpired:
-            logging.warning(f"Timeout on attempt {attempt + 1} for model {model}")
+            except Exception as e:
+                outcomes.append("error")
+                # Says nothing about the daemon, but must not keep its half-open probe
+                daemon_breaker.release()
+                model_breaker.record_failure()
+                logging.error(f"Error on attempt {attempt + 1} for model {model}: {e}")
 
-        except Exception as e:
-            logging.error(f"Error on attempt {attempt + 1} for model {model}: {e}")
+            performance_monitor.log_timeout(model, attempt_timeout, outcome)
 
-        # Wait before retry (exponential backoff)
-        if attempt < max_retries:
-            wait_time = (2 ** attempt) + random.uniform(0, 1)
-            logging.info(f"Retrying in {wait_time:.1f} seconds...")
-            time.sleep(wait_time)
+            # Wait before retry (exponential backoff), unless the breaker just opened
+            if attempt < max_retries and not (model_breaker.is_open() or daemon_breaker.is_open()):
+                wait_time = (2 ** attempt) + random.uniform(0, 1)
+                logging.info(f"Retrying in {wait_time:.1f} seconds...")
+                time.sleep(wait_time)
 
     # All retries failed
     duration = time.time() - start_time
-    performance_monitor.log_request("llm", model, duration, False, max_retries)
-    logging.error(f"All {max_retries + 1} attempts failed for model {model}")
-    return "Response failed after multiple retries."
+    performance_monitor.log_request("llm", model, duration, False, max(0, attempts - 1), call_type,
+                                    persona_name(persona_file))
+    logging.error(f"All {attempts} attempts failed for model {model}")
+    if outcomes and "unreachable" not in outcomes:
+        failure_class = "timeout" if all(o == "timeout" for o in outcomes) else outcomes[-1]
+        get_model_cache().set_failure(prompt, model, failure_class, len(outcomes), persona_file)
+    return None
 
 # Health Check System
 class HealthChecker:
+    # Both checks read the shared inventory snapshot, so check_all costs one query
     @staticmethod
     def check_ollama_service() -> bool:
-        """Check if Ollama service is running"""
-        try:
-            result = subprocess.run([OLLAMA_BIN, "list"], capture_output=True, timeout=5)
-            return result.returncode == 0
-        except Exception:
-            return False
+        """Check if the LLM backend (Ollama or the emulator) is answering"""
+        return get_inventory().is_available()
 
     @staticmethod
     def check_models_available() -> Dict[str, bool]:
         """Check which models are available"""
-        model_status = {}
-        try:
-            result = subprocess.run([OLLAMA_BIN, "list"], capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                available_models = result.stdout
-                for model in set(PERSONA_MODEL_MAP.values()):
-                    model_status[model] = model in available_models
-            else:
-                # If command failed, assume all models unavailable
-                for model in set(PERSONA_MODEL_MAP.values()):
-                    model_status[model] = False
-        except Exception as e:
-            logging.error(f"Health check failed: {e}")
-            for model in set(PERSONA_MODEL_MAP.values()):
-                model_status[model] = False
+        inventory = get_inventory().snapshot()
+        if not inventory.available:
+            logging.error(f"Health check failed: {inventory.error}")
+        return {model: inventory.is_installed(model) for model in set(PERSONA_MODEL_MAP.values())}
 
-        return model_status
+    @staticmethod
+    def check_residency() -> Dict:
+        """Plan memory for all persona models, weighted by how many personas use each."""
+        demand: Dict[str, int] = {}
+        for model in PERSONA_MODEL_MAP.values():
+            demand[model] = demand.get(model, 0) + 1
+        return ResidencyPlanner().plan(demand).summary()
 
     @staticmethod
     def get_system_health() -> Dict:
@@ -331,8 +986,12 @@ class HealthChecker:
         return {
             'ollama_service': HealthChecker.check_ollama_service(),
             'models': HealthChecker.check_models_available(),
-            'cache_status': model_cache.cache_file.exists(),
-            'performance_log': PERFORMANCE_LOG_FILE.exists(),
+            'residency': HealthChecker.check_residency(),
+            'cache_status': get_model_cache().cache_file.exists(),
+            'performance_log': get_event_log().path.exists(),
+            'circuit_breakers': get_circuit_breakers().snapshot(),
+            'retry_budget': get_retry_budget().snapshot(),
+            'inventory_queries': get_inventory().queries,
             'timestamp': datetime.now().isoformat()
         }
 
@@ -345,6 +1004,9 @@ class HealthChecker:
 def get_persona_model(persona_name: str) -> str:
     return PERSONA_MODEL_MAP.get(persona_name, OLLAMA_MODEL)
 
+def get_persona_file(persona_name: str) -> Path:
+    return PERSONA_DIR / f"{persona_name}.md"
+
 def get_persona_files() -> List[Path]:
     return sorted(PERSONA_DIR.glob("*.md"))
 
@@ -426,7 +1088,8 @@ OPTIONS: [option1] | [option2] | [option3]
 """
 
     response_start = time.time()
-    response = ollama_generate_with_retry(prompt, model=model)
+    response = ollama_generate_with_retry(prompt, model=model, call_type="question",
+                                      persona_file=get_persona_file(persona_name))
     response_time = time.time() - response_start
 
     print(f"[Timing] LLM response time: {response_time:.2f} seconds.")
@@ -477,7 +1140,8 @@ And this meeting transcript:
 Provide a brief summary of your participation and a clear path forward recommendation (2-3 sentences max).
 """
 
-    return ollama_generate_with_retry(prompt, model=model, timeout=15)
+    return ollama_generate_with_retry(prompt, model=model, call_type="summary",
+                                      persona_file=get_persona_file(persona_name))
 
 def persona_vote(persona_name: str, recommendations: List[str]) -> str:
     """Enhanced voting with performance monitoring"""
@@ -494,7 +1158,8 @@ Respond with just the number of your choice (1-{len(recommendations)}).
 """
 
     try:
-        response = ollama_generate_with_retry(prompt, model=model, timeout=10)
+        response = ollama_generate_with_retry(prompt, model=model, call_type="vote",
+                                              persona_file=get_persona_file(persona_name))
         choice_num = int(response.strip())
         if 1 <= choice_num <= len(recommendations):
             return recommendations[choice_num - 1]
@@ -504,14 +1169,6 @@ Respond with just the number of your choice (1-{len(recommendations)}).
     # Fallback to first recommendation
     return recommendations[0] if recommendations else NO_COMMENT
 
-def save_performance_report():
-    """Save performance report to file"""
-    report = performance_monitor.get_report()
-    with open(PERFORMANCE_LOG_FILE, 'a') as f:
-        f.write(f"\n=== Performance Report {datetime.now().isoformat()} ===\n")
-        f.write(report)
-        f.write("\n" + "="*50 + "\n")
-
 def main():
     """Enhanced main function with comprehensive monitoring and error handling"""
     parser = argparse.ArgumentParser(description="Enhanced LLM Meeting Orchestrator")
@@ -519,9 +1176,19 @@ def main():
     parser.add_argument("--agenda", help="Meeting agenda")
     parser.add_argument("--health-check", action="store_true", help="Run system health check")
     parser.add_argument("--performance-report", action="store_true", help="Show performance report")
+    parser.add_argument("--no-stream", action="store_true", help="Wait for full responses instead of streaming tokens")
+    parser.add_argument("--hedge", action="store_true",
+                        help="Hedge calls slower than the model's p95 to OLLAMA_HEDGE_HOST or OLLAMA_HEDGE_MODEL "
+                             "(a streamed turn keeps whichever leg answers first)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Persona requests to run in parallel per phase (streamed output stays in speaking order)")
+    parser.add_argument("--no-sessions", action="store_true",
+                        help="Resend the full discussion context every round instead of reusing persona sessions")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Reuse cached responses for near-duplicate prompts (needs NumPy and an embedding model)")
     args = parser.parse_args()
 
-    # Set up enhanced logging
+    # Set up enhanced logging first: starting exporters and opening the cache both log
     log_file = Path(__file__).parent / "meetingdebug_enhanced.log"
     logging.basicConfig(
         level=logging.INFO,
@@ -532,6 +1199,16 @@ def main():
         ]
     )
 
+    # Exported only when METRICS_PORT or METRICS_TEXTFILE is set (see metrics_exporter.py)
+    start_metrics("meeting")
+    get_event_log().tool = "meeting"
+
+    if args.hedge:
+        global HEDGING_ENABLED
+        HEDGING_ENABLED = True
+    if args.semantic_cache:
+        get_model_cache().enable_semantic_cache()
+
     if args.health_check:
         health = HealthChecker.get_system_health()
         print("=== System Health Check ===")
@@ -541,9 +1218,22 @@ def main():
             print(f"  {model}: {'✅' if available else '❌'}")
         print(f"Cache System: {'✅' if health['cache_status'] else '❌'}")
         print(f"Performance Logging: {'✅' if health['performance_log'] else '❌'}")
+        if health['circuit_breakers']:
+            print("Circuit Breakers:")
+            for name, breaker in health['circuit_breakers'].items():
+                print(f"  {name}: {breaker['state']} ({breaker['trips']} trips)")
+        residency = health['residency']
+        if residency['budget_gb'] is not None:
+            print(f"Model Memory (budget {residency['budget_gb']:.1f} GiB):")
+            for model, size in residency['footprints_gb'].items():
+                status = "co-resident" if model in residency['co_resident'] else "loaded in turn"
+                print(f"  {model}: {size:.1f} GiB, {status}")
+            for warning in residency['warnings']:
+                print(f"  ⚠️  {warning}")
         return
 
     if args.performance_report:
+        performance_monitor.log_cache_store(get_model_cache().stats())
         print(performance_monitor.get_report())
         return
 
@@ -574,18 +1264,18 @@ def main():
 
     try:
         # Initialize enhanced meeting orchestrator
-        orchestrator = EnhancedMeetingOrchestrator(args.title, args.agenda)
+        orchestrator = EnhancedMeetingOrchestrator(args.title, args.agenda, stream=not args.no_stream,
+                                                   concurrency=args.concurrency, sessions=not args.no_sessions)
         orchestrator.run_meeting()
 
         meeting_duration = time.time() - meeting_start
         logging.info(f"Meeting completed successfully in {meeting_duration:.2f} seconds")
-
-        # Save final performance report
-        save_performance_report()
+        get_event_log().write("meeting", title=args.title, duration=round(meeting_duration, 3), success=True)
 
         print("\n✅ Meeting completed successfully!")
         print(f"⏱️  Total duration: {meeting_duration:.2f} seconds")
-        print(f"📊 Performance report saved to {PERFORMANCE_LOG_FILE}")
+        print(f"📊 Performance events logged to {get_event_log().path} "
+              f"(query with: performance_log.py query --group-by model)")
 
     except KeyboardInterrupt:
         print("\n\n❌ Meeting interrupted by user.")
@@ -595,16 +1285,73 @@ def main():
         print(f"\n❌ Meeting failed: {str(e)}")
         sys.exit(1)
 
+# Live output for concurrent persona turns
+class StreamRelay:
+    """
+    Prints concurrently streamed persona responses in speaking order. Only the
+    persona at the head of the order is live; the others buffer their tokens
+    until it is their turn, then print what they have and continue live.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, List[str]] = {}
+        # Whether each persona has printed anything since its last restart
+        self._shown: Dict[str, bool] = {}
+        self._live: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def on_token(self, persona_name: str) -> Callable[[str], None]:
+        """Token callback for one persona's generation."""
+        def forward(token: str) -> None:
+            with self._lock:
+                buffer = self._buffers.setdefault(persona_name, [])
+                if persona_name == self._live:
+                    print(token, end="", flush=True)
+                    self._shown[persona_name] = token != STREAM_RESTART_MARKER
+                elif token == STREAM_RESTART_MARKER:
+                    # Nobody saw the partial output, so there is nothing to retract
+                    buffer.clear()
+                else:
+                    buffer.append(token)
+        return forward
+
+    def go_live(self, persona_name: str, print_header: Callable[[str], None]) -> None:
+        """Print the header and buffered tokens; later tokens print as they arrive."""
+        with self._lock:
+            print_header(persona_name)
+            buffered = "".join(self._buffers.pop(persona_name, []))
+            print(buffered, end="", flush=True)
+            self._shown[persona_name] = bool(buffered)
+            self._live = persona_name
+
+    def finish(self, persona_name: str, response: Optional[str]) -> None:
+        """End the live persona's output, printing `response` if no tokens were shown."""
+        with self._lock:
+            if response is not None and not self._shown.get(persona_name):
+                # Generation failed before any (kept) token arrived; show the fallback text
+                print(response, end="")
+            print()
+            self._live = None
+
 # Enhanced Meeting Orchestrator Class
 class EnhancedMeetingOrchestrator:
     """Enhanced meeting orchestrator with comprehensive monitoring and reliability improvements."""
 
-    def __init__(self, title: str, agenda: str):
+    def __init__(self, title: str, agenda: str, stream: bool = True, concurrency: int = DEFAULT_CONCURRENCY,
+                 sessions: bool = True):
         self.title = title
         self.agenda = agenda
+        self.stream = stream
+        self.concurrency = max(1, concurrency)
+        self.use_sessions = sessions
         self.logger = logging.getLogger(__name__)
         self.meeting_memory = {}
         self.user_context = {}
+        # Per-persona Ollama conversation state, so later rounds send only new material
+        self.sessions: Dict[str, PersonaSession] = {}
+        # Groups each phase's calls by model; shares the warm pool once it exists
+        self.scheduler = ModelAffinityScheduler()
+        self.recommendations_model = RECOMMENDATIONS_MODEL
 
         # Load personas
         self.personas = self.load_personas()
@@ -613,6 +1360,7 @@ class EnhancedMeetingOrchestrator:
         self.performance_monitor = None
         self.model_cache = None
         self.health_checker = None
+        self.warm_pool = None
 
     def load_personas(self) -> Dict[str, Dict]:
         """Load all persona configurations."""
@@ -623,22 +1371,109 @@ class EnhancedMeetingOrchestrator:
             persona_name = persona_file.stem.replace('-', ' ').title()
             personas[persona_name] = {
                 "content": read_persona(persona_file),
-                "model": get_persona_model(persona_name),
+                # PERSONA_MODEL_MAP is keyed by file stem, not display name
+                "model": get_persona_model(persona_file.stem),
                 "file": persona_file
             }
 
         self.logger.info(f"Loaded {len(personas)} personas: {list(personas.keys())}")
         return personas
 
-    def ask_llm_with_retry(self, prompt: str, model: str, max_retries: int = MAX_RETRIES, timeout: int = DEFAULT_TIMEOUT) -> str:
+    def ask_llm_with_retry(self, prompt: str, model: str, max_retries: int = MAX_RETRIES, timeout: Optional[float] = None,
+                           on_token: Optional[Callable[[str], None]] = None,
+                           session: Optional[PersonaSession] = None,
+                           call_type: str = DEFAULT_CALL_TYPE, persona_file: Optional[Path] = None) -> str:
         """Wrapper for LLM generation with retry logic."""
-        return ollama_generate_with_retry(prompt, model, timeout, max_retries)
+        return ollama_generate_with_retry(prompt, model, timeout, max_retries, on_token=on_token, session=session,
+                                          call_type=call_type, persona_file=persona_file)
+
+    def ask_llm_streaming(self, prompt: str, model: str, session: Optional[PersonaSession] = None,
+                          call_type: str = DEFAULT_CALL_TYPE, persona_file: Optional[Path] = None) -> str:
+        """Generate a response, printing tokens as they arrive when streaming is enabled."""
+        if not self.stream:
+            response = self.ask_llm_with_retry(prompt, model, session=session, call_type=call_type,
+                                               persona_file=persona_file)
+            print(response)
+            return response
+
+        printed = []
+
+        def print_token(token: str) -> None:
+            print(token, end="", flush=True)
+            if token == STREAM_RESTART_MARKER:
+                printed.clear()
+            else:
+                printed.append(token)
+
+        response = self.ask_llm_with_retry(prompt, model, on_token=print_token, session=session, call_type=call_type,
+                                           persona_file=persona_file)
+        if not printed:
+            # Generation failed before any (kept) token arrived; show the fallback text
+            print(response, end="")
+        print()
+        return response
+
+    def generate_for_personas(self, requests: List[Tuple[str, str, str]], display: bool = False,
+                              call_type: str = DEFAULT_CALL_TYPE) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+        """
+        Run (persona, prompt, model) requests with up to `self.concurrency` workers.
+        Personas with a session must have their turn prepared; `prompt` is then the full fallback.
+        Calls are grouped by model (see model_scheduler.py), but results are yielded
+        as (persona, response, error) in request order regardless of completion order.
+        With `display`, each response is printed under its persona header. With
+        streaming enabled, the next persona in order prints tokens live while later
+        ones buffer theirs (see StreamRelay); a single worker streams each in turn.
+        """
+        if display and self.stream and self.concurrency == 1:
+            for persona_name, prompt, model in requests:
+                self.print_persona_header(persona_name)
+                try:
+                    yield persona_name, self.ask_llm_streaming(prompt, model, self.sessions.get(persona_name),
+                                                               call_type, self.personas[persona_name]["file"]), None
+                except Exception as e:
+                    yield persona_name, None, e
+            return
+
+        relay = StreamRelay() if display and self.stream else None
+        batch = [GenerationRequest(prompt, model, key=persona_name) for persona_name, prompt, model in requests]
+        results = generate_many_ordered(
+            batch, max_concurrency=self.concurrency,
+            priority=self.scheduler.plan(batch), on_dispatch=self.scheduler.on_dispatch,
+            generate_fn=lambda request: self.ask_llm_with_retry(request.prompt, request.model,
+                                                                on_token=relay.on_token(request.key) if relay else None,
+                                                                session=self.sessions.get(request.key),
+                                                                call_type=call_type,
+                                                                persona_file=self.personas[request.key]["file"])
+        )
+        if relay and batch:
+            relay.go_live(batch[0].key, self.print_persona_header)
+        for index, result in enumerate(results):
+            if relay:
+                relay.finish(result.key, result.text)
+            if not result.ok:
+                yield result.key, None, result.error
+            else:
+                self.logger.debug(f"{result.key}: {result.latency:.2f}s, cache_hit={result.cache_hit}, "
+                                  f"retries={result.retries}")
+                if display and not relay:
+                    self.print_persona_header(result.key)
+                    print(result.text)
+                yield result.key, result.text, None
+            if relay and index + 1 < len(batch):
+                relay.go_live(batch[index + 1].key, self.print_persona_header)
+        performance_monitor.log_model_scheduling(self.scheduler.snapshot())
+
+    @staticmethod
+    def print_persona_header(persona_name: str) -> None:
+        print(f"\n{persona_name}:")
+        print("-" * 40)
 
     def run_meeting(self) -> None:
         """Run the complete enhanced meeting with all monitoring systems."""
         try:
-            self.performance_monitor = PerformanceMonitor()
-            self.model_cache = ModelCache()
+            self.performance_monitor = performance_monitor
+            # One store per process: it is thread-safe and SQLite arbitrates between processes
+            self.model_cache = get_model_cache()
             self.health_checker = HealthChecker()
 
             # Start performance monitoring
@@ -655,9 +1490,10 @@ class EnhancedMeetingOrchestrator:
             self.initial_user_questions()
 
             # Main meeting phases
-            self.run_pre_meeting_phase()
-            self.run_discussion_phase()
-            self.run_conclusion_phase()
+            for phase, run in (("pre_meeting", self.run_pre_meeting_phase),
+                               ("discussion", self.run_discussion_phase),
+                               ("conclusion", self.run_conclusion_phase)):
+                self.run_logged_phase(phase, run)
 
             self.logger.info("Meeting completed successfully")
 
@@ -666,25 +1502,85 @@ class EnhancedMeetingOrchestrator:
             print(f"\nError: Meeting failed - {str(e)}")
             raise
         finally:
+            if self.warm_pool:
+                self.warm_pool.release()
+
             # Save performance metrics
             if hasattr(self, 'performance_monitor'):
+                self.performance_monitor.log_cache_store(get_model_cache().stats())
                 self.performance_monitor.save_metrics()
 
-    def initialize_models(self) -> None:
-        """Pre-load models for faster response times."""
-        self.logger.info("Initializing models...")
+    def run_logged_phase(self, phase: str, run: Callable[[], None]) -> None:
+        """Run one meeting phase and log a `phase` event with its duration and LLM call count."""
+        start = time.time()
+        requests_before = self.performance_monitor.metrics['total_requests']
+        success = False
+        try:
+            run()
+            success = True
+        finally:
+            get_event_log().write("phase", phase=phase, title=self.title, duration=round(time.time() - start, 3),
+                                  success=success,
+                                  llm_calls=self.performance_monitor.metrics['total_requests'] - requests_before)
+
+    def meeting_models(self) -> List[str]:
+        """Every model this meeting will call: persona models plus the recommendations model."""
+        models = {persona["model"] for persona in self.personas.values()}
+        models.add(self.recommendations_model)
+        return sorted(models)
+
+    def model_demand(self) -> Dict[str, int]:
+        """Expected calls per model: one per persona per phase, one for the recommendations."""
+        demand: Dict[str, int] = {}
+        for persona in self.personas.values():
+            demand[persona["model"]] = demand.get(persona["model"], 0) + 1
+        demand[self.recommendations_model] = demand.get(self.recommendations_model, 0) + 1
+        return demand
+
+    def apply_residency_plan(self, plan: ResidencyPlan) -> None:
+        """Switch to downgraded models and print warnings before anything is loaded."""
+        for persona in self.personas.values():
+            persona["model"] = plan.model_for(persona["model"])
+        self.recommendations_model = plan.model_for(self.recommendations_model)
+
+        for warning in plan.warnings:
+            self.logger.warning(warning)
+            print(f"[Residency] ⚠️  {warning}")
+        if plan.rotating:
+            print(f"[Residency] Not enough memory to keep {', '.join(plan.rotating)} loaded alongside "
+                  f"{', '.join(plan.co_resident) or 'the other models'}; they will be loaded in turn.")
+
+        self.scheduler.residency = plan
+        self.performance_monitor.log_residency(plan.summary())
 
+    def initialize_models(self) -> None:
+        """
+        Plan memory for the meeting's models, then preload the ones that fit
+        together concurrently and keep them resident for the meeting.
+        """
         try:
-            # Pre-warm primary models
-            for model in ["llama3.2:latest", "codegemma:latest", "phi3:latest"]:
-                self.logger.info(f"Pre-loading model: {model}")
-                try:
-                    # Quick test query to load model
-                    self.ask_llm_with_retry("Test", model, max_retries=1, timeout=30)
+            plan = ResidencyPlanner(keep_alive=MEETING_KEEP_ALIVE).plan(self.model_demand())
+            self.apply_residency_plan(plan)
+
+            self.warm_pool = ModelWarmPool(keep_alive=MEETING_KEEP_ALIVE, keep_alive_overrides=plan.keep_alive)
+            self.scheduler.warm_pool = self.warm_pool
+            for model in plan.unload_first:
+                self.warm_pool.unload(model)
+
+            # Models that rotate are loaded on demand by the scheduler
+            models = [model for model in self.meeting_models() if model not in plan.rotating]
+            self.logger.info(f"Initializing models: {', '.join(models)}")
+            reports = self.warm_pool.preload(models)
+
+            print("\n[Warm Pool] Model load times:")
+            for model, report in reports.items():
+                self.performance_monitor.log_model_load(model, report.wall_time, report.success)
+                if report.success:
+                    get_timeout_policy().mark_warm(model)
                     self.model_cache.cache_model(model)
-                    self.logger.info(f"Model {model} loaded successfully")
-                except Exception as e:
-                    self.logger.warning(f"Failed to pre-load model {model}: {str(e)}")
+                    print(f"  {model}: ready in {report.wall_time:.2f}s")
+                else:
+                    print(f"  {model}: failed to load ({report.error})")
 
         except Exception as e:
             self.logger.error(f"Model initialization failed: {str(e)}")
@@ -746,27 +1642,29 @@ class EnhancedMeetingOrchestrator:
         # Prepare context for personas
         context_summary = self.prepare_context_summary()
 
-        # Each persona prepares their approach
+        # Each persona prepares their approach; preparations are independent
+        requests = []
         for persona_name in self.personas.keys():
             self.logger.info(f"Pre-meeting preparation for {persona_name}")
+            prompt = (f"Based on this meeting context: {context_summary}\n\n"
+                      f"Prepare your approach as {persona_name}. What key points will you focus on? "
+                      f"Keep this brief (2-3 sentences).")
+            if self.use_sessions:
+                # Opens the session: meeting context and preparation stay in the model's context
+                self.start_session(persona_name).prepare(prompt, prompt, "preparation")
+            requests.append((persona_name, prompt, self.personas[persona_name]["model"]))
+
+        for persona_name, prep_response, error in self.generate_for_personas(requests, call_type="preparation"):
+            if error:
+                self.logger.error(f"Pre-meeting preparation failed for {persona_name}: {str(error)}")
+                continue
+
+            self.meeting_memory[persona_name] = {
+                "preparation": prep_response,
+                "responses": []
+            }
 
-            try:
-                prep_response = self.ask_llm_with_retry(
-                    f"Based on this meeting context: {context_summary}\n\n"
-                    f"Prepare your approach as {persona_name}. What key points will you focus on? "
-                    f"Keep this brief (2-3 sentences).",
-                    self.personas[persona_name]["model"]
-                )
-
-                self.meeting_memory[persona_name] = {
-                    "preparation": prep_response,
-                    "responses": []
-                }
-
-                self.logger.info(f"{persona_name} preparation complete")
-
-            except Exception as e:
-                self.logger.error(f"Pre-meeting preparation failed for {persona_name}: {str(e)}")
+            self.logger.info(f"{persona_name} preparation complete")
 
     def prepare_context_summary(self) -> str:
         """Create a summary of user context for persona preparation."""
@@ -798,33 +1696,30 @@ class EnhancedMeetingOrchestrator:
             # All personas except Mrs. Violet Noire participate
             discussion_personas = [name for name in self.personas.keys() if name != FINAL_PERSONA]
 
+            # Contexts only depend on earlier rounds, so build them all before fanning out
+            requests = []
             for persona_name in discussion_personas:
                 self.logger.info(f"Getting response from {persona_name}")
-
-                try:
-                    # Build context from previous rounds
-                    context = self.build_discussion_context(persona_name, round_count)
-
-                    response = self.ask_llm_with_retry(
-                        context,
-                        self.personas[persona_name]["model"]
+                full_prompt = self.build_discussion_context(persona_name, round_count)
+                if self.use_sessions:
+                    self.start_session(persona_name).prepare(
+                        self.build_discussion_update(persona_name, round_count), full_prompt, f"Round {round_count}"
                     )
+                requests.append((persona_name, full_prompt, self.personas[persona_name]["model"]))
 
-                    # Store response
-                    self.meeting_memory[persona_name]["responses"].append({
-                        "round": round_count,
-                        "response": response
-                    })
-
-                    print(f"\n{persona_name}:")
-                    print("-" * 40)
-                    print(response)
+            for persona_name, response, error in self.generate_for_personas(requests, display=True, call_type="discussion"):
+                if error:
+                    self.logger.error(f"Failed to get response from {persona_name}: {str(error)}")
+                    print(f"\n{persona_name}: [Unable to respond - technical issue]")
+                    continue
 
-                    self.logger.info(f"{persona_name} responded successfully")
+                # Store response
+                self.meeting_memory.setdefault(persona_name, {"responses": []})["responses"].append({
+                    "round": round_count,
+                    "response": response
+                })
 
-                except Exception as e:
-                    self.logger.error(f"Failed to get response from {persona_name}: {str(e)}")
-                    print(f"\n{persona_name}: [Unable to respond - technical issue]")
+                self.logger.info(f"{persona_name} responded successfully")
 
             # Check if we should continue
             if round_count < max_rounds:
@@ -836,6 +1731,42 @@ class EnhancedMeetingOrchestrator:
                 if "No" in continue_discussion:
                     break
 
+    def start_session(self, persona_name: str) -> PersonaSession:
+        """Return the persona's session, opening one on its assigned model if needed."""
+        if persona_name not in self.sessions:
+            self.sessions[persona_name] = PersonaSession(persona_name, self.personas[persona_name]["model"])
+        return self.sessions[persona_name]
+
+    def build_discussion_update(self, persona_name: str, round_count: int) -> str:
+        """
+        New material for a persona whose session already holds the meeting context,
+        its preparation and its own earlier responses: only last round's other responses.
+        """
+        update_parts = []
+
+        if round_count > 1:
+            update_parts.append("New discussion points:")
+            for other_persona in self.meeting_memory:
+                if other_persona != persona_name and "responses" in self.meeting_memory[other_persona]:
+                    for response_data in self.meeting_memory[other_persona]["responses"]:
+                        if response_data["round"] == round_count - 1:
+                            update_parts.append(f"{other_persona} (Round {response_data['round']}): {response_data['response'][:200]}...")
+
+        update_parts.append(self.discussion_instruction(persona_name, round_count))
+
+        return "\n".join(update_parts)
+
+    @staticmethod
+    def discussion_instruction(persona_name: str, round_count: int) -> str:
+        persona_prompt = f"\nAs {persona_name}, provide your perspective on the discussion. "
+
+        if round_count == 1:
+            persona_prompt += "Share your initial thoughts and key points."
+        else:
+            persona_prompt += "Build on the previous discussion and add new insights."
+
+        return persona_prompt
+
     def build_discussion_context(self, persona_name: str, round_count: int) -> str:
         """Build contextual prompt for persona based on meeting history."""
         context_parts = []
@@ -857,14 +1788,7 @@ class EnhancedMeetingOrchestrator:
                             context_parts.append(f"{other_persona} (Round {response_data['round']}): {response_data['response'][:200]}...")
 
         # Add persona-specific prompt
-        persona_prompt = f"\nAs {persona_name}, provide your perspective on the discussion. "
-
-        if round_count == 1:
-            persona_prompt += "Share your initial thoughts and key points."
-        else:
-            persona_prompt += "Build on the previous discussion and add new insights."
-
-        context_parts.append(persona_prompt)
+        context_parts.append(self.discussion_instruction(persona_name, round_count))
 
         return "\n".join(context_parts)
 
@@ -883,14 +1807,14 @@ class EnhancedMeetingOrchestrator:
 
             self.logger.info(f"Getting final review from {FINAL_PERSONA}")
 
-            final_response = self.ask_llm_with_retry(
-                final_context,
-                self.personas[FINAL_PERSONA]["model"]
-            )
-
             print(f"\n{FINAL_PERSONA} (Final Review):")
             print("-" * 50)
-            print(final_response)
+            final_response = self.ask_llm_streaming(
+                final_context,
+                self.personas[FINAL_PERSONA]["model"],
+                call_type="final_review",
+                persona_file=self.personas[FINAL_PERSONA]["file"]
+            )
 
             # Store final response
             if FINAL_PERSONA not in self.meeting_memory:
@@ -950,7 +1874,8 @@ class EnhancedMeetingOrchestrator:
 
             recommendations_response = self.ask_llm_with_retry(
                 recommendations_context,
-                "llama3.2:latest"
+                self.recommendations_model,
+                call_type="recommendations"
             )
 
             print("\nTop Actionable Recommendations:")
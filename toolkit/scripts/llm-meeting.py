@@ -2,10 +2,19 @@ import logging
 import os
 import json
 import sys
-import subprocess
 import time
+from collections import deque
 from pathlib import Path
 
+from batch import GenerationRequest, current_call_stats, generate_many_ordered
+from cache_keys import request_key
+from model_inventory import get_inventory
+from model_pulls import get_puller
+from model_scheduler import ModelAffinityScheduler
+from ollama_client import OllamaError, OllamaTimeoutError, get_client
+from single_flight import get_single_flight
+from timeout_policy import get_timeout_policy
+
 # Set up logging to meetingdebug.log
 LOG_PATH = str(Path(__file__).parent / "meetingdebug.log")
 logging.basicConfig(
@@ -54,25 +63,102 @@ PERSONA_MODEL_MAP = {
     # Default
 }
 OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.1")
-OLLAMA_BIN = os.environ.get("OLLAMA_BIN", "ollama")
+# Parallel persona calls for the summary and voting rounds
+MEETING_CONCURRENCY = int(os.environ.get("MEETING_CONCURRENCY", "4"))
 
 # Utility functions
 
-def ollama_generate(prompt, model=OLLAMA_MODEL, timeout=10):
+def ollama_generate(prompt, model=OLLAMA_MODEL, timeout=None, coalesce=True):
     """
-    Run ollama with a timeout (in seconds). If timeout is exceeded, return a default message.
+    Generate via the shared Ollama HTTP client with a timeout (in seconds).
+    Without an explicit timeout, the adaptive per-model policy picks one.
+    Identical prompts already in flight share one generation unless `coalesce`
+    is False (each caller wants its own sample, e.g. a vote).
+    If timeout is exceeded, return a default message.
     """
+    timeout_policy = get_timeout_policy()
+    was_cold = timeout_policy.is_cold(model)
+    if timeout is None:
+        timeout = timeout_policy.timeout_for(model, prompt, cold=was_cold)
+
+    def generate():
+        # Only the caller that runs the generation feeds the latency history;
+        # coalesced waits and empty answers would skew the learned percentiles
+        generation_start = time.time()
+        try:
+            text = get_client().generate_text(prompt, model, timeout=timeout)
+        except OllamaTimeoutError:
+            timeout_policy.record(model, prompt, timeout, "timeout", was_cold)
+            raise
+        if text:
+            timeout_policy.record(model, prompt, time.time() - generation_start, "success", was_cold)
+        return text
+
+    start = time.time()
     try:
-        result = subprocess.run([
-            OLLAMA_BIN, "run", model, prompt
-        ], capture_output=True, text=True, timeout=timeout)
-        return result.stdout.strip()
-    except subprocess.TimeoutExpired:
+        response, shared = get_single_flight().do(request_key(prompt, model), generate,
+                                                   coalesce=coalesce, max_wait=timeout)
+        current_call_stats().coalesced = shared
+        logging.info(f"Generated with model '{model}' in {time.time() - start:.2f}s (timeout {timeout}s)")
+        return response
+    except OllamaTimeoutError:
+        logging.warning(f"Model '{model}' timed out after {timeout}s")
         return "Response timed out."
+    except OllamaError as e:
+        logging.warning(f"Ollama generation failed for model '{model}': {e}")
+        return ""
 
-def get_persona_model(persona_name):
+def requested_persona_model(persona_name):
     return PERSONA_MODEL_MAP.get(persona_name, OLLAMA_MODEL)
 
+def get_persona_model(persona_name):
+    """The persona's model, or the default model while its own is still downloading."""
+    return get_puller().model_for(requested_persona_model(persona_name), OLLAMA_MODEL)
+
+def start_model_pulls(personas):
+    """Start background pulls for any missing persona model (default model first)."""
+    models = [OLLAMA_MODEL] + [requested_persona_model(name) for name, _ in personas]
+    missing = get_puller().start(models)
+    if missing:
+        print(f"[Status] Downloading missing models in the background: {', '.join(missing)}")
+    return missing
+
+def print_pull_progress():
+    puller = get_puller()
+    if puller.pending():
+        print(f"[Status] Model downloads: {puller.progress()}")
+
+def wait_for_persona_model(persona_name):
+    """Block only when neither the persona's model nor the default is ready. Returns True if it waited."""
+    puller = get_puller()
+    model = get_persona_model(persona_name)
+    if not puller.is_pulling(model):
+        return False
+    print(f"[Status] Waiting for model '{model}' to finish downloading... (timer paused)")
+    wait_start = time.time()
+    puller.wait(model)
+    print(f"[Status] Model '{model}' ready after {time.time() - wait_start:.2f} seconds.")
+    return True
+
+def turns_by_model_readiness(personas):
+    """
+    Yield personas in order, moving each one whose model is still downloading
+    behind the others once. Evaluated lazily, so every turn sees current progress.
+    """
+    queue = deque(personas)
+    deferred = set()
+    puller = get_puller()
+    while queue:
+        persona_name, persona_desc = queue.popleft()
+        model = requested_persona_model(persona_name)
+        if (puller.is_pulling(model) and persona_name not in deferred
+                and any(name not in deferred for name, _ in queue)):
+            deferred.add(persona_name)
+            queue.append((persona_name, persona_desc))
+            logging.info(f"Deferring '{persona_name}' while '{model}' downloads.")
+            continue
+        yield persona_name, persona_desc
+
 def get_persona_files():
     return sorted(PERSONA_DIR.glob("*.md"))
 
@@ -125,7 +211,7 @@ Meeting Context:
     model = get_persona_model(persona_name)
     print(f"[Timing] Generating question for {persona_name} using model '{model}'...")
     t0 = time.time()
-    response = ollama_generate(prompt, model=model, timeout=10)
+    response = ollama_generate(prompt, model=model)
     t1 = time.time()
     elapsed = t1 - t0
     print(f"[Timing] LLM response time: {elapsed:.2f} seconds.")
@@ -140,8 +226,8 @@ Meeting Context:
     # fallback
     return "No valid question generated.", ["Exit"]
 
-def persona_summary_and_recommendation(persona_name, persona_desc, transcript):
-    prompt = f"""
+def persona_summary_prompt(persona_desc, transcript):
+    return f"""
 You are the persona below. Summarize your participation in the meeting and provide a clear path forward recommendation. Be concise.
 
 Persona Description:
@@ -150,18 +236,37 @@ Persona Description:
 Meeting Transcript:
 {transcript}
 """
-    model = get_persona_model(persona_name)
-    return ollama_generate(prompt, model=model)
 
-def persona_vote(persona_name, recommendations):
-    prompt = f"""
+def persona_vote_prompt(recommendations):
+    return f"""
 You are a meeting participant. Here are the recommendations from the meeting:
 {json.dumps(recommendations, indent=2)}
 
 If you were to vote for the best path forward, which would you choose? Reply with the exact recommendation text.
 """
-    model = get_persona_model(persona_name)
-    return ollama_generate(prompt, model=model)
+
+def generate_for_personas(requests, scheduler, coalesce=True):
+    """
+    Run GenerationRequests (key = persona name) through the batch API, grouped
+    by model via `scheduler`, yielding results in persona order.
+    """
+    return generate_many_ordered(
+        requests, max_concurrency=MEETING_CONCURRENCY,
+        priority=scheduler.plan(requests), on_dispatch=scheduler.on_dispatch,
+        generate_fn=lambda request: ollama_generate(request.prompt, model=request.model, coalesce=coalesce)
+    )
+
+def persona_votes(personas, recommendations, scheduler):
+    """
+    Ask every persona to vote, yielding results in persona order. All personas
+    get the same prompt, so coalescing is off: each vote is its own sample.
+    """
+    vote_prompt = persona_vote_prompt(recommendations)
+    vote_requests = [
+        GenerationRequest(vote_prompt, get_persona_model(persona_name), key=persona_name)
+        for persona_name, _ in personas
+    ]
+    return generate_for_personas(vote_requests, scheduler, coalesce=False)
 
 
 def print_progress_bar(iteration, total, prefix='', suffix='', length=40, fill='█'):
@@ -294,6 +399,9 @@ def main():
     print(f"\n[Meeting Status] Meeting '{args.title}' has started.")
     logging.info(f"Meeting started: Title='{args.title}', Agenda='{args.agenda}'")
 
+    # Missing models download while the user answers the initial questions
+    start_model_pulls(personas)
+
     total_personas = len(personas)
     meeting_start = time.time()
     persona_timings = {}
@@ -369,6 +477,7 @@ def main():
         }
         transcript.append(transcript_entry)
 
+        print_pull_progress()
         if user_answer != "No comment":
             input(f"{COLORS[q_idx % len(COLORS)]}Press Enter to continue to the next question...{RESET}")
 
@@ -383,7 +492,7 @@ def main():
             other_personas.append((persona_name, persona_desc))
 
     # Main meeting loop - other personas first (Mrs. Violet Noire speaks last)
-    for idx, (persona_name, persona_desc) in enumerate(other_personas, 1):
+    for idx, (persona_name, persona_desc) in enumerate(turns_by_model_readiness(other_personas), 1):
         logging.info(f"Persona {idx}/{len(other_personas)}: {persona_name} turn started.")
         print_progress_bar(idx-1, len(other_personas), prefix='Progress', suffix=f'{idx-1}/{len(other_personas)} personas complete')
         color = COLORS[(idx-1) % len(COLORS)]
@@ -391,27 +500,15 @@ def main():
         print(f"\n\n{color}=== {display_name} is speaking ==={RESET}")
         turn_start = time.time()
 
-        # Check if model is available, if not, wait and notify
-        model = get_persona_model(persona_name)
-        model_check_cmd = [OLLAMA_BIN, 'list']
-        waiting_for_model = False
-        try:
-            result = subprocess.run(model_check_cmd, capture_output=True, text=True, timeout=5)
-            if model not in result.stdout:
-                print(f"[Status] Model '{model}' not found. Downloading... (timer paused)")
-                waiting_for_model = True
-                wait_start = time.time()
-                pull_cmd = [OLLAMA_BIN, 'pull', model]
-                subprocess.run(pull_cmd)
-                wait_end = time.time()
-                print(f"[Status] Model '{model}' downloaded in {wait_end - wait_start:.2f} seconds.")
-        except Exception as e:
-            print(f"[Warning] Could not check/download model '{model}': {e}")
-
-        if waiting_for_model:
+        # Use the default model while the persona's own is still downloading
+        print_pull_progress()
+        if wait_for_persona_model(persona_name):
             # Reset turn_start after model download
             turn_start = time.time()
-            logging.info(f"Model '{model}' downloaded for persona '{persona_name}'.")
+        model = get_persona_model(persona_name)
+        if model != requested_persona_model(persona_name):
+            print(f"[Status] '{requested_persona_model(persona_name)}' is still downloading; {display_name} speaks with '{model}' for now.")
+            logging.info(f"Persona '{persona_name}' served by '{model}' while its model downloads.")
 
         # Personas ask each other questions, user just observes
         q, choices = persona_ask_question(persona_name, persona_desc, context, to_user=False)
@@ -473,25 +570,8 @@ def main():
         logging.info(f"Final speaker: {persona_name} turn started.")
 
         # Check if model is available
-        model = get_persona_model(persona_name)
-        model_check_cmd = [OLLAMA_BIN, 'list']
-        waiting_for_model = False
-        try:
-            result = subprocess.run(model_check_cmd, capture_output=True, text=True, timeout=5)
-            if model not in result.stdout:
-                print(f"[Status] Model '{model}' not found. Downloading... (timer paused)")
-                waiting_for_model = True
-                wait_start = time.time()
-                pull_cmd = [OLLAMA_BIN, 'pull', model]
-                subprocess.run(pull_cmd)
-                wait_end = time.time()
-                print(f"[Status] Model '{model}' downloaded in {wait_end - wait_start:.2f} seconds.")
-        except Exception as e:
-            print(f"[Warning] Could not check/download model '{model}': {e}")
-
-        if waiting_for_model:
+        if wait_for_persona_model(persona_name):
             turn_start = time.time()
-            logging.info(f"Model '{model}' downloaded for persona '{persona_name}'.")
 
         # Mrs. Violet Noire reviews the transcript and provides her informed opinion
         q = f"Having reviewed the discussion about '{args.agenda}', what is your final assessment and recommendation?"
@@ -542,8 +622,13 @@ def main():
         "dev-david-voice", "sysadmin-sam", "ai-architect-alex-voice", "devops-devon", "data-scientist-dana"
     ]
     tech_recommendations = {}
-    for persona_name, persona_desc in personas:
-        summary = persona_summary_and_recommendation(persona_name, persona_desc, transcript)
+    summary_requests = [
+        GenerationRequest(persona_summary_prompt(persona_desc, transcript), get_persona_model(persona_name), key=persona_name)
+        for persona_name, persona_desc in personas
+    ]
+    scheduler = ModelAffinityScheduler()
+    for result in generate_for_personas(summary_requests, scheduler):
+        persona_name, summary = result.key, result.text or ""
         print(f"\nSummary & Recommendation from {persona_name}:")
         print(summary)
         recommendations[persona_name] = summary
@@ -587,12 +672,10 @@ def main():
 
     # Personas vote only on the top recommendations (timed, max 10s each)
     votes = {"user": user_vote}
-    for persona_name, _ in personas:
-        vote_start = time.time()
-        vote = persona_vote(persona_name, top_recs)
-        vote_end = time.time()
-        persona_timings[persona_name]["vote_time"] = vote_end - vote_start
-        print(f"[Status] {persona_name} voted in {vote_end - vote_start:.2f} seconds.")
+    for result in persona_votes(personas, top_recs, scheduler):
+        persona_name, vote = result.key, result.text or ""
+        persona_timings[persona_name]["vote_time"] = result.latency
+        print(f"[Status] {persona_name} voted in {result.latency:.2f} seconds.")
         votes[persona_name] = vote
         logging.info(f"Persona '{persona_name}' voted for: {vote[:100]}{'...' if len(vote)>100 else ''}")
 
@@ -628,6 +711,13 @@ def main():
     for persona, timing in persona_timings.items():
         print(f"  {persona}: question {timing.get('question_time', 0):.2f}s, vote {timing.get('vote_time', 0):.2f}s")
         logging.info(f"Timing for {persona}: question {timing.get('question_time', 0):.2f}s, vote {timing.get('vote_time', 0):.2f}s")
+    scheduling = scheduler.snapshot()
+    print(f"\nModel switches (summaries and votes): {scheduling['switches']} "
+          f"(persona order would have caused {scheduling['unscheduled_switches']})")
+    logging.info(f"Model scheduling: {scheduling}")
+    logging.info(f"Model inventory queries: {get_inventory().queries}")
+    if get_puller().pulls:
+        logging.info(f"Background model pulls: {get_puller().progress()}")
     print("\nTranscript and votes above.")
     logging.info(f"Meeting complete. Total duration: {total_duration:.2f} seconds.")
 
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics for the toolkit's LLM tools
+- One process-wide registry: request counters, latency histograms per model
+  and persona, cache hits, retries, circuit breaker state and in-flight
+  generations, all labelled with the tool that produced them
+- METRICS_PORT serves the text exposition format at /metrics on METRICS_HOST
+  (default 127.0.0.1) while the tool runs
+- METRICS_TEXTFILE writes the same text to a file for node_exporter's
+  textfile collector, refreshed every METRICS_TEXTFILE_INTERVAL seconds and
+  at exit, so short batch runs are captured too
+- Collecting is always on and cheap; nothing is exported unless configured
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, get_circuit_breakers, get_retry_budget
+
+# Configuration
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+METRICS_TEXTFILE = os.environ.get("METRICS_TEXTFILE", "")
+METRICS_TEXTFILE_INTERVAL = float(os.environ.get("METRICS_TEXTFILE_INTERVAL", "15"))
+PREFIX = "violet_noire"
+# Upper bounds in seconds; LLM calls run from sub-second cache hits to multi-minute reviews
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and fixed-bucket histograms rendered as Prometheus text."""
+
+    def __init__(self, tool: str = "toolkit"):
+        self.tool = tool
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        # name -> labels -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._lock = threading.Lock()
+        self._define("llm_requests_total", "counter", "LLM requests by model, persona, source and outcome")
+        self._define("llm_request_duration_seconds", "histogram", "LLM request latency by model and persona")
+        self._define("llm_retries_total", "counter", "Retry attempts after a failed LLM call")
+        self._define("llm_in_flight", "gauge", "LLM generations currently running")
+        self._define("cache_requests_total", "counter", "Response cache lookups by result")
+
+    def _define(self, name: str, kind: str, help_text: str) -> None:
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _labels(tool=self.tool, **labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def add_gauge(self, name: str, delta: float, **labels: str) -> None:
+        key = _labels(tool=self.tool, **labels)
+        with self._lock:
+            series = self._gauges.setdefault(name, {})
+            series[key] = series.get(key, 0) + delta
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = _labels(tool=self.tool, **labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts = series.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 2))
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            counts[-2] += value
+            counts[-1] += 1
+
+    def record_request(self, model: str, duration: float, success: bool, retries: int = 0,
+                       persona: str = "", source: str = "llm") -> None:
+        """One finished LLM request (cache hits and coalesced waits included, by `source`)."""
+        self.inc("llm_requests_total", model=model, persona=persona, source=source,
+                 outcome="success" if success else "failure")
+        self.observe("llm_request_duration_seconds", duration, model=model, persona=persona)
+        if retries:
+            self.inc("llm_retries_total", retries, model=model)
+
+    def record_cache(self, hit: bool) -> None:
+        self.inc("cache_requests_total", result="hit" if hit else "miss")
+
+    @contextmanager
+    def in_flight(self, model: str) -> Iterator[None]:
+        self.add_gauge("llm_in_flight", 1, model=model)
+        try:
+            yield
+        finally:
+            self.add_gauge("llm_in_flight", -1, model=model)
+
+    @contextmanager
+    def track_request(self, model: str, persona: str = "") -> Iterator[None]:
+        """In-flight gauge, latency and outcome for a call that raises on failure."""
+        start = time.time()
+        success = False
+        try:
+            with self.in_flight(model):
+                yield
+            success = True
+        finally:
+            self.record_request(model, time.time() - start, success, persona=persona)
+
+    def _derived(self) -> List[Tuple[str, str, str, Dict[Labels, float]]]:
+        """Metrics read from other components at render time."""
+        tool = self.tool
+        lookups = self._counters.get("cache_requests_total", {})
+        hits = sum(value for labels, value in lookups.items() if ("result", "hit") in labels)
+        total = sum(lookups.values())
+        derived = [("cache_hit_ratio", "gauge", "Share of response cache lookups that hit",
+                    {_labels(tool=tool): hits / total if total else 0.0})]
+
+        breakers = get_circuit_breakers().snapshot()
+        derived.append(("circuit_breaker_state", "gauge", "1 for the breaker's current state",
+                        {_labels(tool=tool, breaker=name, state=state): float(snapshot['state'] == state)
+                         for name, snapshot in breakers.items() for state in (CLOSED, OPEN, HALF_OPEN)}))
+        derived.append(("circuit_breaker_rejections_total", "counter", "Calls refused by an open breaker",
+                        {_labels(tool=tool, breaker=name): snapshot['rejected'] for name, snapshot in breakers.items()}))
+        budget = get_retry_budget().snapshot()
+        derived.append(("retry_budget_denials_total", "counter", "Retries refused by the retry budget",
+                        {_labels(tool=tool): budget['denied']}))
+        return derived
+
+    def render(self) -> str:
+        """The registry in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                if kind == "histogram":
+                    series = self._histograms.get(name, {})
+                    if not series:
+                        continue
+                    header(name, kind, help_text)
+                    for labels, counts in sorted(series.items()):
+                        cumulative = 0
+                        for bound, count in zip(LATENCY_BUCKETS, counts):
+                            cumulative += count
+                            lines.append(f"{PREFIX}_{name}_bucket{_format_labels(labels, (('le', str(bound)),))} "
+                                         f"{cumulative}")
+                        lines.append(f"{PREFIX}_{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} "
+                                     f"{_format_value(counts[-1])}")
+                        lines.append(f"{PREFIX}_{name}_sum{_format_labels(labels)} {_format_value(counts[-2])}")
+                        lines.append(f"{PREFIX}_{name}_count{_format_labels(labels)} {_format_value(counts[-1])}")
+                    continue
+                series = (self._counters if kind == "counter" else self._gauges).get(name, {})
+                if series:
+                    header(name, kind, help_text)
+                    lines += [f"{PREFIX}_{name}{_format_labels(labels)} {_format_value(value)}"
+                              for labels, value in sorted(series.items())]
+            derived = self._derived()
+
+        for name, kind, help_text, series in derived:
+            if series:
+                header(name, kind, help_text)
+                lines += [f"{PREFIX}_{name}{_format_labels(labels)} {_format_value(value)}"
+                          for labels, value in sorted(series.items())]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: os.PathLike) -> None:
+        """Replace `path` atomically, as the textfile collector requires."""
+        path = Path(path)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Cannot write metrics textfile {path}: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug("metrics: " + format % args)
+
+
+def serve_metrics(registry: MetricsRegistry, port: int, host: str = METRICS_HOST) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread; returns the server (port 0 picks a free port)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logging.info(f"Serving metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def _textfile_loop(registry: MetricsRegistry, path: str, interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        registry.write_textfile(path)
+
+
+# Process-wide shared registry
+_metrics: Optional[MetricsRegistry] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the shared registry, creating it on first use."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRegistry()
+        return _metrics
+
+
+def start_metrics(tool: str) -> MetricsRegistry:
+    """Label this process's metrics with `tool` and start any exporters the environment asks for."""
+    registry = get_metrics()
+    registry.tool = tool
+    if METRICS_PORT:
+        try:
+            serve_metrics(registry, METRICS_PORT)
+        except OSError as e:
+            logging.warning(f"Cannot serve metrics on {METRICS_HOST}:{METRICS_PORT}: {e}")
+    if METRICS_TEXTFILE:
+        threading.Thread(target=_textfile_loop, args=(registry, METRICS_TEXTFILE, METRICS_TEXTFILE_INTERVAL),
+                         name="metrics-textfile", daemon=True).start()
+        atexit.register(registry.write_textfile, METRICS_TEXTFILE)
+    return registry
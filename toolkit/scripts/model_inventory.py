@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cached Model Inventory
+- One /api/tags + /api/ps query fills a snapshot shared by every health and
+  model-availability check, instead of an `ollama list` per check or turn
+- Snapshots expire after INVENTORY_TTL_SECONDS; stale reads return the old
+  snapshot at once and refresh it in the background
+- invalidate() forces the next read to refetch (e.g. after a pull)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from ollama_client import LLMBackend, OllamaError, get_client
+
+# Configuration
+INVENTORY_TTL_SECONDS = float(os.environ.get("MODEL_INVENTORY_TTL", "30"))
+INVENTORY_TIMEOUT = 10
+
+
+def model_names(name: str) -> tuple:
+    """Names Ollama treats as the same model (`llama3.1` is `llama3.1:latest`)."""
+    if ":" in name:
+        return (name, name[:-len(":latest")]) if name.endswith(":latest") else (name,)
+    return (name, f"{name}:latest")
+
+
+class InventorySnapshot:
+    """Installed and loaded models as of one query."""
+
+    def __init__(self, available: bool, installed: Dict[str, Dict], loaded: Dict[str, Dict],
+                 fetched_at: float, error: str = ""):
+        self.available = available
+        self.installed = installed
+        self.loaded = loaded
+        self.fetched_at = fetched_at
+        self.error = error
+
+    def is_installed(self, model: str) -> bool:
+        return any(name in self.installed for name in model_names(model))
+
+    def is_loaded(self, model: str) -> bool:
+        return any(name in self.loaded for name in model_names(model))
+
+    def digest(self, model: str) -> str:
+        """Installed model's digest ("" if unknown); changes when the tag is re-pulled."""
+        for name in model_names(model):
+            if name in self.installed:
+                return self.installed[name].get("digest", "")
+        return ""
+
+
+class ModelInventory:
+    """TTL-cached view of the backend's models, refreshed at most once at a time."""
+
+    def __init__(self, client: Optional[LLMBackend] = None, ttl: float = INVENTORY_TTL_SECONDS):
+        self.client = client or get_client()
+        self.ttl = ttl
+        self.queries = 0
+        self._snapshot: Optional[InventorySnapshot] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def refresh(self) -> InventorySnapshot:
+        """Query the backend now and replace the snapshot."""
+        snapshot = None
+        try:
+            with self._refresh_lock:
+                self.queries += 1
+                try:
+                    installed = {m["name"]: m for m in self.client.tags(timeout=INVENTORY_TIMEOUT).get("models", [])}
+                    loaded = {m["name"]: m for m in self.client.ps(timeout=INVENTORY_TIMEOUT).get("models", [])}
+                    snapshot = InventorySnapshot(True, installed, loaded, time.time())
+                except OllamaError as e:
+                    logging.warning(f"Model inventory query failed: {e}")
+                    snapshot = InventorySnapshot(False, {}, {}, time.time(), str(e))
+        finally:
+            with self._lock:
+                if snapshot is not None:
+                    self._snapshot = snapshot
+                self._refreshing = False
+        return snapshot
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="inventory-refresh", daemon=True).start()
+
+    def snapshot(self) -> InventorySnapshot:
+        """Current snapshot; blocks only when there is none yet."""
+        with self._lock:
+            snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh()
+        if time.time() - snapshot.fetched_at > self.ttl:
+            self._refresh_in_background()
+        return snapshot
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read queries the backend."""
+        with self._lock:
+            self._snapshot = None
+
+    def is_available(self) -> bool:
+        return self.snapshot().available
+
+    def is_installed(self, model: str) -> bool:
+        return self.snapshot().is_installed(model)
+
+    def is_loaded(self, model: str) -> bool:
+        return self.snapshot().is_loaded(model)
+
+
+# Process-wide shared inventory
+_inventory: Optional[ModelInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> ModelInventory:
+    """Return the shared inventory, creating it on first use."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = ModelInventory()
+        return _inventory
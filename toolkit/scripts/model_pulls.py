@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Background Model Pulls for the meeting tools
+- Missing models are detected at setup and pulled over /api/pull in background
+  threads while the meeting gets going, instead of an inline `ollama pull`
+  that stops everything until the download finishes
+- Tracks per-model progress for status lines and the debug log
+- model_for() answers with the requested model once it is ready, otherwise a
+  ready fallback, so a persona can speak with the default model meanwhile
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from model_inventory import ModelInventory, get_inventory, model_names
+from ollama_client import LLMBackend, OllamaError, get_client
+
+# Configuration
+# Stall timeout between progress chunks; layers report progress continuously
+PULL_STALL_TIMEOUT = 300
+# Log progress every this many percent
+PULL_LOG_STEP = 25
+
+GB = 1000 ** 3
+
+
+class PullStatus:
+    """Progress of one background pull."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.state = "pulling"  # pulling | ready | failed
+        self.status = "starting"
+        self.completed = 0
+        self.total = 0
+        self.error = ""
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.done = threading.Event()
+
+    @property
+    def percent(self) -> float:
+        return 100.0 * self.completed / self.total if self.total else 0.0
+
+    def describe(self) -> str:
+        if self.state == "ready":
+            return f"{self.model} ready ({self.finished - self.started:.0f}s)"
+        if self.state == "failed":
+            return f"{self.model} failed: {self.error}"
+        if self.total:
+            return f"{self.model} {self.percent:.0f}% ({self.completed / GB:.1f}/{self.total / GB:.1f} GB)"
+        return f"{self.model} {self.status}"
+
+
+class ModelPuller:
+    """Pulls missing models in the background and reports which are ready."""
+
+    def __init__(self, client: Optional[LLMBackend] = None, inventory: Optional[ModelInventory] = None):
+        self.client = client or get_client()
+        self.inventory = inventory or get_inventory()
+        self.pulls: Dict[str, PullStatus] = {}
+        self._lock = threading.Lock()
+
+    def _status(self, model: str) -> Optional[PullStatus]:
+        with self._lock:
+            for name in model_names(model):
+                if name in self.pulls:
+                    return self.pulls[name]
+        return None
+
+    def start(self, models: Iterable[str]) -> List[str]:
+        """Start pulling every model the inventory does not list; returns those started."""
+        if not self.inventory.is_available():
+            logging.warning("Model inventory unavailable; not starting background pulls")
+            return []
+        started = []
+        for model in dict.fromkeys(models):
+            if self.inventory.is_installed(model) or self._status(model) is not None:
+                continue
+            status = PullStatus(model)
+            with self._lock:
+                self.pulls[model] = status
+            threading.Thread(target=self._pull, args=(status,), name=f"pull-{model}", daemon=True).start()
+            started.append(model)
+        if started:
+            logging.info(f"Pulling missing models in the background: {started}")
+        return started
+
+    def _pull(self, status: PullStatus) -> None:
+        logged = 0
+        try:
+            for chunk in self.client.pull_stream(status.model, timeout=PULL_STALL_TIMEOUT):
+                status.status = chunk.get("status", status.status)
+                if chunk.get("total"):
+                    status.total = chunk["total"]
+                    status.completed = chunk.get("completed", 0)
+                    if status.percent >= logged + PULL_LOG_STEP:
+                        logged = int(status.percent // PULL_LOG_STEP) * PULL_LOG_STEP
+                        logging.info(f"Pull progress: {status.describe()}")
+            if status.status != "success":
+                raise OllamaError(f"pull ended with status '{status.status}'")
+            status.state = "ready"
+        except OllamaError as e:
+            status.state = "failed"
+            status.error = str(e)
+        finally:
+            status.finished = time.time()
+            self.inventory.invalidate()
+            status.done.set()
+        logging.info(f"Background pull finished: {status.describe()}")
+
+    def is_ready(self, model: str) -> bool:
+        status = self._status(model)
+        if status is not None:
+            return status.state == "ready"
+        return self.inventory.is_installed(model)
+
+    def is_pulling(self, model: str) -> bool:
+        status = self._status(model)
+        return status is not None and status.state == "pulling"
+
+    def wait(self, model: str, timeout: Optional[float] = None) -> bool:
+        """Block until `model` is no longer downloading; returns whether it is ready."""
+        status = self._status(model)
+        if status is not None:
+            status.done.wait(timeout)
+        return self.is_ready(model)
+
+    def model_for(self, model: str, fallback: str) -> str:
+        """`model` if ready, else `fallback` if that is ready, else `model` (callers may wait())."""
+        if self.is_ready(model) or not self.is_ready(fallback):
+            return model
+        return fallback
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [model for model, status in self.pulls.items() if status.state == "pulling"]
+
+    def progress(self) -> str:
+        """One status line covering every pull started this run."""
+        with self._lock:
+            statuses = list(self.pulls.values())
+        return "; ".join(status.describe() for status in statuses)
+
+
+# Process-wide shared puller
+_puller: Optional[ModelPuller] = None
+_puller_lock = threading.Lock()
+
+
+def get_puller() -> ModelPuller:
+    """Return the shared puller, creating it on first use."""
+    global _puller
+    with _puller_lock:
+        if _puller is None:
+            _puller = ModelPuller()
+        return _puller
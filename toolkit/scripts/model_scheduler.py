@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Model-Affinity Scheduler for batched persona calls
+- Groups pending calls by model so a RAM-limited host is not forced to swap
+  codellama and llama3.1 in and out on every other persona
+- Starts with whichever model ran last, then the rest in order of first use
+- Preloads the next model as soon as the current model's last call is dispatched;
+  with a residency plan, models that cannot stay co-resident are unloaded
+  after their group instead, and are never preloaded alongside another model
+- Counts model switches, and what submission order would have cost, per run
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from batch import GenerationRequest
+from residency_planner import ResidencyPlan
+from warm_pool import DEFAULT_KEEP_ALIVE, ModelWarmPool
+
+
+class ModelAffinityScheduler:
+    """
+    Supplies `priority` and `on_dispatch` for generate_many(). Keep one instance
+    per meeting or job so model affinity carries over between batches.
+    Results should be consumed with generate_many_ordered() to keep display order.
+    """
+
+    def __init__(self, warm_pool: Optional[ModelWarmPool] = None, residency: Optional[ResidencyPlan] = None):
+        self.warm_pool = warm_pool or ModelWarmPool(keep_alive=DEFAULT_KEEP_ALIVE)
+        self.residency = residency
+        self.current_model: Optional[str] = None
+        self.switches = 0
+        self.unscheduled_switches = 0
+        self.lookahead_preloads = 0
+        self.rotation_unloads = 0
+        self._unscheduled_model: Optional[str] = None
+        self._remaining: Dict[str, int] = {}
+        self._next_model: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def plan(self, requests: List[GenerationRequest]) -> Callable[[GenerationRequest], Tuple[int, int]]:
+        """Prepare a batch and return its priority function (model group first, then request priority)."""
+        model_order: List[str] = []
+        if self.current_model and any(request.model == self.current_model for request in requests):
+            model_order.append(self.current_model)
+        for request in requests:
+            if request.model not in model_order:
+                model_order.append(request.model)
+        rank = {model: index for index, model in enumerate(model_order)}
+
+        with self._lock:
+            for request in requests:
+                self._remaining[request.model] = self._remaining.get(request.model, 0) + 1
+                if request.model != self._unscheduled_model:
+                    if self._unscheduled_model is not None:
+                        self.unscheduled_switches += 1
+                    self._unscheduled_model = request.model
+            for model, next_model in zip(model_order, model_order[1:] + [None]):
+                self._next_model[model] = next_model
+
+        return lambda request: (rank[request.model], request.priority)
+
+    def on_dispatch(self, request: GenerationRequest) -> None:
+        """Track switches and preload the next group once this model's queue is drained."""
+        next_model = unload_model = None
+        with self._lock:
+            if request.model != self.current_model:
+                if self.current_model is not None:
+                    self.switches += 1
+                self.current_model = request.model
+            self._remaining[request.model] -= 1
+            if self._remaining[request.model] == 0:
+                next_model = self._next_model.pop(request.model, None)
+                if self._is_rotating(request.model):
+                    unload_model = request.model
+                    self.rotation_unloads += 1
+                if next_model and self._is_rotating(next_model):
+                    # Loading it now would overlap with the current model
+                    next_model = None
+                if next_model:
+                    self.lookahead_preloads += 1
+
+        if unload_model:
+            # Ollama drops the model once its in-flight calls finish
+            threading.Thread(target=self.warm_pool.unload, args=(unload_model,),
+                             name=f"unload-{unload_model}", daemon=True).start()
+        if next_model:
+            logging.info(f"Preloading {next_model} while the last {request.model} call runs")
+            threading.Thread(target=self.warm_pool.preload, args=([next_model],),
+                             name=f"preload-{next_model}", daemon=True).start()
+
+    def _is_rotating(self, model: str) -> bool:
+        return self.residency is not None and model in self.residency.rotating
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'switches': self.switches,
+                'unscheduled_switches': self.unscheduled_switches,
+                'lookahead_preloads': self.lookahead_preloads,
+                'rotation_unloads': self.rotation_unloads,
+            }
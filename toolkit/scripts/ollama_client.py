@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Shared Ollama HTTP Client for the Mrs. Violet Noire toolkit
+- Talks to /api/generate, /api/chat, /api/embed and /api/pull over a keep-alive connection pool
+- One process-wide client instead of an `ollama run` subprocess per call
+- No argv size limits on large prompts (final reviews, triage reports)
+- Optional token streaming for interactive output; a StreamCancel aborts a
+  stream from another thread, even before its first token
+- LLMBackend is the interface every caller uses; LLM_BACKEND=emulator swaps
+  in the offline latency emulator (see ollama_emulator.py)
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Configuration
+DEFAULT_OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", DEFAULT_OLLAMA_HOST)
+OLLAMA_POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "8"))
+CONNECT_TIMEOUT = 5
+# "ollama" (HTTP to OLLAMA_HOST) or "emulator" (in-process, no daemon needed)
+LLM_BACKEND = os.environ.get("LLM_BACKEND", "ollama").lower()
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama API cannot be reached or returns an error."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+class OllamaTimeoutError(OllamaError):
+    """Raised when an Ollama API call exceeds its timeout."""
+
+
+class StreamCancelled(OllamaError):
+    """Raised by a stream whose StreamCancel fired."""
+
+
+class StreamCancel:
+    """
+    Aborts a streaming call from another thread. The backend binds a closer
+    while the request is open; cancel() runs it at once, so a stream blocked
+    waiting for its next chunk (or its first token) ends without waiting for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._closer: Optional[Callable[[], None]] = None
+        self.cancelled = False
+
+    def bind(self, closer: Callable[[], None]) -> None:
+        with self._lock:
+            self._closer = closer
+            if self.cancelled:
+                closer()
+
+    def unbind(self) -> None:
+        with self._lock:
+            self._closer = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            if self._closer is not None:
+                self._closer()
+                self._closer = None
+
+
+def normalize_host(host: str) -> str:
+    """Accept the same OLLAMA_HOST forms as the ollama CLI (e.g. `0.0.0.0:11434`)."""
+    host = (host or DEFAULT_OLLAMA_HOST).strip().rstrip('/')
+    if not host.startswith(("http://", "https://")):
+        host = f"http://{host}"
+    return host
+
+
+class LLMBackend(ABC):
+    """
+    The Ollama API subset the toolkit relies on. Implementations raise
+    OllamaError / OllamaTimeoutError and return Ollama-shaped response bodies;
+    one missing a method cannot be instantiated.
+    """
+
+    host = ""
+
+    @abstractmethod
+    def generate(self, prompt: str, model: str, timeout: Optional[float] = None,
+                 options: Optional[Dict] = None, system: Optional[str] = None,
+                 keep_alive: Optional[str] = None, context: Optional[List[int]] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def generate_stream(self, prompt: str, model: str, timeout: Optional[float] = None,
+                        options: Optional[Dict] = None, system: Optional[str] = None,
+                        context: Optional[List[int]] = None,
+                        cancel: Optional[StreamCancel] = None) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def chat(self, messages: List[Dict[str, str]], model: str, timeout: Optional[float] = None,
+             options: Optional[Dict] = None, keep_alive: Optional[str] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def tags(self, timeout: float = 10) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def ps(self, timeout: float = 10) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def pull_stream(self, model: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def embed(self, text: str, model: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def generate_text(self, prompt: str, model: str, timeout: Optional[float] = None,
+                      options: Optional[Dict] = None, system: Optional[str] = None) -> str:
+        """Convenience wrapper returning only the stripped completion text."""
+        result = self.generate(prompt, model, timeout=timeout, options=options, system=system)
+        return result.get("response", "").strip()
+
+    def is_available(self, timeout: float = 5) -> bool:
+        """Check whether the backend answers on its API."""
+        try:
+            self.tags(timeout=timeout)
+            return True
+        except OllamaError as e:
+            logging.debug(f"LLM backend not reachable at {self.host}: {e}")
+            return False
+
+    def close(self) -> None:
+        pass
+
+
+# Stream being opened on this thread, picked up by the connection that sends it
+_opening = threading.local()
+
+
+class _CancellableConnectionMixin:
+    """Binds the connection's socket to the StreamCancel of the stream it sends."""
+
+    def request(self, *args, **kwargs):
+        cancel = getattr(_opening, "cancel", None)
+        if cancel is not None:
+            if self.sock is None:
+                self.connect()
+            cancel.bind(self._abort)
+        super().request(*args, **kwargs)
+
+    def _abort(self) -> None:
+        # shutdown() wakes a recv() blocked in another thread; close() does not
+        try:
+            if self.sock is not None:
+                self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _CancellableHTTPConnection(_CancellableConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CancellableHTTPSConnection(_CancellableConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CancellableHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _CancellableHTTPConnection
+
+
+class _CancellableHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _CancellableHTTPSConnection
+
+
+class _CancellableAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _CancellableHTTPPool,
+                                                   "https": _CancellableHTTPSPool}
+
+
+class OllamaClient(LLMBackend):
+    """Thread-safe Ollama REST client backed by a pooled requests session."""
+
+    def __init__(self, host: str = OLLAMA_HOST, pool_size: int = OLLAMA_POOL_SIZE):
+        self.host = normalize_host(host)
+        self.session = requests.Session()
+        adapter = _CancellableAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+        url = f"{self.host}{path}"
+        try:
+            response = self.session.request(method, url, json=payload,
+                                            timeout=(CONNECT_TIMEOUT, timeout))
+        except requests.Timeout as exc:
+            raise OllamaTimeoutError(f"{path} timed out after {timeout}s") from exc
+        except requests.RequestException as exc:
+            raise OllamaError(f"{path} request failed: {exc}") from exc
+
+        if response.status_code != 200:
+            raise OllamaError(f"{path} returned HTTP {response.status_code}",
+                              status_code=response.status_code, body=response.text)
+        try:
+            return response.json()
+        except ValueError as exc:
+            raise OllamaError(f"{path} returned invalid JSON", body=response.text) from exc
+
+    def _stream(self, path: str, payload: Dict, timeout: Optional[float] = None,
+                cancel: Optional[StreamCancel] = None) -> Iterator[Dict[str, Any]]:
+        url = f"{self.host}{path}"
+        if cancel is not None:
+            if cancel.cancelled:
+                raise StreamCancelled(f"{path} stream cancelled")
+            _opening.cancel = cancel
+        try:
+            with self.session.post(url, json=payload, stream=True,
+                                   timeout=(CONNECT_TIMEOUT, timeout)) as response:
+                _opening.cancel = None
+                if response.status_code != 200:
+                    raise OllamaError(f"{path} returned HTTP {response.status_code}",
+                                      status_code=response.status_code, body=response.text)
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as exc:
+                        raise OllamaError(f"{path} returned an invalid stream chunk", body=line) from exc
+                    if "error" in chunk:
+                        raise OllamaError(f"{path} stream error: {chunk['error']}")
+                    yield chunk
+                if cancel is not None and cancel.cancelled:
+                    # The socket was shut down between chunks; the body was cut short
+                    raise StreamCancelled(f"{path} stream cancelled")
+        except requests.RequestException as exc:
+            if cancel is not None and cancel.cancelled:
+                raise StreamCancelled(f"{path} stream cancelled") from exc
+            if isinstance(exc, requests.Timeout):
+                raise OllamaTimeoutError(f"{path} stream stalled for more than {timeout}s") from exc
+            raise OllamaError(f"{path} request failed: {exc}") from exc
+        finally:
+            _opening.cancel = None
+            if cancel is not None:
+                # The connection goes back to the pool; a late cancel must not reach its next user
+                cancel.unbind()
+
+    def generate(self, prompt: str, model: str, timeout: Optional[float] = None,
+                 options: Optional[Dict] = None, system: Optional[str] = None,
+                 keep_alive: Optional[str] = None, context: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Run a non-streaming /api/generate call and return the full response body.
+        Passing the `context` from an earlier response continues that conversation.
+        """
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": False}
+        if options:
+            payload["options"] = options
+        if system:
+            payload["system"] = system
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if context:
+            payload["context"] = context
+        return self._request("POST", "/api/generate", payload, timeout)
+
+    def generate_stream(self, prompt: str, model: str, timeout: Optional[float] = None,
+                        options: Optional[Dict] = None, system: Optional[str] = None,
+                        context: Optional[List[int]] = None,
+                        cancel: Optional[StreamCancel] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream /api/generate chunks as they arrive.
+        `timeout` bounds the wait between chunks, including the first token.
+        The final chunk has `done` set and carries eval_count/eval_duration and `context`.
+        `cancel` closes the connection from another thread (StreamCancelled is raised).
+        """
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt, "stream": True}
+        if options:
+            payload["options"] = options
+        if system:
+            payload["system"] = system
+        if context:
+            payload["context"] = context
+        return self._stream("/api/generate", payload, timeout, cancel)
+
+    def chat(self, messages: List[Dict[str, str]], model: str, timeout: Optional[float] = None,
+             options: Optional[Dict] = None, keep_alive: Optional[str] = None) -> Dict[str, Any]:
+        """Run a non-streaming /api/chat call and return the full response body."""
+        payload: Dict[str, Any] = {"model": model, "messages": messages, "stream": False}
+        if options:
+            payload["options"] = options
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return self._request("POST", "/api/chat", payload, timeout)
+
+    def tags(self, timeout: float = 10) -> Dict[str, Any]:
+        """List locally available models (/api/tags)."""
+        return self._request("GET", "/api/tags", timeout=timeout)
+
+    def ps(self, timeout: float = 10) -> Dict[str, Any]:
+        """List models currently loaded in memory (/api/ps)."""
+        return self._request("GET", "/api/ps", timeout=timeout)
+
+    def pull_stream(self, model: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream /api/pull progress. Chunks carry `status`, and `total`/`completed`
+        bytes while a layer downloads; the last one has status "success".
+        """
+        return self._stream("/api/pull", {"model": model, "stream": True}, timeout)
+
+    def embed(self, text: str, model: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Embed `text` with an embedding model (/api/embed); the vector is `embeddings[0]`."""
+        return self._request("POST", "/api/embed", {"model": model, "input": text}, timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def create_backend(kind: str = LLM_BACKEND) -> LLMBackend:
+    """Build the backend named by LLM_BACKEND."""
+    if kind == "emulator":
+        # Imported lazily: the emulator depends on this module
+        from ollama_emulator import EmulatedBackend
+        return EmulatedBackend()
+    if kind != "ollama":
+        raise ValueError(f"Unknown LLM_BACKEND '{kind}' (expected 'ollama' or 'emulator')")
+    return OllamaClient()
+
+
+# Process-wide shared client
+_client: Optional[LLMBackend] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> LLMBackend:
+    """Return the shared backend, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_backend()
+        return _client
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Local Ollama Latency Emulator for offline runs, CI and load tests
+- Speaks the /api/generate, /api/chat, /api/embed, /api/pull, /api/tags and /api/ps subset the toolkit uses
+- Embeddings are hashed bags of words and word pairs, so similar prompts score close
+- Per-model latency distributions, token rates, failure rates and model sizes
+- Models with "installed": false stay out of /api/tags until pulled (pull_time)
+- Emulates cold loads, keep_alive expiry and /api/generate context arrays
+- Runs in-process (LLM_BACKEND=emulator) or as an HTTP stand-in for Ollama:
+
+    python3 ollama_emulator.py --port 11435 --config emulator.json
+    OLLAMA_HOST=http://127.0.0.1:11435 python3 llm-meeting-enhanced.py ...
+
+Config (JSON, also read from LLM_EMULATOR_CONFIG) overrides DEFAULT_CONFIG;
+distributions are a number (constant) or {"distribution": "constant" |
+"uniform" | "normal" | "lognormal" | "exponential", ...parameters}.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from cache_keys import canonical_model
+from ollama_client import LLMBackend, OllamaError, OllamaTimeoutError, StreamCancel, StreamCancelled
+
+# Configuration
+EMULATOR_CONFIG_PATH = os.environ.get("LLM_EMULATOR_CONFIG", "")
+DEFAULT_PORT = 11435
+EMBEDDING_DIMENSIONS = 256
+DEFAULT_CONFIG: Dict[str, Any] = {
+    # Multiplies every sleep; 0 runs instantly while keeping reported durations
+    "time_scale": 1.0,
+    "seed": None,
+    "default_keep_alive": "5m",
+    "defaults": {
+        "time_to_first_token": {"distribution": "lognormal", "median": 0.4, "sigma": 0.5},
+        "tokens_per_second": {"distribution": "normal", "mean": 25, "stddev": 3},
+        "response_tokens": {"distribution": "uniform", "low": 40, "high": 160},
+        "load_time": {"distribution": "uniform", "low": 2.0, "high": 4.0},
+        "failure_rate": 0.0,
+        "size": 4_700_000_000,
+        "installed": True,
+        "pull_time": {"distribution": "uniform", "low": 20.0, "high": 60.0},
+    },
+    "models": {
+        "llama3.1:latest": {"size": 4_920_000_000},
+        "codellama:latest": {"size": 3_830_000_000, "tokens_per_second": 30},
+        "llama3.2:latest": {"size": 2_020_000_000, "tokens_per_second": 45},
+        "nomic-embed-text:latest": {"size": 274_000_000, "load_time": 0.5},
+    },
+}
+
+WORDS = (
+    "the mystery deepens as every clue points toward a quiet answer hidden in plain sight "
+    "consider the evidence carefully and weigh each motive against the available facts "
+    "we should prioritise clarity measure the outcome and revisit the plan next week"
+).split()
+
+Number = Union[int, float]
+
+
+class EmulatedFailure(Exception):
+    """An injected or emulated API error, mapped to an HTTP status by the server."""
+
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class EmulatedTimeout(Exception):
+    """The caller's timeout elapsed inside an emulated wait."""
+
+
+class EmulatedCancel(Exception):
+    """The caller cancelled the request during an emulated wait."""
+
+
+def sample(spec: Union[Number, Dict], rng: random.Random) -> float:
+    """Draw one value from a distribution spec (see module docstring)."""
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    kind = spec.get("distribution", "constant")
+    if kind == "constant":
+        return float(spec["value"])
+    if kind == "uniform":
+        return rng.uniform(spec["low"], spec["high"])
+    if kind == "normal":
+        return max(0.0, rng.gauss(spec["mean"], spec["stddev"]))
+    if kind == "lognormal":
+        return rng.lognormvariate(0, spec["sigma"]) * spec["median"]
+    if kind == "exponential":
+        return rng.expovariate(1 / spec["mean"])
+    raise ValueError(f"Unknown distribution '{kind}'")
+
+
+def parse_keep_alive(value: Any, default: str) -> Optional[float]:
+    """Seconds to keep a model loaded; None means forever."""
+    if value is None:
+        value = default
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", str(value).strip())
+    if not match:
+        raise EmulatedFailure(f"invalid keep_alive '{value}'", 400)
+    amount = float(match.group(1))
+    if amount < 0:
+        return None
+    return amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def load_config(path: str = EMULATOR_CONFIG_PATH) -> Dict[str, Any]:
+    """DEFAULT_CONFIG with the JSON file at `path` merged over it."""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        config["defaults"].update(overrides.pop("defaults", {}))
+        for model, profile in overrides.pop("models", {}).items():
+            config["models"].setdefault(canonical_model(model), {}).update(profile)
+        config.update(overrides)
+    return config
+
+
+class _Clock:
+    """
+    Emulated waits bounded by a total deadline or a per-wait stall timeout.
+    Setting `stop` cuts the current wait short, like a caller closing its connection.
+    """
+
+    def __init__(self, time_scale: float, timeout: Optional[float], per_wait: bool,
+                 stop: Optional[threading.Event] = None):
+        self.time_scale = time_scale
+        self.timeout = timeout
+        self.per_wait = per_wait
+        self.stop = stop or threading.Event()
+        self.elapsed = 0.0
+
+    def _sleep(self, seconds: float) -> None:
+        if self.stop.wait(seconds * self.time_scale):
+            raise EmulatedCancel("request cancelled")
+
+    def wait(self, seconds: float) -> None:
+        budget = None
+        if self.timeout is not None:
+            budget = self.timeout if self.per_wait else self.timeout - self.elapsed
+        if budget is not None and seconds > budget:
+            self._sleep(max(0.0, budget))
+            raise EmulatedTimeout(f"timed out after {self.timeout}s")
+        self._sleep(seconds)
+        self.elapsed += seconds
+
+
+class OllamaEmulator:
+    """Thread-safe emulated Ollama daemon state and responses."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or load_config()
+        self.time_scale = float(self.config.get("time_scale", 1.0))
+        self.rng = random.Random(self.config.get("seed"))
+        # model -> expiry epoch (None = never); only loaded models appear
+        self.loaded: Dict[str, Optional[float]] = {}
+        self.installed = {
+            name for name, profile in self.config["models"].items()
+            if {**self.config["defaults"], **profile}.get("installed", True)
+        }
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def _profile(self, model: str) -> Dict[str, Any]:
+        name = canonical_model(model)
+        if name not in self.installed:
+            raise EmulatedFailure(f"model '{model}' not found, try pulling it first", 404)
+        return {**self.config["defaults"], **self.config["models"][name]}
+
+    def _sample(self, spec: Union[Number, Dict]) -> float:
+        with self._lock:
+            return sample(spec, self.rng)
+
+    def _expire(self) -> None:
+        now = time.time()
+        for model, expiry in list(self.loaded.items()):
+            if expiry is not None and expiry <= now:
+                del self.loaded[model]
+
+    def _load(self, model: str, profile: Dict, clock: _Clock) -> float:
+        """Load `model` if needed; returns the emulated load duration."""
+        with self._lock:
+            self._expire()
+            cold = model not in self.loaded
+            if cold:
+                # Reserve the slot so concurrent requests do not each pay the load
+                self.loaded[model] = time.time() + 60
+        load_time = self._sample(profile["load_time"]) if cold else 0.0
+        clock.wait(load_time)
+        return load_time
+
+    def _touch(self, model: str, keep_alive: Any) -> None:
+        seconds = parse_keep_alive(keep_alive, self.config.get("default_keep_alive", "5m"))
+        with self._lock:
+            if seconds == 0:
+                self.loaded.pop(model, None)
+            else:
+                self.loaded[model] = None if seconds is None else time.time() + seconds
+
+    def _maybe_fail(self, profile: Dict) -> None:
+        with self._lock:
+            self.requests += 1
+            if self.rng.random() < profile.get("failure_rate", 0.0):
+                self.failures += 1
+                raise EmulatedFailure("emulated model failure", 500)
+
+    def _text_tokens(self, profile: Dict, options: Optional[Dict]) -> List[str]:
+        count = max(1, int(self._sample(profile["response_tokens"])))
+        limit = (options or {}).get("num_predict")
+        if limit and limit > 0:
+            count = min(count, int(limit))
+        with self._lock:
+            return [self.rng.choice(WORDS) + " " for _ in range(count)]
+
+    @staticmethod
+    def _prompt_tokens(text: str) -> int:
+        return max(1, len(text) // 4)
+
+    @staticmethod
+    def _context_ids(text: str) -> List[int]:
+        return [int(hashlib.md5(word.encode()).hexdigest()[:6], 16) for word in text.split()]
+
+    def _run(self, model: str, prompt_text: str, payload: Dict, clock: _Clock,
+             make_chunk) -> Iterator[Dict[str, Any]]:
+        start = clock.elapsed
+        model = canonical_model(model)
+        profile = self._profile(model)
+        self._maybe_fail(profile)
+        load_time = self._load(model, profile, clock)
+
+        if not prompt_text:
+            # Load-only request (warm pool preload or keep_alive change)
+            self._touch(model, payload.get("keep_alive"))
+            yield {**make_chunk(""), "done": True,
+                   "done_reason": "unload" if payload.get("keep_alive") in (0, "0") else "load",
+                   "load_duration": int(load_time * 1e9), "total_duration": int(load_time * 1e9)}
+            return
+
+        clock.wait(self._sample(profile["time_to_first_token"]))
+        prompt_eval_end = clock.elapsed
+        rate = max(0.1, self._sample(profile["tokens_per_second"]))
+        tokens = self._text_tokens(profile, payload.get("options"))
+        for token in tokens:
+            yield {**make_chunk(token), "done": False}
+            clock.wait(1 / rate)
+
+        self._touch(model, payload.get("keep_alive"))
+        yield {
+            **make_chunk(""),
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": int((clock.elapsed - start) * 1e9),
+            "load_duration": int(load_time * 1e9),
+            "prompt_eval_count": self._prompt_tokens(prompt_text),
+            "prompt_eval_duration": int((prompt_eval_end - start - load_time) * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int((clock.elapsed - prompt_eval_end) * 1e9),
+            "_text": "".join(tokens),
+        }
+
+    def generate(self, payload: Dict[str, Any], timeout: Optional[float] = None,
+                 stream: bool = False, stop: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield /api/generate chunks; the final one carries stats and `context`.
+        Setting `stop` abandons the generation (EmulatedCancel).
+        """
+        model = payload.get("model", "")
+        prompt = payload.get("prompt", "")
+        context = list(payload.get("context") or [])
+        clock = _Clock(self.time_scale, timeout, per_wait=stream, stop=stop)
+        created = datetime.now(timezone.utc).isoformat()
+
+        def make_chunk(token: str) -> Dict[str, Any]:
+            return {"model": model, "created_at": created, "response": token}
+
+        for chunk in self._run(model, prompt, payload, clock, make_chunk):
+            if chunk.get("done") and prompt:
+                text = chunk.pop("_text")
+                chunk["context"] = context + self._context_ids(prompt) + self._context_ids(text)
+            yield chunk
+
+    def chat(self, payload: Dict[str, Any], timeout: Optional[float] = None,
+             stream: bool = False) -> Iterator[Dict[str, Any]]:
+        """Yield /api/chat chunks; the whole message history counts as prompt."""
+        model = payload.get("model", "")
+        messages = payload.get("messages") or []
+        prompt = "\n".join(message.get("content", "") for message in messages)
+        clock = _Clock(self.time_scale, timeout, per_wait=stream)
+        created = datetime.now(timezone.utc).isoformat()
+
+        def make_chunk(token: str) -> Dict[str, Any]:
+            return {"model": model, "created_at": created, "message": {"role": "assistant", "content": token}}
+
+        for chunk in self._run(model, prompt, payload, clock, make_chunk):
+            chunk.pop("_text", None)
+            yield chunk
+
+    def embed(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Answer /api/embed with one unit vector per input."""
+        model = canonical_model(payload.get("model", ""))
+        profile = self._profile(model)
+        clock = _Clock(self.time_scale, timeout, per_wait=False)
+        self._maybe_fail(profile)
+        load_time = self._load(model, profile, clock)
+        inputs = payload.get("input", "")
+        inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+        self._touch(model, payload.get("keep_alive"))
+        return {"model": model, "embeddings": [self._embedding(text) for text in inputs],
+                "load_duration": int(load_time * 1e9)}
+
+    @staticmethod
+    def _embedding(text: str) -> List[float]:
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        vector = [0.0] * EMBEDDING_DIMENSIONS
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = int(hashlib.md5(feature.encode()).hexdigest(), 16)
+            vector[digest % EMBEDDING_DIMENSIONS] += 1.0 if digest & (1 << 64) else -1.0
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+    def tags(self) -> Dict[str, Any]:
+        return {"models": [
+            {
+                "name": name,
+                "model": name,
+                "size": int({**self.config["defaults"], **profile}["size"]),
+                "digest": hashlib.sha256(name.encode()).hexdigest(),
+                "modified_at": datetime.now(timezone.utc).isoformat(),
+            }
+            for name, profile in self.config["models"].items()
+            if name in self.installed
+        ]}
+
+    def pull(self, payload: Dict[str, Any], timeout: Optional[float] = None,
+             stream: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield /api/pull progress chunks; only models named in the config can be pulled."""
+        model = canonical_model(payload.get("model", ""))
+        if model not in self.config["models"]:
+            raise EmulatedFailure("pull model manifest: file does not exist", 404)
+        profile = {**self.config["defaults"], **self.config["models"][model]}
+        clock = _Clock(self.time_scale, timeout, per_wait=stream)
+        yield {"status": "pulling manifest"}
+        if model not in self.installed:
+            size = int(profile["size"])
+            digest = f"sha256:{hashlib.sha256(model.encode()).hexdigest()}"
+            steps = 10
+            step_time = self._sample(profile["pull_time"]) / steps
+            for step in range(steps + 1):
+                yield {"status": f"pulling {digest[7:19]}", "digest": digest,
+                       "total": size, "completed": size * step // steps}
+                if step < steps:
+                    clock.wait(step_time)
+            yield {"status": "verifying sha256 digest"}
+            yield {"status": "writing manifest"}
+            with self._lock:
+                self.installed.add(model)
+        yield {"status": "success"}
+
+    def ps(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            loaded = dict(self.loaded)
+        models = []
+        for name, expiry in loaded.items():
+            expires_at = (datetime.now(timezone.utc) + timedelta(days=3650) if expiry is None
+                          else datetime.fromtimestamp(expiry, timezone.utc))
+            size = int(self._profile(name)["size"])
+            models.append({"name": name, "model": name, "size": size, "size_vram": 0,
+                           "expires_at": expires_at.isoformat()})
+        return {"models": models}
+
+
+class EmulatedBackend(LLMBackend):
+    """In-process LLMBackend over an OllamaEmulator; no daemon or sockets involved."""
+
+    host = "emulator://local"
+
+    def __init__(self, emulator: Optional[OllamaEmulator] = None):
+        self.emulator = emulator or OllamaEmulator()
+
+    @staticmethod
+    def _payload(model: str, **fields) -> Dict[str, Any]:
+        payload = {"model": canonical_model(model)}
+        payload.update({key: value for key, value in fields.items() if value is not None})
+        return payload
+
+    @staticmethod
+    def _collect(chunks: Iterator[Dict[str, Any]], key: str) -> Dict[str, Any]:
+        pieces, final = [], {}
+        for chunk in chunks:
+            if key == "response":
+                pieces.append(chunk.get("response", ""))
+            else:
+                pieces.append(chunk.get("message", {}).get("content", ""))
+            final = chunk
+        if key == "response":
+            final["response"] = "".join(pieces)
+        else:
+            final["message"] = {"role": "assistant", "content": "".join(pieces)}
+        return final
+
+    @staticmethod
+    def _translate(chunks: Iterator[Dict[str, Any]], path: str) -> Iterator[Dict[str, Any]]:
+        try:
+            yield from chunks
+        except EmulatedTimeout as exc:
+            raise OllamaTimeoutError(f"{path} {exc}") from exc
+        except EmulatedCancel as exc:
+            raise StreamCancelled(f"{path} stream cancelled") from exc
+        except EmulatedFailure as exc:
+            raise OllamaError(f"{path} returned HTTP {exc.status_code}",
+                              status_code=exc.status_code, body=json.dumps({"error": str(exc)})) from exc
+
+    def generate(self, prompt: str, model: str, timeout: Optional[float] = None,
+                 options: Optional[Dict] = None, system: Optional[str] = None,
+                 keep_alive: Optional[str] = None, context: Optional[List[int]] = None) -> Dict[str, Any]:
+        payload = self._payload(model, prompt=prompt, options=options, system=system,
+                                keep_alive=keep_alive, context=context)
+        chunks = self._translate(self.emulator.generate(payload, timeout), "/api/generate")
+        return self._collect(chunks, "response")
+
+    def generate_stream(self, prompt: str, model: str, timeout: Optional[float] = None,
+                        options: Optional[Dict] = None, system: Optional[str] = None,
+                        context: Optional[List[int]] = None,
+                        cancel: Optional[StreamCancel] = None) -> Iterator[Dict[str, Any]]:
+        payload = self._payload(model, prompt=prompt, options=options, system=system, context=context)
+        stop = threading.Event()
+        if cancel is not None:
+            cancel.bind(stop.set)
+        return self._translate(self.emulator.generate(payload, timeout, stream=True, stop=stop), "/api/generate")
+
+    def chat(self, messages: List[Dict[str, str]], model: str, timeout: Optional[float] = None,
+             options: Optional[Dict] = None, keep_alive: Optional[str] = None) -> Dict[str, Any]:
+        payload = self._payload(model, messages=messages, options=options, keep_alive=keep_alive)
+        chunks = self._translate(self.emulator.chat(payload, timeout), "/api/chat")
+        return self._collect(chunks, "message")
+
+    def tags(self, timeout: float = 10) -> Dict[str, Any]:
+        return self.emulator.tags()
+
+    def ps(self, timeout: float = 10) -> Dict[str, Any]:
+        return self.emulator.ps()
+
+    def embed(self, text: str, model: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            return self.emulator.embed(self._payload(model, input=text), timeout)
+        except EmulatedTimeout as exc:
+            raise OllamaTimeoutError(f"/api/embed {exc}") from exc
+        except EmulatedFailure as exc:
+            raise OllamaError(f"/api/embed returned HTTP {exc.status_code}",
+                              status_code=exc.status_code, body=json.dumps({"error": str(exc)})) from exc
+
+    def pull_stream(self, model: str, timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        payload = self._payload(model, stream=True)
+        return self._translate(self.emulator.pull(payload, timeout), "/api/pull")
+
+
+class EmulatorRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for an OllamaEmulator (set as the `emulator` class attribute)."""
+
+    protocol_version = "HTTP/1.1"
+    emulator: OllamaEmulator = None
+
+    def log_message(self, format: str, *args) -> None:
+        logging.debug("emulator: " + format % args)
+
+    def _send_json(self, body: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self) -> None:
+        if self.path == "/api/tags":
+            self._send_json(self.emulator.tags())
+        elif self.path == "/api/ps":
+            self._send_json(self.emulator.ps())
+        elif self.path in ("/", "/api/version"):
+            self._send_json({"version": "emulator"})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json({"error": "invalid JSON body"}, 400)
+            return
+
+        if self.path == "/api/generate":
+            chunks, key = self.emulator.generate(payload, stream=payload.get("stream", True)), "response"
+        elif self.path == "/api/chat":
+            chunks, key = self.emulator.chat(payload, stream=payload.get("stream", True)), "message"
+        elif self.path == "/api/embed":
+            try:
+                self._send_json(self.emulator.embed(payload))
+            except EmulatedFailure as e:
+                self._send_json({"error": str(e)}, e.status_code)
+            return
+        elif self.path == "/api/pull":
+            chunks, key = self.emulator.pull(payload, stream=payload.get("stream", True)), None
+        else:
+            self._send_json({"error": "not found"}, 404)
+            return
+
+        try:
+            if payload.get("stream", True):
+                # Pull the first chunk before committing to a 200 so errors keep their status
+                first = next(chunks)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                self._send_chunk((json.dumps(first) + "\n").encode())
+                for chunk in chunks:
+                    self._send_chunk((json.dumps(chunk) + "\n").encode())
+                self.wfile.write(b"0\r\n\r\n")
+            else:
+                # Non-streaming pulls answer with the final status only
+                self._send_json(EmulatedBackend._collect(chunks, key) if key else list(chunks)[-1])
+        except EmulatedFailure as e:
+            self._send_json({"error": str(e)}, e.status_code)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up (e.g. a cancelled hedge leg); stop generating
+            chunks.close()
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+          emulator: Optional[OllamaEmulator] = None) -> ThreadingHTTPServer:
+    """Create (but do not start) an HTTP server backed by `emulator`."""
+    handler = type("BoundEmulatorRequestHandler", (EmulatorRequestHandler,),
+                   {"emulator": emulator or OllamaEmulator()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Ollama latency emulator")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--config", default=EMULATOR_CONFIG_PATH, help="JSON config overriding the defaults")
+    parser.add_argument("--time-scale", type=float, help="Multiply all emulated waits (0 = instant)")
+    parser.add_argument("--failure-rate", type=float, help="Default failure rate for every model")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.time_scale is not None:
+        config["time_scale"] = args.time_scale
+    if args.failure_rate is not None:
+        config["defaults"]["failure_rate"] = args.failure_rate
+    if args.seed is not None:
+        config["seed"] = args.seed
+
+    server = serve(args.host, args.port, OllamaEmulator(config))
+    print(f"Ollama emulator listening on http://{args.host}:{args.port} "
+          f"(models: {', '.join(config['models'])})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Structured Performance Event Log
+- One JSON object per line: every LLM call, every meeting phase and a summary
+  per session, instead of pretty-printed blocks and text reports
+- The active file rotates by size or age; rotated files are gzip-compressed
+  and only the newest PERFORMANCE_LOG_KEEP are kept
+- Several processes can append to the same log; rotation is serialised with a
+  lock file where fcntl is available
+- `python performance_log.py query ...` filters by event, tool, model, persona,
+  phase and date, and aggregates count, success rate and latency percentiles
+  while streaming the files, so memory does not grow with the log
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: rotation is only serialised within the process
+    fcntl = None
+
+from latency_histogram import Histogram
+
+# Configuration
+PERFORMANCE_EVENTS_FILE = Path(os.environ.get(
+    "PERFORMANCE_LOG_FILE", Path(__file__).parent / "performance_events.jsonl"))
+ROTATE_MAX_BYTES = int(float(os.environ.get("PERFORMANCE_LOG_MAX_MB", "10")) * 1024 * 1024)
+ROTATE_MAX_AGE_HOURS = float(os.environ.get("PERFORMANCE_LOG_MAX_AGE_HOURS", "24"))
+KEEP_ROTATED = int(os.environ.get("PERFORMANCE_LOG_KEEP", "20"))
+# Rotated files are named <stem>-<rotation time>-<pid>.jsonl.gz
+ROTATED_TIME_FORMAT = "%Y%m%dT%H%M%S%f"
+
+
+def parse_time(value: str) -> datetime:
+    """ISO date or timestamp as a naive local datetime (offsets are converted)."""
+    moment = datetime.fromisoformat(value)
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+
+
+class EventLog:
+    """Appends JSON-lines events to `path` and rotates it."""
+
+    def __init__(self, path: os.PathLike = PERFORMANCE_EVENTS_FILE, max_bytes: int = ROTATE_MAX_BYTES,
+                 max_age_hours: float = ROTATE_MAX_AGE_HOURS, keep: int = KEEP_ROTATED, tool: str = "toolkit"):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_hours * 3600
+        self.keep = keep
+        self.tool = tool
+        self._lock = threading.Lock()
+        # (inode, timestamp of its first event), so age checks read the file once
+        self._started: Optional[tuple] = None
+
+    def write(self, event: str, **fields: Any) -> None:
+        record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': event, 'tool': self.tool,
+                  **fields}
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            try:
+                if self._due():
+                    self._rotate()
+                # One write() per line: concurrent appenders never interleave within a line
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                logging.warning(f"Cannot write performance event to {self.path}: {e}")
+
+    def _first_event_time(self, inode: int) -> Optional[datetime]:
+        if self._started is None or self._started[0] != inode:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    started = parse_time(json.loads(f.readline())['ts'])
+            except (OSError, ValueError, KeyError):
+                started = None
+            self._started = (inode, started)
+        return self._started[1]
+
+    def _due(self) -> bool:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return False
+        if stat.st_size >= self.max_bytes:
+            return True
+        started = self._first_event_time(stat.st_ino)
+        return bool(started and (datetime.now() - started).total_seconds() >= self.max_age_seconds)
+
+    def _rotate(self) -> None:
+        lock_file = open(self.path.with_name(f".{self.path.name}.lock"), 'a') if fcntl else None
+        try:
+            if lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # Another process may have rotated while we waited for the lock
+            if not self._due():
+                return
+            rotated = self.path.with_name(
+                f"{self.path.stem}-{datetime.now().strftime(ROTATED_TIME_FORMAT)}-{os.getpid()}.jsonl")
+            os.replace(self.path, rotated)
+            with open(rotated, 'rb') as src, gzip.open(f"{rotated}.gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            rotated.unlink()
+            for old in rotated_files(self.path)[:-self.keep or None]:
+                old.unlink(missing_ok=True)
+            logging.info(f"Rotated performance log to {rotated}.gz")
+        finally:
+            if lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+
+
+def rotated_files(path: Path) -> List[Path]:
+    """Rotated logs for `path`, oldest first."""
+    return sorted(path.parent.glob(f"{path.stem}-*.jsonl.gz"))
+
+
+def _rotated_at(path: Path) -> Optional[datetime]:
+    try:
+        return datetime.strptime(path.name.split("-")[-2], ROTATED_TIME_FORMAT)
+    except (IndexError, ValueError):
+        return None
+
+
+def iter_events(path: Path = PERFORMANCE_EVENTS_FILE, since: Optional[datetime] = None,
+                until: Optional[datetime] = None, **filters: Optional[str]) -> Iterator[Dict]:
+    """
+    Stream matching events from the rotated files and the active log, oldest
+    first. `filters` match event fields exactly (None matches anything);
+    files rotated before `since` are skipped unread.
+    """
+    filters = {name: value for name, value in filters.items() if value is not None}
+    for file in rotated_files(path) + [path]:
+        rotated_at = _rotated_at(file) if file != path else None
+        if since and rotated_at and rotated_at < since:
+            continue
+        try:
+            handle = gzip.open(file, 'rt', encoding='utf-8') if file.suffix == ".gz" else open(file, encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        with handle:
+            for line in handle:
+                try:
+                    event = json.loads(line)
+                    moment = parse_time(event['ts'])
+                except (ValueError, KeyError):
+                    continue
+                if (since and moment < since) or (until and moment >= until):
+                    continue
+                if all(str(event.get(name)) == value for name, value in filters.items()):
+                    yield event
+
+
+def aggregate(events: Iterable[Dict], group_by: Optional[str] = None) -> Dict[str, Dict]:
+    """Per group: events, successes and a duration histogram (constant memory per group)."""
+    groups: Dict[str, Dict] = {}
+    for event in events:
+        key = str(event.get(group_by, "")) if group_by else "all"
+        group = groups.setdefault(key, {'events': 0, 'successes': 0, 'duration': Histogram()})
+        group['events'] += 1
+        group['successes'] += 1 if event.get('success', True) else 0
+        if isinstance(event.get('duration'), (int, float)):
+            group['duration'].record(event['duration'])
+    return groups
+
+
+# Process-wide shared log
+_event_log: Optional[EventLog] = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """Return the shared event log, creating it on first use."""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog()
+        return _event_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the structured performance log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    query = commands.add_parser("query", help="Filter events and aggregate their durations")
+    query.add_argument("--log", type=Path, default=PERFORMANCE_EVENTS_FILE, help="Active log file")
+    query.add_argument("--event", default="llm_call", help="Event type (llm_call, phase, session)")
+    query.add_argument("--tool", help="Tool that wrote the event (e.g. meeting)")
+    query.add_argument("--model", help="Model name as logged (e.g. llama3.1)")
+    query.add_argument("--persona", help="Persona name")
+    query.add_argument("--phase", help="Meeting phase / call type (e.g. discussion)")
+    query.add_argument("--since", type=parse_time, help="Start date or time (ISO format)")
+    query.add_argument("--until", type=parse_time, help="End date or time, exclusive (ISO format)")
+    query.add_argument("--group-by", choices=["model", "persona", "phase", "tool", "source"],
+                       help="Aggregate per value of this field")
+    query.add_argument("--raw", action="store_true", help="Print matching events as JSON lines instead")
+    args = parser.parse_args()
+
+    events = iter_events(args.log, args.since, args.until, event=args.event, tool=args.tool, model=args.model,
+                         persona=args.persona, phase=args.phase)
+    if args.raw:
+        for event in events:
+            sys.stdout.write(json.dumps(event) + "\n")
+        return
+
+    groups = aggregate(events, args.group_by)
+    if not groups:
+        print("No matching events")
+        return
+    print(f"{args.group_by or 'group':<24} {'events':>7} {'success':>8} {'mean':>8} {'p50':>8} "
+          f"{'p90':>8} {'p99':>8} {'max':>8}")
+    for key, group in sorted(groups.items()):
+        stats = group['duration'].summary()
+        success = group['successes'] / group['events'] * 100
+        print(f"{key or '-':<24} {group['events']:>7} {success:>7.1f}% {stats['mean']:>7.2f}s {stats['p50']:>7.2f}s "
+              f"{stats['p90']:>7.2f}s {stats['p99']:>7.2f}s {stats['max']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Stateful Persona Sessions for multi-round meetings
+- Each persona keeps the `context` token array Ollama returns from /api/generate
+- Later rounds send only the new material; the model already holds the rest
+- Falls back to the full rebuilt prompt whenever no usable context exists
+  (first turn, after a failure or cache hit, or when rerouted to another model)
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Rough characters-per-token ratio used to estimate prompt-token savings
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(chars: int) -> int:
+    return max(0, round(chars / CHARS_PER_TOKEN))
+
+
+class PersonaSession:
+    """Conversation state for one persona on one model."""
+
+    def __init__(self, persona: str, model: str):
+        self.persona = persona
+        self.model = model
+        self.context: Optional[List[int]] = None
+        self._pending: Optional[Tuple[str, str, str]] = None
+        self._lock = threading.Lock()
+
+    def prepare(self, material: str, full_prompt: str, label: str) -> None:
+        """Queue the next turn: `material` is the new text, `full_prompt` the stateless equivalent."""
+        with self._lock:
+            self._pending = (material, full_prompt, label)
+
+    def request_for(self, model: str) -> Tuple[str, Optional[List[int]]]:
+        """Prompt and context to send for the pending turn on `model`."""
+        with self._lock:
+            material, full_prompt, _ = self._pending
+            if self.context and model == self.model:
+                return material, self.context
+            return full_prompt, None
+
+    def commit(self, model: str, prompt_sent: str, context: Optional[List[int]]) -> Dict:
+        """
+        Record a successful turn and return its prompt accounting:
+        {label, chars_sent, chars_full, tokens_saved}.
+        """
+        with self._lock:
+            _, full_prompt, label = self._pending
+            self._pending = None
+            # Context from another model is meaningless to ours
+            self.context = context if model == self.model else None
+        chars_sent, chars_full = len(prompt_sent), len(full_prompt)
+        return {
+            'label': label,
+            'chars_sent': chars_sent,
+            'chars_full': chars_full,
+            'tokens_saved': estimate_tokens(chars_full - chars_sent),
+        }
+
+    def reset(self) -> None:
+        """Drop the context so the next turn resends the full prompt."""
+        with self._lock:
+            self.context = None
+            self._pending = None
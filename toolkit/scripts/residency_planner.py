@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+RAM-aware Model Residency Planner
+- Reads loaded-model sizes (/api/ps) and installed sizes (/api/tags) from the
+  shared model inventory, and available memory from /proc/meminfo
+- Decides which of a meeting's models can stay co-resident and which must be
+  loaded in turn, with the keep_alive and unload order that implies
+- Downgrades a model to a smaller installed tag of the same family, or warns,
+  before a meeting would push a CPU-only box into swap
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from cache_keys import canonical_model
+from model_inventory import ModelInventory, get_inventory
+from warm_pool import MEETING_KEEP_ALIVE
+
+# Configuration
+MEMINFO_PATH = "/proc/meminfo"
+# Loaded footprint relative to the on-disk size (KV cache, runtime buffers)
+LOAD_OVERHEAD = 1.2
+# Memory left for the OS and everything else: the larger of these two
+MIN_HEADROOM_BYTES = 1024 ** 3
+HEADROOM_FRACTION = 0.1
+# Rotating models are released as soon as their calls finish
+ROTATING_KEEP_ALIVE = "0"
+
+GIB = 1024 ** 3
+
+
+def model_family(name: str) -> str:
+    return name.split(":", 1)[0]
+
+
+def read_meminfo(path: str = MEMINFO_PATH) -> Dict[str, int]:
+    """Return /proc/meminfo fields in bytes (empty where unavailable)."""
+    fields = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                parts = value.split()
+                if parts:
+                    fields[key] = int(parts[0]) * (1024 if parts[1:] == ["kB"] else 1)
+    except (OSError, ValueError) as e:
+        logging.debug(f"Cannot read {path}: {e}")
+    return fields
+
+
+class ResidencyPlan:
+    """Which models share memory for a run, and how to get there."""
+
+    def __init__(self, budget: Optional[int], footprints: Dict[str, int]):
+        # None when available memory is unknown (no /proc/meminfo)
+        self.budget = budget
+        self.footprints = footprints
+        self.co_resident: List[str] = []
+        self.rotating: List[str] = []
+        self.unload_first: List[str] = []
+        self.downgrades: Dict[str, str] = {}
+        self.keep_alive: Dict[str, str] = {}
+        # Models too large for the budget on their own, with no smaller tag to fall back to
+        self.swapping: List[str] = []
+        self.warnings: List[str] = []
+
+    @property
+    def fits(self) -> bool:
+        return not self.rotating and not self.swapping
+
+    def model_for(self, model: str) -> str:
+        """The model to actually call after downgrades."""
+        return self.downgrades.get(model, model)
+
+    def summary(self) -> Dict:
+        return {
+            'budget_gb': round(self.budget / GIB, 2) if self.budget is not None else None,
+            'footprints_gb': {model: round(size / GIB, 2) for model, size in self.footprints.items()},
+            'co_resident': self.co_resident,
+            'rotating': self.rotating,
+            'unload_first': self.unload_first,
+            'downgrades': self.downgrades,
+            'swapping': self.swapping,
+            'warnings': self.warnings,
+        }
+
+
+class ResidencyPlanner:
+    """Plan model residency for a set of models and their expected call counts."""
+
+    def __init__(self, inventory: Optional[ModelInventory] = None, keep_alive: str = MEETING_KEEP_ALIVE):
+        self.inventory = inventory or get_inventory()
+        self.keep_alive = keep_alive
+
+    def _installed_sizes(self) -> Dict[str, int]:
+        installed = self.inventory.snapshot().installed
+        return {name: model.get("size", 0) for name, model in installed.items()}
+
+    def _loaded_ram(self) -> Dict[str, int]:
+        """RAM held by each loaded model; the part offloaded to VRAM does not count."""
+        loaded = self.inventory.snapshot().loaded
+        return {
+            name: max(0, model.get("size", 0) - model.get("size_vram", 0))
+            for name, model in loaded.items()
+        }
+
+    def plan(self, demand: Dict[str, int]) -> ResidencyPlan:
+        """
+        `demand` maps model -> expected number of calls. Busier models get
+        residency first; the rest rotate through whatever memory remains.
+        """
+        installed = self._installed_sizes()
+        loaded = self._loaded_ram()
+        meminfo = read_meminfo()
+
+        def footprint(model: str) -> int:
+            name = canonical_model(model)
+            if name in loaded:
+                return loaded[name]
+            return int(installed.get(name, 0) * LOAD_OVERHEAD)
+
+        budget = None
+        if "MemAvailable" in meminfo:
+            headroom = max(MIN_HEADROOM_BYTES, int(meminfo.get("MemTotal", 0) * HEADROOM_FRACTION))
+            # Models already loaded can be unloaded, so their memory is ours to plan with
+            budget = meminfo["MemAvailable"] + sum(loaded.values()) - headroom
+
+        plan = ResidencyPlan(budget, {model: footprint(model) for model in demand})
+        if budget is None:
+            plan.co_resident = sorted(demand)
+            plan.keep_alive = {model: self.keep_alive for model in demand}
+            return plan
+
+        # Swap oversized models for the largest installed variant that fits
+        for model in demand:
+            if plan.footprints[model] <= budget:
+                continue
+            smaller = [
+                name for name, size in installed.items()
+                if model_family(name) == model_family(canonical_model(model))
+                and int(size * LOAD_OVERHEAD) <= budget
+            ]
+            if smaller:
+                replacement = max(smaller, key=lambda name: installed[name])
+                plan.downgrades[model] = replacement
+                plan.footprints[replacement] = int(installed[replacement] * LOAD_OVERHEAD)
+                plan.warnings.append(
+                    f"{model} needs {plan.footprints[model] / GIB:.1f} GiB but only {budget / GIB:.1f} GiB "
+                    f"is available; using {replacement} instead"
+                )
+            else:
+                plan.swapping.append(model)
+                plan.warnings.append(
+                    f"{model} needs {plan.footprints[model] / GIB:.1f} GiB but only {budget / GIB:.1f} GiB "
+                    f"is available and no smaller {model_family(model)} tag is installed; expect swapping"
+                )
+
+        calls: Dict[str, int] = {}
+        for model, count in demand.items():
+            target = plan.model_for(model)
+            calls[target] = calls.get(target, 0) + count
+
+        used = 0
+        for model in sorted(calls, key=lambda name: (-calls[name], name)):
+            if used + plan.footprints.get(model, 0) <= budget:
+                plan.co_resident.append(model)
+                used += plan.footprints.get(model, 0)
+                plan.keep_alive[model] = self.keep_alive
+            else:
+                plan.rotating.append(model)
+                plan.keep_alive[model] = ROTATING_KEEP_ALIVE
+
+        if plan.rotating:
+            logging.info(f"Models {plan.rotating} cannot stay co-resident with {plan.co_resident}; "
+                         f"they will be loaded in turn")
+
+        # Free memory held by models this run will not use, largest first
+        planned = {canonical_model(model) for model in calls}
+        plan.unload_first = sorted(
+            (name for name in loaded if name not in planned), key=lambda name: -loaded[name]
+        )
+        return plan
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Indexed Response Cache for LLM calls
+- SQLite in WAL mode: primary-key lookups and one-row writes instead of
+  loading model_cache.json whole and rewriting it on every insert or expiry
+- Commits are atomic and survive crashes; readers never block the writer
+- model_cache.json is not imported: its md5 keys cannot be mapped to the
+  canonical keys (the prompts were never stored), so entries are regenerated
+- TTL per call type (votes short, reviews long), bounded by entry count and
+  bytes with least-recently-used eviction, plus a background expiry sweep
+- Response text lives in zlib-compressed, content-addressed blobs: identical
+  responses are stored once and reference-counted by triggers
+- The database is memory-mapped, so opening a large cache reads nothing up
+  front and lookups are served from the OS page cache
+- Negative entries remember prompts whose generation failed (failure class,
+  model, attempts) for a short TTL, so callers can skip a hopeless retry run
+- Safe to share between processes: every write is an IMMEDIATE transaction
+  that waits on SQLite's file lock, and each lookup reads the current file,
+  so entries committed by another meeting or batch job are visible at once
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Stores are often opened before the host script configures logging; a module
+# logger (unlike the logging.* helpers) never installs a root handler itself
+logger = logging.getLogger(__name__)
+
+# Configuration
+CACHE_DB_FILE = Path(__file__).parent / "model_cache.db"
+# How long a writer waits on another connection's lock before giving up
+BUSY_TIMEOUT_SECONDS = 5.0
+DEFAULT_CALL_TYPE = "general"
+SWEEP_INTERVAL_SECONDS = 60.0
+# Reads go through the OS page cache; SQLite's own page cache stays small
+MMAP_SIZE = 256 * 1024 * 1024
+PAGE_CACHE_KIB = 2048
+COMPRESSION_LEVEL = 6
+# Shorter responses are stored as-is; zlib headers would outweigh the saving
+MIN_COMPRESS_BYTES = 128
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    refs INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    created REAL NOT NULL,
+    call_type TEXT NOT NULL DEFAULT 'general',
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failures (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    failure_class TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+-- Resident totals kept by triggers, so limit checks never scan the table.
+-- `bytes` counts response text, `stored` the compressed, deduplicated blobs.
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    stored INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, entries, bytes, stored) VALUES (1, 0, 0, 0);
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+    UPDATE blobs SET refs = refs + 1 WHERE hash = NEW.blob;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+    UPDATE blobs SET refs = refs - 1 WHERE hash = OLD.blob;
+    DELETE FROM blobs WHERE hash = OLD.blob AND refs <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_replace AFTER UPDATE OF blob ON responses BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 1;
+    UPDATE blobs SET refs = refs + 1 WHERE hash = NEW.blob;
+    UPDATE blobs SET refs = refs - 1 WHERE hash = OLD.blob;
+    DELETE FROM blobs WHERE hash = OLD.blob AND refs <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS blobs_insert AFTER INSERT ON blobs BEGIN
+    UPDATE totals SET stored = stored + LENGTH(NEW.data) WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS blobs_delete AFTER DELETE ON blobs BEGIN
+    UPDATE totals SET stored = stored - LENGTH(OLD.data) WHERE id = 1;
+END;
+"""
+
+
+def encode_response(response: str) -> Tuple[str, str, bytes]:
+    """(content hash, codec, stored bytes) for a response."""
+    raw = response.encode()
+    digest = hashlib.sha256(raw).hexdigest()
+    if len(raw) >= MIN_COMPRESS_BYTES:
+        packed = zlib.compress(raw, COMPRESSION_LEVEL)
+        if len(packed) < len(raw):
+            return digest, "zlib", packed
+    return digest, "raw", raw
+
+
+def decode_response(codec: str, data: bytes) -> str:
+    return (zlib.decompress(data) if codec == "zlib" else bytes(data)).decode()
+
+
+class ResponseCache:
+    """
+    Thread-safe key -> response store. `ttls` maps call type -> seconds and
+    falls back to `ttl_seconds`; `max_entries` / `max_bytes` (response text)
+    of None mean unbounded.
+    """
+
+    def __init__(self, path: Union[str, Path] = CACHE_DB_FILE, ttl_seconds: float = 3600,
+                 ttls: Optional[Dict[str, float]] = None,
+                 max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 sweep_interval: Optional[float] = SWEEP_INTERVAL_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.ttls = dict(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # This process's eviction counters
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync stays consistent after a crash; it may only lose the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self._conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_KIB}")
+        self._upgrade_inline_layout()
+        self._conn.executescript(SCHEMA)
+        self._adopt_inline_rows()
+        self._drop_md5_keys()
+
+        self._stop = threading.Event()
+        if sweep_interval:
+            threading.Thread(target=self._sweep_loop, args=(sweep_interval,),
+                             name="response-cache-sweep", daemon=True).start()
+
+    def ttl_for(self, call_type: str) -> float:
+        return self.ttls.get(call_type, self.ttl_seconds)
+
+    def _upgrade_inline_layout(self) -> None:
+        """
+        Move databases that kept response text inline (one copy per key) onto
+        shared blobs: the old table is set aside here, SCHEMA creates the new
+        one, and _adopt_inline_rows() copies the rows across.
+        """
+        if "response" not in self._columns("responses"):
+            return
+        with self._write():
+            # Checked again under the write lock: another process may have upgraded first
+            if "response" not in self._columns("responses"):
+                return
+            for trigger in ("responses_insert", "responses_delete", "responses_resize"):
+                self._conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            self._conn.execute("DROP INDEX IF EXISTS responses_expires")
+            self._conn.execute("DROP INDEX IF EXISTS responses_accessed")
+            self._conn.execute("DROP TABLE IF EXISTS totals")
+            self._conn.execute("ALTER TABLE responses RENAME TO responses_inline")
+
+    def _adopt_inline_rows(self) -> None:
+        if not self._columns("responses_inline"):
+            return
+        with self._write():
+            columns = self._columns("responses_inline")
+            if not columns:
+                return
+            select = ", ".join([
+                "key", "response", "created",
+                "call_type" if "call_type" in columns else f"'{DEFAULT_CALL_TYPE}'",
+                "expires" if "expires" in columns else f"created + {float(self.ttl_seconds)}",
+                "accessed" if "accessed" in columns else "created",
+            ])
+            rows = self._conn.execute(f"SELECT {select} FROM responses_inline").fetchall()
+            self._insert_rows(rows)
+            self._conn.execute("DROP TABLE responses_inline")
+        logger.info(f"Moved {len(rows)} cache entries in {self.path} to compressed blob storage")
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        """
+        Write transaction that takes SQLite's write lock up front (waiting up to
+        BUSY_TIMEOUT_SECONDS for other processes), so reads inside it cannot go
+        stale before the write. Commits on success, rolls back on error.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+
+    def _insert_rows(self, rows: Iterable[Tuple[str, str, float, str, float, float]]) -> None:
+        """Insert (key, response, created, call_type, expires, accessed) rows, keeping existing keys."""
+        for key, response, created, call_type, expires, accessed in rows:
+            digest, codec, data = encode_response(response)
+            self._conn.execute("INSERT OR IGNORE INTO blobs (hash, codec, data) VALUES (?, ?, ?)",
+                               (digest, codec, data))
+            self._conn.execute(
+                "INSERT OR IGNORE INTO responses (key, blob, created, call_type, expires, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, digest, created, call_type, expires, accessed, len(response.encode()))
+            )
+        # A key that already existed leaves its new blob unreferenced
+        self._conn.execute("DELETE FROM blobs WHERE refs <= 0")
+
+    def _drop_md5_keys(self) -> None:
+        """
+        Delete entries still keyed by the old md5(prompt_model) hash, such as
+        those once imported from model_cache.json: cache_keys.response_key()
+        never produces a 32-digit key, so they could only wait for eviction.
+        Runs once per database.
+        """
+        if self._meta("md5_keys_dropped") is not None:
+            return
+        with self._write():
+            if self._meta("md5_keys_dropped") is not None:
+                return
+            removed = self._conn.execute("DELETE FROM responses WHERE length(key) = 32").rowcount
+            self._conn.execute("DELETE FROM meta WHERE name = 'migrated_json'")
+            self._conn.execute("INSERT INTO meta (name, value) VALUES ('md5_keys_dropped', ?)",
+                               (datetime.now().isoformat(),))
+        if removed:
+            logger.info(f"Dropped {removed} unreachable md5-keyed cache entries from {self.path}")
+
+    def _columns(self, table: str) -> set:
+        return {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None if absent or expired. Hits refresh LRU order."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT b.codec, b.data, r.expires FROM responses r JOIN blobs b ON b.hash = r.blob "
+                    "WHERE r.key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                return None
+            codec, data, expires = row
+            now = time.time()
+            with self._write():
+                if expires > now:
+                    self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    return decode_response(codec, data)
+                # Matching on expires leaves a row another process has just rewritten
+                self.expirations += self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires = ?", (key, expires)
+                ).rowcount
+            return None
+        except (sqlite3.Error, zlib.error) as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def set(self, key: str, response: str, call_type: str = DEFAULT_CALL_TYPE) -> None:
+        now = time.time()
+        size = len(response.encode())
+        if self.max_bytes is not None and size > self.max_bytes:
+            logger.debug(f"Response of {size} bytes exceeds the cache limit; not cached")
+            return
+        digest, codec, data = encode_response(response)
+        try:
+            with self._write():
+                self._conn.execute("INSERT OR IGNORE INTO blobs (hash, codec, data) VALUES (?, ?, ?)",
+                                   (digest, codec, data))
+                self._conn.execute(
+                    "INSERT INTO responses (key, blob, created, call_type, expires, accessed, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                    "blob = excluded.blob, created = excluded.created, call_type = excluded.call_type, "
+                    "expires = excluded.expires, accessed = excluded.accessed, size = excluded.size",
+                    (key, digest, now, call_type, now + self.ttl_for(call_type), now, size)
+                )
+                self._conn.execute("DELETE FROM failures WHERE key = ?", (key,))
+                self._enforce_limits()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def get_failure(self, key: str) -> Optional[Dict]:
+        """The unexpired failure recorded for `key`, as a dict, or None."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT model, failure_class, attempts, created, expires FROM failures "
+                    "WHERE key = ? AND expires > ?", (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return dict(zip(('model', 'failure_class', 'attempts', 'created', 'expires'), row))
+
+    def set_failure(self, key: str, model: str, failure_class: str, attempts: int, ttl_seconds: float) -> None:
+        """Remember that generating `key` failed; a later set() for the key clears it."""
+        now = time.time()
+        try:
+            with self._write():
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO failures (key, model, failure_class, attempts, created, expires) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", (key, model, failure_class, attempts, now, now + ttl_seconds)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def _totals(self) -> tuple:
+        return self._conn.execute("SELECT entries, bytes, stored FROM totals WHERE id = 1").fetchone()
+
+    def _over_limit(self) -> bool:
+        entries, size, _ = self._totals()
+        return ((self.max_entries is not None and entries > self.max_entries)
+                or (self.max_bytes is not None and size > self.max_bytes))
+
+    def _enforce_limits(self) -> None:
+        """Drop expired rows, then least recently used ones, until within limits. Caller holds the lock."""
+        if not self._over_limit():
+            return
+        self.expirations += self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+        while self._over_limit():
+            entries = self._totals()[0]
+            # Surplus entries go in one statement; for the byte bound, one row at a time
+            excess = entries - self.max_entries if self.max_entries is not None else 0
+            removed = self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (max(excess, 1),)
+            ).rowcount
+            if not removed:
+                break
+            self.evictions += removed
+
+    def sweep(self) -> int:
+        """Delete every expired row now; returns how many went."""
+        try:
+            with self._write():
+                removed = self._conn.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+                self.expirations += removed
+                self._conn.execute("DELETE FROM failures WHERE expires <= ?", (time.time(),))
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache sweep failed: {e}")
+            return 0
+        if removed:
+            logger.debug(f"Response cache sweep removed {removed} expired entries")
+        return removed
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.sweep()
+
+    def stats(self) -> Dict:
+        """Resident size (shared by every process on this file) and this process's eviction counts."""
+        with self._lock:
+            entries, size, stored = self._totals()
+            failures = self._conn.execute("SELECT COUNT(*) FROM failures WHERE expires > ?", (time.time(),)).fetchone()[0]
+        return {
+            'entries': entries,
+            'bytes': size,
+            'stored_bytes': stored,
+            'failures': failures,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._totals()[0]
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            self._conn.close()
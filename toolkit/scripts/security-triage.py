@@ -8,7 +8,6 @@ Using existing infrastructure instead of external llm-conversation
 import argparse
 import json
 import logging
-import subprocess
 import sys
 import yaml
 from pathlib import Path
@@ -21,6 +20,8 @@ CONFIG_DIR = SCRIPT_DIR.parent / "config"
 PERSONAS_FILE = CONFIG_DIR / "security-personas.yaml"
 TRIAGE_OUTPUT_DIR = SCRIPT_DIR.parent.parent / "security-triage"
 ENHANCED_MEETING_SCRIPT = SCRIPT_DIR / "llm-meeting-enhanced.py"
+TRIAGE_MODEL = "llama3.2:latest"
+TRIAGE_TIMEOUT = 300
 
 def setup_logging():
     """Setup logging for security triage operations."""
@@ -39,17 +40,16 @@ def check_dependencies():
     """Check if required dependencies are available."""
     logger = logging.getLogger(__name__)
 
-    # Check for Ollama
-    try:
-        result = subprocess.run(['ollama', 'list'],
-                              capture_output=True, text=True, timeout=10)
-        if result.returncode != 0:
-            logger.error("❌ Ollama not running. Start with: ollama serve")
-            return False
-        logger.info("✅ Ollama service available")
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        logger.error("❌ Ollama not found. Install from: https://ollama.com")
+    # Check for the LLM backend (Ollama, or the emulator with LLM_BACKEND=emulator)
+    from model_inventory import get_inventory
+    inventory = get_inventory()
+    if not inventory.is_available():
+        logger.error(f"❌ Ollama not reachable at {inventory.client.host}. Install from https://ollama.com "
+                     "and start it with: ollama serve")
         return False
+    if not inventory.is_installed(TRIAGE_MODEL):
+        logger.warning(f"⚠️  Triage model {TRIAGE_MODEL} is not installed. Pull it with: ollama pull {TRIAGE_MODEL}")
+    logger.info("✅ Ollama service available")
 
     # Check for enhanced meeting orchestrator
     if not ENHANCED_MEETING_SCRIPT.exists():
@@ -193,25 +193,24 @@ Please provide a structured analysis covering:
 Format your response as a professional security assessment report suitable for technical teams and management.
 """
 
-        # Use Ollama API directly for analysis
-        import requests
-        import json
-
-        ollama_url = "http://localhost:11434/api/generate"
-        payload = {
-            "model": "llama3.2:latest",
-            "prompt": analysis_prompt,
-            "stream": False
-        }
+        # Use the shared Ollama client for analysis
+        from metrics_exporter import get_metrics
+        from ollama_client import OllamaError, get_client
 
         logger.info("Requesting security analysis from Ollama...")
 
-        response = requests.post(ollama_url, json=payload, timeout=300)
-
-        if response.status_code == 200:
-            result = response.json()
-            analysis_content = result.get('response', '')
-
+        api_error = None
+        try:
+            with get_metrics().track_request(TRIAGE_MODEL):
+                analysis_content = get_client().generate_text(analysis_prompt, TRIAGE_MODEL,
+                                                              timeout=TRIAGE_TIMEOUT)
+        except OllamaError as e:
+            # Only HTTP-level failures fall back to the basic report
+            if e.status_code is None:
+                raise
+            api_error = e
+
+        if api_error is None:
             meeting_title = f"Security Vulnerability Triage - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
 
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -232,8 +231,8 @@ Format your response as a professional security assessment report suitable for t
                 f.write("## Input Vulnerabilities\n\n")
                 f.write(input_content)
                 f.write("\n## Error Information\n\n")
-                f.write(f"HTTP Status: {response.status_code}\n")
-                f.write(f"Response: {response.text}\n")
+                f.write(f"HTTP Status: {api_error.status_code}\n")
+                f.write(f"Response: {api_error.body or api_error}\n")
 
             logger.warning(f"⚠️  Security triage completed with basic report: {output_file}")
             return True
@@ -270,6 +269,9 @@ def main():
     # Setup logging
     logger = setup_logging()
     logger.info("🛡️  Security Triage Multi-Agent System starting...")
+    # Exported only when METRICS_PORT or METRICS_TEXTFILE is set (see metrics_exporter.py)
+    from metrics_exporter import start_metrics
+    start_metrics("triage")
 
     # Check dependencies
     if args.check_deps:
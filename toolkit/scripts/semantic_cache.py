@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Semantic Response Cache tier
+- Embeds prompts with the local Ollama embeddings endpoint (/api/embed) so a
+  prompt that differs only slightly from an earlier one (another meeting's
+  discussion context, a reworded summary) can reuse its cached response
+- Random-hyperplane LSH over a NumPy matrix per (call type, model, persona):
+  a lookup scores only prompts that share a bucket instead of every stored
+  vector, and never crosses personas, whose prompts differ by little but a name.
+  Callers fold model digests and persona files into the persona identity, so
+  a re-pulled model or edited persona does not match older entries
+- Enabled per call type, each with its own similarity threshold
+- Vectors live next to the response rows in the cache database and point at
+  them by key, so the response store's TTL and LRU eviction still apply
+- Each lookup first indexes vectors other processes have added since the
+  last one, so concurrent meetings share near-duplicate hits
+- Needs NumPy; without it the tier stays disabled
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # Optional: exact-key caching works without it
+    np = None
+
+from ollama_client import LLMBackend, OllamaError, get_client
+from response_cache import BUSY_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EMBED_MODEL = os.environ.get("SEMANTIC_CACHE_EMBED_MODEL", "nomic-embed-text")
+EMBED_TIMEOUT = 30
+# 8 tables x 12 bits: near-duplicates (cosine > ~0.9) almost always share a bucket
+LSH_TABLES = 8
+LSH_BITS = 12
+# Fixed so hyperplanes, and therefore buckets, match across runs and processes
+LSH_SEED = 1234
+# Query vectors kept for add() after a miss, so a miss costs one embedding in total
+PENDING_VECTORS = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic (
+    key TEXT NOT NULL,
+    embed_model TEXT NOT NULL,
+    call_type TEXT NOT NULL,
+    model TEXT NOT NULL,
+    persona TEXT NOT NULL DEFAULT '',
+    vector BLOB NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (key, embed_model)
+);
+"""
+
+
+class LSHIndex:
+    """Approximate cosine nearest-neighbour index over unit vectors."""
+
+    def __init__(self, dimensions: int, tables: int = LSH_TABLES, bits: int = LSH_BITS, seed: int = LSH_SEED):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, bits, dimensions)).astype(np.float32)
+        self.weights = 1 << np.arange(bits, dtype=np.int64)
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(tables)]
+        self.vectors = np.zeros((16, dimensions), dtype=np.float32)
+        self.keys: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _hashes(self, vector) -> List[int]:
+        signs = (self.planes @ vector) > 0
+        return [int(h) for h in signs.astype(np.int64) @ self.weights]
+
+    def add(self, key: str, vector) -> None:
+        row = len(self.keys)
+        if row == len(self.vectors):
+            grown = np.zeros((2 * len(self.vectors), self.vectors.shape[1]), dtype=np.float32)
+            grown[:row] = self.vectors
+            self.vectors = grown
+        self.vectors[row] = vector
+        self.keys.append(key)
+        for table, bucket in zip(self.buckets, self._hashes(vector)):
+            table.setdefault(bucket, []).append(row)
+
+    def query(self, vector) -> Tuple[Optional[str], float]:
+        """Most similar stored key among bucket-mates, with its cosine similarity."""
+        candidates = set()
+        for table, bucket in zip(self.buckets, self._hashes(vector)):
+            candidates.update(table.get(bucket, ()))
+        if not candidates:
+            return None, 0.0
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = self.vectors[rows] @ vector
+        best = int(np.argmax(scores))
+        return self.keys[rows[best]], float(scores[best])
+
+
+class SemanticCache:
+    """
+    Maps prompts to the cache keys of similar earlier prompts. `thresholds`
+    maps each enabled call type to its minimum cosine similarity.
+    """
+
+    def __init__(self, path: Union[str, Path], thresholds: Dict[str, float],
+                 client: Optional[LLMBackend] = None, embed_model: str = EMBED_MODEL):
+        self.thresholds = dict(thresholds)
+        self.client = client or get_client()
+        self.embed_model = embed_model
+        self.enabled = bool(self.thresholds)
+        self.lookups = 0
+        self.hits = 0
+        self.indexes: Dict[Tuple[str, str, str], LSHIndex] = {}
+        self._pending: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        # Highest semantic rowid already indexed
+        self._last_row = 0
+        if np is None:
+            logger.warning("NumPy is not installed; semantic cache disabled")
+            self.enabled = False
+        if self.enabled:
+            self._conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(semantic)")}
+            if columns and "persona" not in columns:
+                # Older vectors have no persona; new ones are embedded as responses are cached again
+                with self._conn:
+                    self._conn.execute("DROP TABLE IF EXISTS semantic")
+                logger.info("Dropped persona-less semantic cache vectors")
+            self._conn.executescript(SCHEMA)
+            with self._conn:
+                self._conn.execute("DELETE FROM semantic WHERE key NOT IN (SELECT key FROM responses)")
+            loaded = self._catch_up()
+            if loaded:
+                logger.info(f"Semantic cache loaded {loaded} prompt vectors")
+
+    def _catch_up(self) -> int:
+        """Index stored vectors added since the last call, ours or another process's. Caller holds the lock."""
+        try:
+            rows = self._conn.execute(
+                "SELECT rowid, key, call_type, model, persona, vector FROM semantic "
+                "WHERE rowid > ? AND embed_model = ? ORDER BY rowid",
+                (self._last_row, self.embed_model)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Semantic cache refresh failed: {e}")
+            return 0
+        for rowid, key, call_type, model, persona, blob in rows:
+            self._last_row = rowid
+            if call_type in self.thresholds:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                self._index(call_type, model, persona, len(vector)).add(key, vector)
+        return len(rows)
+
+    def _index(self, call_type: str, model: str, persona: str, dimensions: int) -> LSHIndex:
+        index = self.indexes.get((call_type, model, persona))
+        if index is None:
+            index = self.indexes[(call_type, model, persona)] = LSHIndex(dimensions)
+        return index
+
+    def _embed(self, text: str):
+        try:
+            result = self.client.embed(text, self.embed_model, timeout=EMBED_TIMEOUT)
+            vector = np.asarray(result["embeddings"][0], dtype=np.float32)
+        except OllamaError as e:
+            if e.status_code == 404:
+                logger.warning(f"Embedding model {self.embed_model} not installed; semantic cache disabled")
+                self.enabled = False
+            else:
+                logger.debug(f"Prompt embedding failed: {e}")
+            return None
+        except (KeyError, IndexError, ValueError) as e:
+            logger.debug(f"Unexpected embedding response: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def applies_to(self, call_type: str) -> bool:
+        return self.enabled and call_type in self.thresholds
+
+    def lookup(self, prompt: str, model: str, call_type: str, key: str,
+               persona: str = "") -> Optional[Tuple[str, float]]:
+        """
+        (key, similarity) of the closest earlier prompt for the same model and
+        `persona` (any stable identity; "" for none) above the call type's threshold, else None.
+        """
+        if not self.applies_to(call_type):
+            return None
+        vector = self._embed(prompt)
+        if vector is None:
+            return None
+        with self._lock:
+            self.lookups += 1
+            self._catch_up()
+            self._pending[key] = vector
+            while len(self._pending) > PENDING_VECTORS:
+                self._pending.popitem(last=False)
+            index = self.indexes.get((call_type, model, persona))
+            match_key, similarity = index.query(vector) if index else (None, 0.0)
+        if match_key is None or match_key == key or similarity < self.thresholds[call_type]:
+            return None
+        return match_key, similarity
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def add(self, prompt: str, model: str, call_type: str, key: str, persona: str = "") -> None:
+        """Index a freshly cached response's prompt."""
+        if not self.applies_to(call_type):
+            return
+        with self._lock:
+            vector = self._pending.pop(key, None)
+        if vector is None:
+            vector = self._embed(prompt)
+            if vector is None:
+                return
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO semantic (key, embed_model, call_type, model, persona, vector, created) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, self.embed_model, call_type, model, persona, vector.astype(np.float32).tobytes(),
+                         time.time())
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Semantic cache write failed: {e}")
+                self._index(call_type, model, persona, len(vector)).add(key, vector)
+                return
+            # Indexes the new row along with anything other processes added
+            self._catch_up()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'lookups': self.lookups,
+                'hits': self.hits,
+                'vectors': sum(len(index) for index in self.indexes.values()),
+            }
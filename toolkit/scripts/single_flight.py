@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Single-flight Coalescing for identical in-flight LLM requests
+- Within a process, concurrent callers with the same key share one generation
+- Across processes, a per-key lock file elects one leader; the others wait for
+  its result file instead of sending the same prompt to Ollama again
+- Results only go to callers that arrived while the generation was running;
+  a later identical call always generates afresh (caching is not our job)
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalesce within the process only
+    fcntl = None
+
+# Configuration
+INFLIGHT_DIR = Path(os.environ.get(
+    "LLM_INFLIGHT_DIR", Path(tempfile.gettempdir()) / "violet-noire-inflight"))
+# Result and lock files untouched for this long are swept
+STALE_FILE_SECONDS = 600
+# Longest wait for another caller's generation unless the caller passes max_wait
+MAX_WAIT_SECONDS = 600
+POLL_INTERVAL = 0.1
+SWEEP_INTERVAL = 60
+
+
+class _Call:
+    """A generation in progress within this process."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one generation per key at a time; all waiters get its result."""
+
+    def __init__(self, inflight_dir: Path = INFLIGHT_DIR, cross_process: bool = True):
+        self.inflight_dir = Path(inflight_dir)
+        self.cross_process = cross_process and fcntl is not None
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any], coalesce: bool = True,
+           max_wait: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run `fn` for `key` unless an identical call is already in flight.
+        Returns (result, shared) where `shared` is True when the result came from
+        another caller's generation that was already running when this call arrived.
+        Only non-None results are shared across processes.
+        With `coalesce=False`, `fn` always runs and nothing is shared, for calls
+        that must be sampled independently (one vote per persona). `max_wait`
+        (default MAX_WAIT_SECONDS) caps the wait for another caller, normally at
+        the caller's own timeout; past it, `fn` runs here.
+        """
+        if not coalesce:
+            return fn(), False
+        max_wait = MAX_WAIT_SECONDS if max_wait is None else max_wait
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(max_wait):
+                logging.warning(f"Gave up waiting for in-flight request {key}; generating locally")
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            with self._lock:
+                self.coalesced += 1
+            return call.result, True
+
+        shared = False
+        try:
+            if self.cross_process:
+                call.result, shared = self._do_cross_process(key, fn, max_wait)
+            else:
+                call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, shared
+
+    def _do_cross_process(self, key: str, fn: Callable[[], Any], max_wait: float) -> Tuple[Any, bool]:
+        try:
+            self.inflight_dir.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self.inflight_dir / f"{key}.lock", "a", encoding="utf-8")
+        except OSError as e:
+            logging.debug(f"Cross-process coalescing unavailable: {e}")
+            return fn(), False
+
+        lock_path = self.inflight_dir / f"{key}.lock"
+        result_path = self.inflight_dir / f"{key}.json"
+        with lock_file:
+            acquired, joined_at = self._acquire(lock_file, max_wait)
+            if not acquired:
+                logging.warning(f"Gave up waiting for in-flight request {key}; generating locally")
+                return fn(), False
+            try:
+                # Keep the sweep away from lock files that are in use
+                os.utime(lock_path)
+                # Another process may have finished this request while we waited
+                result = self._read_result(result_path, joined_at) if joined_at is not None else None
+                if result is not None:
+                    with self._lock:
+                        self.coalesced += 1
+                    return result, True
+
+                result = fn()
+                if result is not None:
+                    self._write_result(result_path, result)
+                return result, False
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                self._sweep()
+
+    @staticmethod
+    def _acquire(lock_file, max_wait: float) -> Tuple[bool, Optional[float]]:
+        """
+        Wait up to `max_wait` seconds for the key's lock. Returns (acquired, joined_at),
+        where `joined_at` is when we first found another process holding it (None if it was free).
+        """
+        deadline = time.time() + max_wait
+        joined_at = None
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True, joined_at
+            except BlockingIOError:
+                if joined_at is None:
+                    joined_at = time.time()
+                if time.time() >= deadline:
+                    return False, joined_at
+                time.sleep(POLL_INTERVAL)
+
+    @staticmethod
+    def _read_result(result_path: Path, joined_at: float) -> Any:
+        """The published result, if it finished after `joined_at` (so it was running when we arrived)."""
+        try:
+            with open(result_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry["timestamp"] >= joined_at:
+                return entry["result"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    @staticmethod
+    def _write_result(result_path: Path, result: Any) -> None:
+        tmp_path = result_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"result": result, "timestamp": time.time()}, f)
+            os.replace(tmp_path, result_path)
+        except (OSError, TypeError) as e:
+            logging.debug(f"Could not publish in-flight result {result_path.name}: {e}")
+
+    def _sweep(self) -> None:
+        """Drop result and lock files left behind by finished requests."""
+        now = time.time()
+        if now - self._last_sweep < SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        for path in self.inflight_dir.glob("*"):
+            try:
+                if now - path.stat().st_mtime > STALE_FILE_SECONDS:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+# Process-wide shared instance
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the shared coalescer, creating it on first use."""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
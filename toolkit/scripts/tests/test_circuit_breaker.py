@@ -0,0 +1,65 @@
+"""Circuit breaker interleavings: `python -m pytest toolkit/scripts/tests`."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from circuit_breaker import (CLOSED, DAEMON_BREAKER, HALF_OPEN, OPEN, CircuitBreakerRegistry,  # noqa: E402
+                             allow_requests)
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def cool_down(breaker):
+    breaker.opened_at -= breaker.reset_timeout
+
+
+def test_open_model_breaker_does_not_strand_daemon_probe():
+    breakers = CircuitBreakerRegistry()
+    daemon, codellama, llama = breakers.get(DAEMON_BREAKER), breakers.get("codellama"), breakers.get("llama3.1")
+    trip(daemon)
+    trip(codellama)
+    cool_down(daemon)
+
+    # codellama is still open: the call is refused without using up the daemon's probe
+    assert not allow_requests(codellama, daemon)
+    assert not allow_requests(daemon, codellama)
+    assert daemon.state == HALF_OPEN
+
+    # Another model can still send the probe, and its success closes the daemon breaker
+    assert allow_requests(llama, daemon)
+    daemon.record_success()
+    llama.record_success()
+    assert daemon.state == CLOSED
+    assert allow_requests(llama, daemon)
+
+
+def test_refused_daemon_releases_model_probe():
+    breakers = CircuitBreakerRegistry()
+    daemon, model = breakers.get(DAEMON_BREAKER), breakers.get("codellama")
+    trip(daemon)
+    trip(model)
+    cool_down(model)
+
+    assert not allow_requests(model, daemon)
+    assert model.state == HALF_OPEN
+
+    cool_down(daemon)
+    assert allow_requests(model, daemon)
+    # Both probes are now taken until an outcome is recorded
+    assert not allow_requests(model, daemon)
+
+
+def test_release_frees_probe_for_next_call():
+    breaker = CircuitBreakerRegistry().get(DAEMON_BREAKER)
+    trip(breaker)
+    cool_down(breaker)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
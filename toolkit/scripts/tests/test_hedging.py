@@ -0,0 +1,88 @@
+"""Hedged requests and stream cancellation: `python -m pytest toolkit/scripts/tests`."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hedging  # noqa: E402
+from cache_keys import canonical_model  # noqa: E402
+from hedging import HEDGE, PRIMARY, hedged_generate  # noqa: E402
+from ollama_client import OllamaClient, StreamCancel, StreamCancelled  # noqa: E402
+from ollama_emulator import EmulatedBackend, OllamaEmulator, load_config, serve  # noqa: E402
+
+
+def emulator(**first_token_seconds):
+    """Emulator whose models answer five instant tokens after the given time to first token."""
+    config = load_config("")
+    config["defaults"].update({"load_time": 0, "response_tokens": 5, "tokens_per_second": 1000})
+    for model, seconds in first_token_seconds.items():
+        config["models"][canonical_model(model)] = {"time_to_first_token": seconds}
+    return OllamaEmulator(config)
+
+
+def leg_running(name):
+    return any(thread.name == f"{name}-leg" for thread in threading.enumerate())
+
+
+def wait_until_finished(name, limit=1.0):
+    deadline = time.time() + limit
+    while leg_running(name) and time.time() < deadline:
+        time.sleep(0.01)
+    return not leg_running(name)
+
+
+def test_streamed_call_keeps_the_first_leg_to_produce_a_token(monkeypatch):
+    backend = EmulatedBackend(emulator(slow=30, fast=0.05))
+    monkeypatch.setattr(hedging, "get_client", lambda: backend)
+    tokens = []
+
+    start = time.time()
+    result = hedged_generate("prompt", "slow", 60, 0.1, (backend, "fast"), on_token=tokens.append)
+
+    assert time.time() - start < 5
+    assert result.winner == HEDGE and result.hedged and result.hedge_model == "fast"
+    assert "".join(tokens).strip() == result.text
+    # The primary was waiting for its first token; cancelling it must not wait for one
+    assert wait_until_finished(PRIMARY)
+
+
+def test_primary_answering_before_the_p95_is_not_hedged(monkeypatch):
+    backend = EmulatedBackend(emulator(quick=0.01, fast=0.01))
+    monkeypatch.setattr(hedging, "get_client", lambda: backend)
+    tokens = []
+
+    result = hedged_generate("prompt", "quick", 60, 5.0, (backend, "fast"), on_token=tokens.append)
+
+    assert result.winner == PRIMARY and not result.hedged
+    assert "".join(tokens).strip() == result.text
+    assert not leg_running(HEDGE)
+
+
+def test_cancel_closes_an_http_stream_before_its_first_token():
+    # The emulator's HTTP front end, like Ollama, sends no headers until the first token
+    server = serve(port=0, emulator=emulator(slow=30))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OllamaClient(f"http://127.0.0.1:{server.server_address[1]}")
+    cancel = StreamCancel()
+    outcome = {}
+
+    def consume():
+        try:
+            outcome['chunks'] = list(client.generate_stream("prompt", "slow", timeout=60, cancel=cancel))
+        except Exception as e:
+            outcome['error'] = e
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    time.sleep(0.3)
+    cancel.cancel()
+    consumer.join(2)
+    server.shutdown()
+    server.server_close()
+    client.close()
+
+    assert not consumer.is_alive()
+    assert isinstance(outcome.get('error'), StreamCancelled)
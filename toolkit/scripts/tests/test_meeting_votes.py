@@ -0,0 +1,52 @@
+"""Persona voting in llm-meeting.py: `python -m pytest toolkit/scripts/tests`."""
+
+import importlib.util
+import logging
+import sys
+import threading
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from model_scheduler import ModelAffinityScheduler  # noqa: E402
+from single_flight import SingleFlight  # noqa: E402
+from timeout_policy import AdaptiveTimeoutPolicy  # noqa: E402
+
+# A root handler keeps the script's logging.basicConfig from creating meetingdebug.log
+logging.getLogger().addHandler(logging.NullHandler())
+_spec = importlib.util.spec_from_file_location("llm_meeting", SCRIPTS_DIR / "llm-meeting.py")
+meeting = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(meeting)
+
+
+class OverlappingClient:
+    """Holds each generation until `expected` calls overlap, so coalescing would have merged them."""
+
+    def __init__(self, expected: int):
+        self.calls = 0
+        self.overlap = threading.Barrier(expected, timeout=5)
+        self._lock = threading.Lock()
+
+    def generate_text(self, prompt, model, timeout=None, options=None, system=None):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        self.overlap.wait()
+        return f"vote {number}"
+
+
+def test_same_model_voters_each_get_their_own_generation(tmp_path, monkeypatch):
+    personas = [(name, None) for name in ("Curator", "Critic", "Archivist", "Editor")]
+    client = OverlappingClient(len(personas))
+    monkeypatch.setattr(meeting, "get_client", lambda: client)
+    monkeypatch.setattr(meeting, "get_persona_model", lambda persona_name: "llama3.1")
+    monkeypatch.setattr(meeting, "get_single_flight", lambda: SingleFlight(tmp_path))
+    monkeypatch.setattr(meeting, "get_timeout_policy", lambda: AdaptiveTimeoutPolicy(tmp_path / "latency.json"))
+    monkeypatch.setattr(meeting, "MEETING_CONCURRENCY", len(personas))
+
+    results = list(meeting.persona_votes(personas, ["Plan A", "Plan B"], ModelAffinityScheduler()))
+
+    assert client.calls == len(personas)
+    assert [result.key for result in results] == [name for name, _ in personas]
+    assert sorted(result.text for result in results) == [f"vote {n}" for n in range(1, len(personas) + 1)]
@@ -0,0 +1,24 @@
+"""LLMBackend interface: `python -m pytest toolkit/scripts/tests`."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ollama_client import LLMBackend, OllamaClient  # noqa: E402
+from ollama_emulator import EmulatedBackend  # noqa: E402
+
+
+def test_backend_missing_a_method_fails_when_instantiated():
+    class NoEmbeddings(LLMBackend):
+        generate = generate_stream = chat = tags = ps = pull_stream = EmulatedBackend.generate
+
+    with pytest.raises(TypeError, match="embed"):
+        NoEmbeddings()
+
+
+def test_shipped_backends_implement_the_whole_interface():
+    assert not OllamaClient.__abstractmethods__
+    assert not EmulatedBackend.__abstractmethods__
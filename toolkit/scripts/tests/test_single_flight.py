@@ -0,0 +1,169 @@
+"""Single-flight coalescing: `python -m pytest toolkit/scripts/tests`."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from single_flight import SingleFlight  # noqa: E402
+
+
+class Generation:
+    """Counts calls; each call blocks until `release` is set, then returns a numbered result."""
+
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            number = self.calls
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return f"vote-{number}"
+
+
+def run_in_thread(fn):
+    outcome = {}
+
+    def target():
+        try:
+            outcome['value'] = fn()
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, outcome
+
+
+def wait_for_followers():
+    # Followers poll the lock file every POLL_INTERVAL; give them time to register
+    time.sleep(0.3)
+
+
+def test_in_process_followers_share_the_leaders_result(tmp_path):
+    flight = SingleFlight(tmp_path)
+    generation = Generation()
+    leader, leader_outcome = run_in_thread(lambda: flight.do("k", generation))
+    generation.started.wait(5)
+    followers = [run_in_thread(lambda: flight.do("k", generation)) for _ in range(3)]
+    wait_for_followers()
+    generation.release.set()
+    for thread, _ in [(leader, leader_outcome)] + followers:
+        thread.join(5)
+
+    assert generation.calls == 1
+    assert leader_outcome['value'] == ("vote-1", False)
+    assert all(outcome['value'] == ("vote-1", True) for _, outcome in followers)
+
+
+def test_cross_process_follower_reads_the_leaders_result(tmp_path):
+    # Separate instances share nothing but the lock and result files, like separate processes
+    generation = Generation()
+    leader, leader_outcome = run_in_thread(lambda: SingleFlight(tmp_path).do("k", generation))
+    generation.started.wait(5)
+    follower, follower_outcome = run_in_thread(lambda: SingleFlight(tmp_path).do("k", generation))
+    wait_for_followers()
+    generation.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert generation.calls == 1
+    assert leader_outcome['value'] == ("vote-1", False)
+    assert follower_outcome['value'] == ("vote-1", True)
+
+
+def test_finished_results_are_not_served_to_later_calls(tmp_path):
+    generation = Generation()
+    generation.release.set()
+    results = [SingleFlight(tmp_path).do("k", generation) for _ in range(3)]
+    same_instance = SingleFlight(tmp_path)
+    results += [same_instance.do("k", generation) for _ in range(2)]
+
+    assert generation.calls == 5
+    assert results == [(f"vote-{n}", False) for n in range(1, 6)]
+
+
+def test_result_published_before_joining_is_stale(tmp_path):
+    flight = SingleFlight(tmp_path)
+    result_path = tmp_path / "k.json"
+    flight._write_result(result_path, "old")
+    joined_at = time.time() + 1
+
+    assert flight._read_result(result_path, joined_at) is None
+    assert flight._read_result(result_path, joined_at - 10) == "old"
+
+
+def test_in_process_followers_get_the_leaders_error(tmp_path):
+    flight = SingleFlight(tmp_path)
+    generation = Generation(error=RuntimeError("model crashed"))
+    leader, leader_outcome = run_in_thread(lambda: flight.do("k", generation))
+    generation.started.wait(5)
+    follower, follower_outcome = run_in_thread(lambda: flight.do("k", generation))
+    wait_for_followers()
+    generation.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert generation.calls == 1
+    assert isinstance(leader_outcome['error'], RuntimeError)
+    assert follower_outcome['error'] is leader_outcome['error']
+
+
+def test_cross_process_follower_generates_after_leader_fails(tmp_path):
+    failing = Generation(error=RuntimeError("model crashed"))
+    leader, leader_outcome = run_in_thread(lambda: SingleFlight(tmp_path).do("k", failing))
+    failing.started.wait(5)
+    retry = Generation()
+    retry.release.set()
+    follower, follower_outcome = run_in_thread(lambda: SingleFlight(tmp_path).do("k", retry))
+    wait_for_followers()
+    failing.release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert isinstance(leader_outcome['error'], RuntimeError)
+    assert follower_outcome['value'] == ("vote-1", False)
+    assert retry.calls == 1
+
+
+def test_uncoalesced_calls_always_generate(tmp_path):
+    flight = SingleFlight(tmp_path)
+    generation = Generation()
+    threads = [run_in_thread(lambda: flight.do("k", generation, coalesce=False)) for _ in range(4)]
+    wait_for_followers()
+    generation.release.set()
+    for thread, _ in threads:
+        thread.join(5)
+
+    assert generation.calls == 4
+    assert sorted(outcome['value'] for _, outcome in threads) == [(f"vote-{n}", False) for n in range(1, 5)]
+
+
+@pytest.mark.parametrize("same_instance", [True, False])
+def test_wait_is_capped_by_max_wait(tmp_path, same_instance):
+    slow = Generation()
+    leader_flight = SingleFlight(tmp_path)
+    leader, _ = run_in_thread(lambda: leader_flight.do("k", slow))
+    slow.started.wait(5)
+    follower_flight = leader_flight if same_instance else SingleFlight(tmp_path)
+
+    start = time.time()
+    result = follower_flight.do("k", lambda: "local", max_wait=0.2)
+    waited = time.time() - start
+    slow.release.set()
+    leader.join(5)
+
+    assert result == ("local", False)
+    assert waited < 2
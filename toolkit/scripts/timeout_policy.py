@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Adaptive LLM Timeout Policy
+- Learns per-model, per-prompt-size latency distributions from past calls
+- Timeout = p99 x factor, plus a cold-start allowance when the model is not resident
+- History is persisted to latency_history.json so every run starts informed
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configuration
+LATENCY_HISTORY_FILE = Path(__file__).parent / "latency_history.json"
+FALLBACK_TIMEOUT = 10.0
+MIN_TIMEOUT = 5.0
+MAX_TIMEOUT = 300.0
+P99_FACTOR = 1.5
+COLD_START_ALLOWANCE = 30.0
+MIN_SAMPLES = 5
+MAX_SAMPLES_PER_BUCKET = 200
+# Ollama unloads idle models after 5 minutes by default
+MODEL_KEEP_ALIVE_SECONDS = int(os.environ.get("OLLAMA_KEEP_ALIVE_SECONDS", "300"))
+
+# Prompt size buckets (upper bound in characters, name)
+PROMPT_SIZE_BUCKETS = [
+    (1_000, "small"),
+    (4_000, "medium"),
+    (16_000, "large"),
+]
+LARGEST_BUCKET = "xlarge"
+
+
+def prompt_size_bucket(prompt: str) -> str:
+    size = len(prompt)
+    for limit, name in PROMPT_SIZE_BUCKETS:
+        if size < limit:
+            return name
+    return LARGEST_BUCKET
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class AdaptiveTimeoutPolicy:
+    """Choose per-call timeouts from observed latency instead of flat constants."""
+
+    def __init__(self, history_file: Path = LATENCY_HISTORY_FILE):
+        self.history_file = Path(history_file)
+        self._lock = threading.Lock()
+        # {model: {"buckets": {bucket: [seconds]}, "cold_starts": [seconds], "last_used": epoch}}
+        self.history: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _model_history(self, model: str) -> Dict:
+        return self.history.setdefault(model, {"buckets": {}, "cold_starts": [], "last_used": 0})
+
+    def is_cold(self, model: str) -> bool:
+        """A model idle longer than Ollama's keep-alive has probably been unloaded."""
+        with self._lock:
+            last_used = self.history.get(model, {}).get("last_used", 0)
+        return time.time() - last_used > MODEL_KEEP_ALIVE_SECONDS
+
+    def mark_warm(self, model: str) -> None:
+        """Note that a model was just loaded (e.g. by the warm pool) without recording a latency."""
+        with self._lock:
+            self._model_history(model)["last_used"] = time.time()
+
+    def timeout_for(self, model: str, prompt: str, attempt: int = 0, cold: Optional[bool] = None) -> float:
+        """Timeout for one attempt; doubles on each retry up to MAX_TIMEOUT."""
+        bucket = prompt_size_bucket(prompt)
+        if cold is None:
+            cold = self.is_cold(model)
+
+        with self._lock:
+            model_history = self.history.get(model, {})
+            samples = model_history.get("buckets", {}).get(bucket, [])
+            if len(samples) >= MIN_SAMPLES:
+                timeout = percentile(samples, 99) * P99_FACTOR
+            else:
+                timeout = FALLBACK_TIMEOUT
+
+            if cold:
+                cold_starts = model_history.get("cold_starts", [])
+                if len(cold_starts) >= MIN_SAMPLES:
+                    timeout += percentile(cold_starts, 90)
+                else:
+                    timeout += COLD_START_ALLOWANCE
+
+        timeout = max(MIN_TIMEOUT, timeout) * (2 ** attempt)
+        return round(min(MAX_TIMEOUT, timeout), 1)
+
+    def latency_percentile(self, model: str, prompt: str, pct: float) -> Optional[float]:
+        """Warm latency percentile for the prompt's size bucket, or None without enough history."""
+        with self._lock:
+            samples = self.history.get(model, {}).get("buckets", {}).get(prompt_size_bucket(prompt), [])
+            if len(samples) < MIN_SAMPLES:
+                return None
+            return percentile(samples, pct)
+
+    def expected_latency_beyond(self, model: str, prompt: str, elapsed: float) -> Optional[float]:
+        """Mean of past warm latencies longer than `elapsed` (the conditional tail), if any."""
+        with self._lock:
+            samples = self.history.get(model, {}).get("buckets", {}).get(prompt_size_bucket(prompt), [])
+            tail = [sample for sample in samples if sample > elapsed]
+        return sum(tail) / len(tail) if tail else None
+
+    def record(self, model: str, prompt: str, duration: float, outcome: str, was_cold: bool = False) -> None:
+        """
+        Record one attempt. Timeouts are kept as censored samples at the timeout
+        value so the distribution grows until the model can finish.
+        """
+        if outcome not in ("success", "timeout"):
+            return
+
+        bucket = prompt_size_bucket(prompt)
+        with self._lock:
+            model_history = self._model_history(model)
+            model_history["last_used"] = time.time()
+            if was_cold:
+                # Keep load time out of the warm distribution
+                warm = model_history["buckets"].get(bucket, [])
+                warm_p50 = percentile(warm, 50) if warm else 0.0
+                self._append(model_history["cold_starts"], max(0.0, duration - warm_p50))
+            else:
+                self._append(model_history["buckets"].setdefault(bucket, []), duration)
+
+    @staticmethod
+    def _append(samples: List[float], value: float) -> None:
+        samples.append(round(value, 3))
+        del samples[:-MAX_SAMPLES_PER_BUCKET]
+
+    def save(self) -> None:
+        """Persist history atomically so concurrent runs never see a partial file."""
+        with self._lock:
+            data = json.dumps(self.history)
+        tmp_path = self.history_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.history_file)
+        except OSError as e:
+            logging.warning(f"Failed to save latency history: {e}")
+
+
+# Process-wide shared policy, saved on exit
+_policy: Optional[AdaptiveTimeoutPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_timeout_policy() -> AdaptiveTimeoutPolicy:
+    """Return the shared policy, creating it on first use."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = AdaptiveTimeoutPolicy()
+            atexit.register(_policy.save)
+        return _policy
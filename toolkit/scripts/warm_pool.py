@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Model Warm Pool for meetings and batch jobs
+- Preloads every model a run will use, concurrently, with zero-token load requests
+- Sets keep_alive so the models stay resident for the whole run
+- Reports load time per model so cold-load cost is visible up front
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+from ollama_client import LLMBackend, OllamaError, get_client
+
+# Configuration
+MEETING_KEEP_ALIVE = os.environ.get("MEETING_KEEP_ALIVE", "30m")
+# Ollama's own default, restored when the run releases the pool
+DEFAULT_KEEP_ALIVE = "5m"
+PRELOAD_TIMEOUT = 300
+
+
+class ModelLoadReport:
+    """Result of preloading one model."""
+
+    def __init__(self, model: str, success: bool, wall_time: float,
+                 load_time: float = 0.0, error: str = ""):
+        self.model = model
+        self.success = success
+        self.wall_time = wall_time
+        # Server-side load_duration; near zero when the model was already resident
+        self.load_time = load_time
+        self.error = error
+
+
+class ModelWarmPool:
+    """Keep a run's models resident in Ollama for its duration."""
+
+    def __init__(self, keep_alive: str = MEETING_KEEP_ALIVE, client: Optional[LLMBackend] = None,
+                 keep_alive_overrides: Optional[Dict[str, str]] = None):
+        self.keep_alive = keep_alive
+        self.client = client or get_client()
+        # Per-model keep_alive, e.g. from a residency plan
+        self.keep_alive_overrides = dict(keep_alive_overrides or {})
+        self.reports: Dict[str, ModelLoadReport] = {}
+
+    def keep_alive_for(self, model: str) -> str:
+        return self.keep_alive_overrides.get(model, self.keep_alive)
+
+    def _load(self, model: str, keep_alive: str) -> ModelLoadReport:
+        start = time.time()
+        try:
+            # An empty prompt loads the model without generating any tokens
+            result = self.client.generate("", model, timeout=PRELOAD_TIMEOUT, keep_alive=keep_alive)
+            load_time = result.get("load_duration", 0) / 1e9
+            return ModelLoadReport(model, True, time.time() - start, load_time)
+        except OllamaError as e:
+            return ModelLoadReport(model, False, time.time() - start, error=str(e))
+
+    def preload(self, models: Iterable[str]) -> Dict[str, ModelLoadReport]:
+        """Load all `models` in parallel and pin them with keep_alive."""
+        models = sorted(set(models))
+        if not models:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="warm") as executor:
+            for report in executor.map(lambda m: self._load(m, self.keep_alive_for(m)), models):
+                self.reports[report.model] = report
+                if report.success:
+                    logging.info(f"Model {report.model} resident in {report.wall_time:.2f}s "
+                                 f"(load {report.load_time:.2f}s, keep_alive {self.keep_alive_for(report.model)})")
+                else:
+                    logging.warning(f"Failed to preload model {report.model}: {report.error}")
+
+        return {model: self.reports[model] for model in models}
+
+    def unload(self, model: str) -> None:
+        """Ask Ollama to drop `model` from memory once its in-flight calls finish."""
+        try:
+            self.client.generate("", model, timeout=PRELOAD_TIMEOUT, keep_alive="0")
+            logging.info(f"Unloading model {model}")
+        except OllamaError as e:
+            logging.warning(f"Failed to unload model {model}: {e}")
+
+    def release(self) -> None:
+        """Hand the models back to Ollama's default idle timeout."""
+        for model, report in self.reports.items():
+            if report.success:
+                try:
+                    self.client.generate("", model, timeout=PRELOAD_TIMEOUT, keep_alive=DEFAULT_KEEP_ALIVE)
+                except OllamaError as e:
+                    logging.debug(f"Could not reset keep_alive for {model}: {e}")